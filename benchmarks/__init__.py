@@ -0,0 +1 @@
+"""Performance benchmarks for the Real Estate MCP Server"""
@@ -0,0 +1,131 @@
+"""
+Benchmark: query latency of every storage backend on the same workload
+
+Usage:
+    python -m benchmarks.bench_backends [--sizes 10000 100000] [--backends memory sqlite]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+from unittest.mock import patch
+
+from benchmarks.synthetic import AREAS, write_data_dir
+from sqlite_backend import SQLiteDataManager, import_json
+from result_cache import ResultCache
+from storage import DataBackend
+from utils import DATASET_FILES, PropertyFilter, RealEstateDataManager
+
+
+def open_memory(data_dir: str) -> DataBackend:
+    """In-memory snapshots with indexes and NumPy columns"""
+    manager = RealEstateDataManager(data_dir, result_cache=_uncached())
+    manager.snapshot().warm(DATASET_FILES)
+    return manager
+
+
+def open_scan(data_dir: str) -> DataBackend:
+    """In-memory snapshots without NumPy columns"""
+    manager = RealEstateDataManager(data_dir, result_cache=_uncached())
+    with patch("columnar.np", None):
+        manager.snapshot().warm(DATASET_FILES)
+    return manager
+
+
+def open_sqlite(data_dir: str) -> DataBackend:
+    """SQLite database imported from the data directory"""
+    database = os.path.join(data_dir, "real_estate.db")
+    import_json(data_dir, database)
+    return SQLiteDataManager(database, result_cache=_uncached())
+
+
+def _uncached() -> ResultCache:
+    """Disabled result cache, so repeated queries are timed, not cache hits"""
+    return ResultCache(max_entries=0)
+
+
+# Backend name -> function opening it over a data directory
+BACKENDS: Dict[str, Callable[[str], DataBackend]] = {
+    "memory": open_memory,
+    "scan": open_scan,
+    "sqlite": open_sqlite,
+}
+
+
+def workload(size: int) -> List[Tuple[str, Callable[[DataBackend], object]]]:
+    """Named operations, each a call against a backend"""
+    property_id = f"PROP{size // 2:07d}"
+    agent_id = "AGENT0000"
+    return [
+        ("get_property_by_id", lambda b: b.get_property_by_id(property_id)),
+        ("get_properties_by_area", lambda b: b.get_properties_by_area(AREAS[0])),
+        ("get_properties_by_agent", lambda b: b.get_properties_by_agent(agent_id)),
+        (
+            "filter_properties (range)",
+            lambda b: b.filter_properties(
+                PropertyFilter(min_price=400000, max_price=800000, min_bedrooms=3)
+            ),
+        ),
+        (
+            "filter_properties (selective)",
+            lambda b: b.filter_properties(
+                PropertyFilter(min_price=2400000, areas=[AREAS[1]])
+            ),
+        ),
+        (
+            "filter_properties (feature)",
+            lambda b: b.filter_properties(PropertyFilter(features=["solar"])),
+        ),
+        ("search_properties", lambda b: b.search_properties("la sierra")),
+        ("rank_properties", lambda b: b.rank_properties("pool", limit=10)),
+        ("search_agents", lambda b: b.search_agents("luxury")),
+        ("get_sales_by_area", lambda b: b.get_sales_by_area(AREAS[2])),
+        ("get_clients_by_agent", lambda b: b.get_clients_by_agent(agent_id)),
+    ]
+
+
+def time_operation(func: Callable[[], object], repeat: int) -> float:
+    """Return the mean time per call in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument(
+        "--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            data_dir = write_data_dir(temp_dir, size)
+            operations = workload(size)
+            results = {}
+            for name in args.backends:
+                start = time.perf_counter()
+                backend = BACKENDS[name](data_dir)
+                setup = (time.perf_counter() - start) * 1e3
+                results[name] = [setup] + [
+                    time_operation(lambda: operation(backend), args.repeat)
+                    for _, operation in operations
+                ]
+
+        print(f"\n{size} listings (ms)")
+        print(f"{'operation':<32}" + "".join(f"{n:>12}" for n in args.backends))
+        labels = ["open and warm"] + [label for label, _ in operations]
+        for row, label in enumerate(labels):
+            print(
+                f"{label:<32}"
+                + "".join(f"{results[n][row]:>12.3f}" for n in args.backends)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: cold start with and without the binary snapshot cache
+
+Generates a listings file (500k listings by default) and, in fresh
+processes, times the first listing query: once parsing JSON and building
+indexes, and once restoring both from a populated snapshot cache.
+
+Usage:
+    python -m benchmarks.bench_cold_start [--listings 500000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import write_large_data_dir
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in the child process: time the first indexed query and the cache write
+CHILD = """
+import json, sys, time
+from utils import RealEstateDataManager
+
+data_dir, snapshot_dir = sys.argv[1], sys.argv[2] or None
+start = time.perf_counter()
+manager = RealEstateDataManager(data_dir, snapshot_dir=snapshot_dir)
+snapshot = manager.snapshot()
+snapshot.get_property_by_id("PROP0000000")
+snapshot.warm(["properties", "transactions"])
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "load_seconds": sum(snapshot.load_times.values()),
+    "index_seconds": sum(snapshot.index_times.values()),
+}))
+"""
+
+
+def measure(data_dir: str, snapshot_dir: str = "") -> dict:
+    """Start a process against the data directory and return its timings"""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, data_dir, snapshot_dir],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--listings", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(f"Generating {args.listings} listings...")
+        data_dir = write_large_data_dir(os.path.join(temp_dir, "data"), args.listings)
+        snapshot_dir = os.path.join(temp_dir, "data.snapshot")
+
+        runs = [
+            ("JSON + index build", measure(data_dir)),
+            ("JSON + cache write", measure(data_dir, snapshot_dir)),
+            ("snapshot cache", measure(data_dir, snapshot_dir)),
+        ]
+        print(f"{'start':>20} {'total (s)':>10} {'load (s)':>10} {'index (s)':>10}")
+        for label, stats in runs:
+            print(
+                f"{label:>20} {stats['seconds']:>10.3f} "
+                f"{stats['load_seconds']:>10.3f} {stats['index_seconds']:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: planned filter_properties versus the row-by-row scan path, for
+filters and for sorted pages of results
+
+Usage:
+    python -m benchmarks.bench_filter [--sizes 10000 100000]
+"""
+
+import argparse
+import tempfile
+import time
+
+from benchmarks.synthetic import write_data_dir
+from result_cache import ResultCache
+from utils import PropertyFilter, RealEstateDataManager
+
+FILTERS = [
+    PropertyFilter(min_price=400000, max_price=800000),
+    PropertyFilter(min_bedrooms=3, areas=["Woodcrest", "La Sierra"]),
+    PropertyFilter(property_types=["Condo"], min_sqft=1200, max_sqft=2500),
+    PropertyFilter(min_price=300000, features=["pool"]),
+]
+
+# First pages of sorted results: cheapest, largest and newest listings
+SORTED_PAGES = [
+    PropertyFilter(min_bedrooms=3, sort_by="price", limit=20),
+    PropertyFilter(
+        property_types=["Condo"], sort_by="square_feet", descending=True, limit=20
+    ),
+    PropertyFilter(min_price=300000, sort_by="list_date", descending=True, limit=20),
+    PropertyFilter(min_list_date="2024-06-01", sort_by="price", offset=100, limit=20),
+]
+
+
+def time_filters(filter_func, filters_list, repeat: int) -> float:
+    """Return the mean time per filter call in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for filters in filters_list:
+            filter_func(filters)
+    return (time.perf_counter() - start) / (repeat * len(filters_list)) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'listings':>10} {'planned (ms)':>14} {'scan (ms)':>14}"
+        f" {'sorted page (ms)':>18} {'scan+sort (ms)':>16}"
+    )
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Without a result cache, so repeated filters are timed, not cache hits
+            manager = RealEstateDataManager(
+                data_dir=write_data_dir(temp_dir, size),
+                result_cache=ResultCache(max_entries=0),
+            )
+            # Build the listing indexes up front so only filtering is timed
+            manager.snapshot().warm(["properties"])
+            properties = manager.get_all_properties()
+
+            def scan(filters):
+                return [p for p in properties if manager._matches_filter(p, filters)]
+
+            def scan_and_sort(filters):
+                rows = sorted(
+                    scan(filters),
+                    key=lambda p: p[filters.sort_by],
+                    reverse=filters.descending,
+                )
+                return rows[filters.offset : filters.offset + filters.limit]
+
+            planned = time_filters(manager.filter_properties, FILTERS, args.repeat)
+            baseline = time_filters(scan, FILTERS, args.repeat)
+            page = time_filters(manager.filter_properties, SORTED_PAGES, args.repeat)
+            page_baseline = time_filters(scan_and_sort, SORTED_PAGES, args.repeat)
+            print(
+                f"{size:>10} {planned:>14.3f} {baseline:>14.3f}"
+                f" {page:>18.3f} {page_baseline:>16.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
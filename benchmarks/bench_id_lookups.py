@@ -0,0 +1,56 @@
+"""
+Benchmark: primary-key lookups as the dataset grows
+
+Compares the indexed ``get_*_by_id`` lookups against a linear scan over the
+same records. Indexed lookups should stay flat while the scan grows linearly.
+
+Usage:
+    python -m benchmarks.bench_id_lookups [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from benchmarks.synthetic import write_data_dir
+from utils import RealEstateDataManager
+
+
+def linear_lookup(records, record_id):
+    """Reference implementation: scan every record"""
+    for record in records:
+        if record.get("id") == record_id:
+            return record
+    return None
+
+
+def time_lookups(lookup, ids) -> float:
+    """Return the mean time per lookup in microseconds"""
+    start = time.perf_counter()
+    for record_id in ids:
+        lookup(record_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'listings':>10} {'indexed (us)':>14} {'linear (us)':>14}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = RealEstateDataManager(data_dir=write_data_dir(temp_dir, size))
+            properties = manager.get_all_properties()
+            ids = [rng.choice(properties)["id"] for _ in range(args.lookups)]
+
+            indexed = time_lookups(manager.get_property_by_id, ids)
+            linear = time_lookups(lambda i: linear_lookup(properties, i), ids[:200])
+            print(f"{size:>10} {indexed:>14.3f} {linear:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: server import time as the dataset grows
+
+Imports ``main`` in a fresh interpreter, pointed at synthetic data
+directories through ``REAL_ESTATE_DATA_DIR``. Datasets load on first use, so
+import time should stay flat regardless of the number of listings.
+
+Usage:
+    python -m benchmarks.bench_import_time [--sizes 1000 100000] [--runs 5]
+    python -m benchmarks.bench_import_time --importtime
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_data_dir
+from utils import DATA_DIR_ENV
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_import(data_dir: str, runs: int) -> float:
+    """Return the median wall time of ``import main`` in milliseconds"""
+    env = dict(os.environ, **{DATA_DIR_ENV: data_dir})
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", "import main"], cwd=REPO_ROOT, env=env, check=True
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def show_importtime(limit: int):
+    """Print the slowest modules reported by ``python -X importtime``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative), name.rstrip()))
+
+    print(f"{'cumulative (ms)':>16}  module")
+    for cumulative, name in sorted(rows, reverse=True)[:limit]:
+        print(f"{cumulative / 1000:>16.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--importtime",
+        action="store_true",
+        help="show the slowest imports from python -X importtime instead",
+    )
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    if args.importtime:
+        show_importtime(args.top)
+        return
+
+    print(f"{'listings':>10} {'import main (ms)':>18}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            data_dir = write_data_dir(temp_dir, size)
+            print(f"{size:>10} {time_import(data_dir, args.runs):>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
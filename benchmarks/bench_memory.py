@@ -0,0 +1,89 @@
+"""
+Benchmark: peak memory of json.load against streaming ingestion
+
+Writes a listings file (1M listings by default) and loads it in a fresh
+process for each path, reporting peak RSS, the RSS baseline before loading,
+and load time. The streaming path parses listings one at a time and shares
+repeated strings, so its peak should sit well below ``json.load``'s.
+
+Usage:
+    python -m benchmarks.bench_memory [--listings 1000000] [--data-dir DIR]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import write_large_data_dir
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in the child process: load listings and sales, report RSS and timings
+CHILD = """
+import json, resource, sys, time
+from utils import RealEstateDataManager
+
+def peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+threshold = 0 if sys.argv[2] == "streaming" else float("inf")
+manager = RealEstateDataManager(data_dir=sys.argv[1], streaming_threshold=threshold)
+baseline = peak_mb()
+start = time.perf_counter()
+count = len(manager.get_all_properties()) + len(manager.get_recent_sales())
+print(json.dumps({
+    "records": count,
+    "seconds": time.perf_counter() - start,
+    "baseline_mb": baseline,
+    "peak_mb": peak_mb(),
+}))
+"""
+
+
+def measure(data_dir: str, mode: str) -> dict:
+    """Load the data directory in a subprocess and return its measurements"""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, data_dir, mode],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def run(data_dir: str):
+    """Print peak RSS and load time for both ingestion paths"""
+    size = os.path.getsize(os.path.join(data_dir, "properties", "active_listings.json"))
+    print(f"active_listings.json: {size / 2**20:.0f} MiB")
+    print(f"{'path':>10} {'records':>10} {'load (s)':>10} {'peak RSS (MiB)':>16}")
+    for mode in ("json.load", "streaming"):
+        stats = measure(data_dir, mode)
+        print(
+            f"{mode:>10} {stats['records']:>10} {stats['seconds']:>10.2f} "
+            f"{stats['peak_mb']:>16.0f}  (baseline {stats['baseline_mb']:.0f})"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--listings", type=int, default=1_000_000)
+    parser.add_argument(
+        "--data-dir", help="reuse an existing data directory instead of generating one"
+    )
+    args = parser.parse_args()
+
+    if args.data_dir:
+        run(args.data_dir)
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(f"Generating {args.listings} listings...")
+        run(write_large_data_dir(temp_dir, args.listings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: memory held by dict records against compact records
+
+Loads synthetic listings, sales, agents and clients as parsed JSON dicts and
+as ``records`` types, and reports the bytes each representation holds
+according to ``tracemalloc``.
+
+Usage:
+    python -m benchmarks.bench_records_memory [--listings 100000]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from benchmarks.synthetic import generate
+from records import Agent, Client, Listing, RecordBuilder, Sale
+
+DATASETS = (
+    ("listings", Listing),
+    ("sales", Sale),
+    ("agents", Agent),
+    ("clients", Client),
+)
+
+
+def traced_bytes(build) -> int:
+    """Bytes still allocated by ``build()``'s result once it returns"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--listings", type=int, default=100_000)
+    args = parser.parse_args()
+
+    data = generate(args.listings)
+    print(
+        f"{'dataset':>10} {'records':>9} {'dicts (MiB)':>12} {'records (MiB)':>14} {'saved':>7}"
+    )
+    for name, record_type in DATASETS:
+        text = json.dumps(data[name])
+        dicts = traced_bytes(lambda: json.loads(text))
+
+        def build_records():
+            builder = RecordBuilder(record_type)
+            return [builder(item) for item in json.loads(text)]
+
+        compact = traced_bytes(build_records)
+        print(
+            f"{name:>10} {len(data[name]):>9} {dicts / 2**20:>12.1f} "
+            f"{compact / 2**20:>14.1f} {1 - compact / dicts:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: search_properties through the inverted index versus a full scan
+
+Usage:
+    python -m benchmarks.bench_search [--sizes 10000 100000]
+"""
+
+import argparse
+import tempfile
+import time
+
+from benchmarks.synthetic import write_data_dir
+from result_cache import ResultCache
+from utils import RealEstateDataManager
+
+QUERIES = ["pool", "Victorian Ave", "solar panels", "la sierra", "walk-in", "zzz"]
+
+
+def time_queries(search_func, repeat: int) -> float:
+    """Return the mean time per query in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            search_func(query)
+    return (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'listings':>10} {'indexed (ms)':>14} {'scan (ms)':>14}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Without a result cache, so repeated queries are timed, not cache hits
+            manager = RealEstateDataManager(
+                data_dir=write_data_dir(temp_dir, size),
+                result_cache=ResultCache(max_entries=0),
+            )
+            properties = manager.get_all_properties()
+
+            def scan(query):
+                query_lower = query.lower()
+                return [
+                    p
+                    for p in properties
+                    if query_lower in manager._property_search_text(p)
+                ]
+
+            indexed = time_queries(manager.search_properties, args.repeat)
+            baseline = time_queries(scan, args.repeat)
+            print(f"{size:>10} {indexed:>14.3f} {baseline:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
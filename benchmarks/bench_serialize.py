@@ -0,0 +1,89 @@
+"""
+Benchmark: response size and encode time of the serializer formats and encoders
+
+Usage:
+    python -m benchmarks.bench_serialize [--sizes 10000 100000]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from typing import Any, Callable, Dict
+from unittest.mock import patch
+
+import serializer
+from benchmarks.synthetic import write_data_dir
+from records import jsonable
+from utils import PropertyFilter, RealEstateDataManager
+
+
+def encoders() -> Dict[str, Callable[[Any], str]]:
+    """The previous inline encoding and each serializer mode"""
+
+    def stdlib(pretty: bool) -> Callable[[Any], str]:
+        def encode(value):
+            with patch("serializer.orjson", None):
+                return serializer.dumps(value, pretty)
+
+        return encode
+
+    modes = {
+        "json indent=2 (before)": lambda value: json.dumps(
+            value, indent=2, default=jsonable
+        ),
+        "json compact": stdlib(False),
+        "json pretty": stdlib(True),
+    }
+    if serializer.orjson is not None:
+        modes["orjson compact"] = lambda value: serializer.dumps(value, False)
+        modes["orjson pretty"] = lambda value: serializer.dumps(value, True)
+    return modes
+
+
+def payloads(manager: RealEstateDataManager) -> Dict[str, Any]:
+    """Responses of the largest tools, as the tools build them"""
+    listings = manager.get_all_properties()
+    matches = manager.filter_properties(PropertyFilter(min_price=500000))
+    return {
+        "all listings": {"total_count": len(listings), "properties": listings},
+        "500-listing page": {
+            "total_count": len(listings),
+            "properties": listings[:500],
+        },
+        "filter matches": {"results_count": len(matches), "properties": matches},
+        "recent sales": {"sales": manager.get_recent_sales()},
+        "all clients": {"clients": manager.get_all_clients()},
+    }
+
+
+def time_encode(encode: Callable[[Any], str], value: Any, repeat: int) -> float:
+    """Return the best encode time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(value)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    modes = encoders()
+    print(f"{'listings':>10} {'payload':<18} {'encoder':<24} {'KiB':>10} {'ms':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = RealEstateDataManager(data_dir=write_data_dir(temp_dir, size))
+            for name, value in payloads(manager).items():
+                for mode, encode in modes.items():
+                    kib = len(encode(value).encode()) / 1024
+                    ms = time_encode(encode, value, args.repeat)
+                    print(f"{size:>10} {name:<18} {mode:<24} {kib:>10.1f} {ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Synthetic dataset generation for benchmarks
+
+Builds data directories with the same layout as ``data/`` but with an
+arbitrary number of listings, agents, clients and sales.
+"""
+
+import json
+import os
+import random
+from typing import Any, Dict, Iterable, List
+
+AREAS = [
+    "Downtown Riverside",
+    "Woodcrest",
+    "Canyon Crest",
+    "Arlington Heights",
+    "La Sierra",
+]
+PROPERTY_TYPES = ["Single Family Home", "Townhouse", "Condo", "Multi-Family"]
+STYLES = ["Victorian", "Contemporary", "Ranch", "Craftsman", "Spanish Colonial"]
+FEATURES = [
+    "Hardwood floors",
+    "Updated kitchen",
+    "Central AC",
+    "Swimming pool",
+    "Two-car garage",
+    "Solar panels",
+    "Mountain views",
+    "Large backyard",
+    "Fireplace",
+    "Walk-in closet",
+]
+SPECIALIZATIONS = [
+    "First-time homebuyers",
+    "Luxury homes",
+    "Investment properties",
+    "Historic homes",
+    "Relocation",
+]
+
+
+def make_listing(i: int, rng: random.Random, agent_count: int) -> Dict[str, Any]:
+    """Create one synthetic listing"""
+    area = rng.choice(AREAS)
+    return {
+        "id": f"PROP{i:07d}",
+        "address": f"{rng.randint(100, 9999)} {rng.choice(STYLES)} Ave",
+        "city": "Riverside",
+        "state": "CA",
+        "zip_code": f"925{rng.randint(0, 99):02d}",
+        "area": area,
+        "property_type": rng.choice(PROPERTY_TYPES),
+        "style": rng.choice(STYLES),
+        "year_built": rng.randint(1890, 2023),
+        "price": rng.randrange(150000, 2500000, 1000),
+        "bedrooms": rng.randint(1, 6),
+        "bathrooms": rng.choice([1, 1.5, 2, 2.5, 3, 3.5, 4]),
+        "square_feet": rng.randint(600, 6000),
+        "lot_size": f"0.{rng.randint(5, 99):02d} acres",
+        "description": f"Lovely home in {area} with {rng.choice(FEATURES).lower()}.",
+        "features": rng.sample(FEATURES, rng.randint(2, 6)),
+        "images": [f"https://example.com/prop{i}_{n}.jpg" for n in range(3)],
+        "agent_id": f"AGENT{rng.randrange(agent_count):04d}",
+        "list_date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "status": "Active",
+        "open_house": {"scheduled": False},
+    }
+
+
+def make_agent(i: int, rng: random.Random) -> Dict[str, Any]:
+    """Create one synthetic agent profile"""
+    return {
+        "id": f"AGENT{i:04d}",
+        "name": f"Agent {i}",
+        "specializations": rng.sample(SPECIALIZATIONS, 2),
+        "expertise_areas": rng.sample(AREAS, 2),
+        "bio": f"Agent {i} has been selling homes in {rng.choice(AREAS)}.",
+        "recent_sales": [],
+        "client_testimonials": [],
+    }
+
+
+def make_client(i: int, rng: random.Random, agent_count: int) -> Dict[str, Any]:
+    """Create one synthetic client"""
+    low = rng.randrange(200000, 1500000, 50000)
+    return {
+        "id": f"CLIENT{i:06d}",
+        "name": f"Client {i}",
+        "type": rng.choice(["Buyer", "Seller", "Investor"]),
+        "preferences": {
+            "budget_range": {"min": low, "max": low + 300000},
+            "desired_areas": rng.sample(AREAS, 2),
+            "property_type": rng.choice(PROPERTY_TYPES),
+        },
+        "agent_id": f"AGENT{rng.randrange(agent_count):04d}",
+    }
+
+
+def make_sale(i: int, rng: random.Random, agent_count: int) -> Dict[str, Any]:
+    """Create one synthetic sale"""
+    price = rng.randrange(150000, 2500000, 1000)
+    sqft = rng.randint(600, 6000)
+    return {
+        "id": f"SALE{i:07d}",
+        "property_address": f"{rng.randint(100, 9999)} Sample St",
+        "area": rng.choice(AREAS),
+        "property_type": rng.choice(PROPERTY_TYPES),
+        "sale_price": price,
+        "days_on_market": rng.randint(1, 120),
+        "price_per_sqft": price // sqft,
+        "agent_id": f"AGENT{rng.randrange(agent_count):04d}",
+        "sale_date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+    }
+
+
+def generate(count: int, seed: int = 42) -> Dict[str, List[Dict[str, Any]]]:
+    """Generate listings, agents, clients and sales in memory"""
+    rng = random.Random(seed)
+    agent_count = max(1, count // 100)
+    return {
+        "listings": [make_listing(i, rng, agent_count) for i in range(count)],
+        "agents": [make_agent(i, rng) for i in range(agent_count)],
+        "clients": [make_client(i, rng, agent_count) for i in range(count // 10)],
+        "sales": [make_sale(i, rng, agent_count) for i in range(count // 5)],
+    }
+
+
+def write_data_dir(target_dir: str, count: int, seed: int = 42) -> str:
+    """Write a synthetic data directory with ``count`` listings"""
+    data = generate(count, seed)
+    files = {
+        ("properties", "active_listings.json"): {"active_listings": data["listings"]},
+        ("agents", "agent_profiles.json"): {"agents": data["agents"]},
+        ("clients", "client_database.json"): {"clients": data["clients"]},
+        ("transactions", "recent_sales.json"): {"recent_sales": data["sales"]},
+        ("market", "market_analytics.json"): {"market_overview": {}},
+        ("amenities", "local_amenities.json"): {"schools": {}},
+        ("areas", "city_overview.json"): {"areas": [{"name": a} for a in AREAS]},
+    }
+    for (subdir, filename), payload in files.items():
+        os.makedirs(os.path.join(target_dir, subdir), exist_ok=True)
+        with open(os.path.join(target_dir, subdir, filename), "w") as f:
+            json.dump(payload, f)
+    return target_dir
+
+
+def write_array_file(filepath: str, key: str, items: Iterable[Dict[str, Any]]):
+    """Write ``{key: [items...]}`` one item at a time, without building the list"""
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, "w") as f:
+        f.write(f"{{{json.dumps(key)}: [")
+        for n, item in enumerate(items):
+            f.write(",\n" if n else "\n")
+            json.dump(item, f)
+        f.write("\n]}\n")
+
+
+def write_large_data_dir(target_dir: str, count: int, seed: int = 42) -> str:
+    """Write only the listing and sales files, streaming ``count`` listings
+
+    Suitable for sizes (millions of listings) where ``generate`` would hold
+    the whole dataset in memory.
+    """
+    rng = random.Random(seed)
+    agent_count = max(1, count // 100)
+    write_array_file(
+        os.path.join(target_dir, "properties", "active_listings.json"),
+        "active_listings",
+        (make_listing(i, rng, agent_count) for i in range(count)),
+    )
+    write_array_file(
+        os.path.join(target_dir, "transactions", "recent_sales.json"),
+        "recent_sales",
+        (make_sale(i, rng, agent_count) for i in range(count // 5)),
+    )
+    return target_dir
@@ -0,0 +1,311 @@
+"""
+Columnar Listing Store
+Vectorized evaluation of property filters over NumPy column arrays
+"""
+
+import json
+import os
+import struct
+from typing import Any, Dict, Iterable, List, Optional
+
+_NOT_LOADED = object()
+
+# NumPy is imported on first use, keeping it off the server's import path
+np: Any = _NOT_LOADED
+
+# Largest integer a float64 column represents exactly
+_MAX_EXACT_INT = 2**53
+
+NUMERIC_FIELDS = ("price", "bedrooms", "bathrooms", "square_feet", "year_built")
+CATEGORICAL_FIELDS = ("area", "property_type")
+
+# PropertyFilter range predicates as (filter attribute, column, is lower bound)
+RANGE_PREDICATES = (
+    ("min_price", "price", True),
+    ("max_price", "price", False),
+    ("min_bedrooms", "bedrooms", True),
+    ("max_bedrooms", "bedrooms", False),
+    ("min_bathrooms", "bathrooms", True),
+    ("max_bathrooms", "bathrooms", False),
+    ("min_sqft", "square_feet", True),
+    ("max_sqft", "square_feet", False),
+)
+
+# PropertyFilter membership predicates as (filter attribute, column)
+MEMBERSHIP_PREDICATES = (("areas", "area"), ("property_types", "property_type"))
+
+# Shared columns file: magic, aligned column arrays, JSON trailer, trailer length
+COLUMNS_FILE_MAGIC = b"REMCPCOL"
+COLUMNS_FILE_VERSION = 1
+_ARRAY_ALIGNMENT = 64
+
+# Vocabulary values that survive a JSON round trip unchanged
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+class ListingColumns:
+    """Numeric and categorical listing fields stored as NumPy arrays
+
+    Each numeric field is kept twice, with missing values replaced by 0 for
+    lower-bound checks and by +inf for upper-bound checks, which mirrors the
+    defaults used by ``RealEstateDataManager._matches_filter``. Categorical
+    fields are stored as integer codes into a per-column vocabulary.
+
+    Columns can be exported to a file and mapped back read-only with
+    ``map_file``, so several server processes share one copy of the arrays
+    through the OS page cache. The arrays are derived from the listings for
+    filtering; the listings themselves are not backed by them and stay in
+    each process's memory. ``path`` is set on mapped columns.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        lower: Dict[str, Any],
+        upper: Dict[str, Any],
+        codes: Dict[str, Any],
+        vocabularies: Dict[str, Dict[Any, int]],
+        path: Optional[str] = None,
+        source: Optional[str] = None,
+    ):
+        self.size = size
+        self.lower = lower
+        self.upper = upper
+        self.codes = codes
+        self.vocabularies = vocabularies
+        self.path = path
+        self.source = source
+
+    def __reduce__(self):
+        if self.path is not None:
+            # Pickle mapped columns by reference so unpickling maps the file again
+            return _map_or_none, (self.path, self.source)
+        return ListingColumns, (
+            self.size,
+            self.lower,
+            self.upper,
+            self.codes,
+            self.vocabularies,
+        )
+
+    @classmethod
+    def build(cls, listings: List[Dict[str, Any]]) -> Optional["ListingColumns"]:
+        """Build columns for the listings
+
+        Returns None when NumPy is unavailable or when a value cannot be
+        represented without changing filter results (non-numeric prices,
+        NaN, integers beyond float64 precision, unhashable categories).
+        Callers then use the row-by-row scan instead.
+        """
+        if _numpy() is None:
+            return None
+
+        size = len(listings)
+        lower, upper = {}, {}
+        for field in NUMERIC_FIELDS:
+            values = []
+            for listing in listings:
+                value = listing.get(field)
+                if value is None:
+                    if field in listing:
+                        return None
+                    values.append(np.nan)
+                elif not _is_exact_number(value):
+                    return None
+                else:
+                    values.append(value)
+            column = np.array(values, dtype=np.float64)
+            missing = np.isnan(column)
+            lower[field] = np.where(missing, 0.0, column)
+            upper[field] = np.where(missing, np.inf, column)
+
+        codes, vocabularies = {}, {}
+        for field in CATEGORICAL_FIELDS:
+            vocabulary = {}
+            column = np.empty(size, dtype=np.int32)
+            try:
+                for row, listing in enumerate(listings):
+                    column[row] = vocabulary.setdefault(
+                        listing.get(field), len(vocabulary)
+                    )
+            except TypeError:
+                return None
+            codes[field] = column
+            vocabularies[field] = vocabulary
+
+        return cls(size, lower, upper, codes, vocabularies)
+
+    def export(self, path: str, source: str) -> bool:
+        """Write the columns to ``path`` for ``map_file``
+
+        ``source`` identifies the listings the columns were built from (the
+        listings file's content hash); ``map_file`` only accepts a file with
+        the same source. The file is written next to ``path`` and renamed
+        into place. Returns False when a vocabulary holds values JSON cannot
+        round-trip, or when the file cannot be written.
+        """
+        if not all(
+            type(value) in _JSON_SCALARS
+            for vocabulary in self.vocabularies.values()
+            for value in vocabulary
+        ):
+            return False
+
+        arrays = [(f"lower.{field}", column) for field, column in self.lower.items()]
+        arrays += [(f"upper.{field}", column) for field, column in self.upper.items()]
+        arrays += [(f"codes.{field}", column) for field, column in self.codes.items()]
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(COLUMNS_FILE_MAGIC)
+                layout = []
+                for name, column in arrays:
+                    f.write(b"\0" * (-f.tell() % _ARRAY_ALIGNMENT))
+                    layout.append(
+                        {"name": name, "dtype": column.dtype.str, "offset": f.tell()}
+                    )
+                    f.write(np.ascontiguousarray(column).tobytes())
+                trailer = json.dumps(
+                    {
+                        "version": COLUMNS_FILE_VERSION,
+                        "source": source,
+                        "size": self.size,
+                        "arrays": layout,
+                        "vocabularies": {
+                            field: list(vocabulary)
+                            for field, vocabulary in self.vocabularies.items()
+                        },
+                    }
+                ).encode()
+                f.write(trailer)
+                f.write(struct.pack("<Q", len(trailer)))
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        return True
+
+    @classmethod
+    def map_file(cls, path: str, source: str) -> Optional["ListingColumns"]:
+        """Map columns exported by ``export`` read-only
+
+        Returns None when NumPy is unavailable, or when the file is missing,
+        malformed, from another format version or built from another source.
+        """
+        if _numpy() is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(COLUMNS_FILE_MAGIC)) != COLUMNS_FILE_MAGIC:
+                    return None
+                f.seek(-8, os.SEEK_END)
+                (trailer_length,) = struct.unpack("<Q", f.read(8))
+                f.seek(-8 - trailer_length, os.SEEK_END)
+                trailer = json.loads(f.read(trailer_length))
+        except (OSError, ValueError, struct.error):
+            return None
+        if trailer.get("version") != COLUMNS_FILE_VERSION:
+            return None
+        if trailer.get("source") != source:
+            return None
+
+        size = trailer["size"]
+        arrays = {}
+        for entry in trailer["arrays"]:
+            dtype = np.dtype(entry["dtype"])
+            if size:
+                arrays[entry["name"]] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=entry["offset"], shape=(size,)
+                )
+            else:
+                arrays[entry["name"]] = np.empty(0, dtype=dtype)
+
+        def group(prefix):
+            return {
+                name.split(".", 1)[1]: column
+                for name, column in arrays.items()
+                if name.startswith(prefix + ".")
+            }
+
+        vocabularies = {
+            field: {value: code for code, value in enumerate(values)}
+            for field, values in trailer["vocabularies"].items()
+        }
+        return cls(
+            size,
+            group("lower"),
+            group("upper"),
+            group("codes"),
+            vocabularies,
+            path=path,
+            source=source,
+        )
+
+    def mask(self, filters) -> "np.ndarray":
+        """Evaluate the range and membership predicates of a PropertyFilter
+
+        Feature predicates are not handled here; callers resolve them to
+        candidate rows and pass those to ``matching_rows``.
+        """
+        mask = np.ones(self.size, dtype=bool)
+
+        for attribute, field, is_lower in RANGE_PREDICATES:
+            bound = getattr(filters, attribute)
+            if not bound:
+                continue
+            if is_lower:
+                mask &= self.lower[field] >= bound
+            else:
+                mask &= self.upper[field] <= bound
+
+        for attribute, field in MEMBERSHIP_PREDICATES:
+            allowed = getattr(filters, attribute)
+            if not allowed:
+                continue
+            allowed_codes = [
+                code
+                for value, code in self.vocabularies[field].items()
+                if value in allowed
+            ]
+            mask &= np.isin(self.codes[field], allowed_codes)
+
+        return mask
+
+    def matching_rows(
+        self, filters, candidates: Optional[Iterable[int]] = None
+    ) -> List[int]:
+        """Row positions of listings matching the filter's column predicates,
+        optionally restricted to a set of candidate rows"""
+        mask = self.mask(filters)
+        if candidates is not None:
+            allowed = np.zeros(self.size, dtype=bool)
+            allowed[np.fromiter(candidates, dtype=np.intp)] = True
+            mask &= allowed
+        return np.flatnonzero(mask).tolist()
+
+
+def _map_or_none(path: str, source: str) -> Optional[ListingColumns]:
+    """Map a columns file again when unpickling mapped columns"""
+    return ListingColumns.map_file(path, source)
+
+
+def _numpy():
+    """Import NumPy on first call; None when it is not installed"""
+    global np
+    if np is _NOT_LOADED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - exercised via the scan fallback
+            numpy = None
+        np = numpy
+    return np
+
+
+def _is_exact_number(value: Any) -> bool:
+    """Check a value converts to float64 without changing comparisons"""
+    if isinstance(value, int):
+        return -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT
+    return isinstance(value, float) and value == value
@@ -0,0 +1,135 @@
+"""
+Conditional Reads
+Content hashes of resource responses, and "not modified" answers to clients that already have them
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from pydantic import AnyUrl
+
+from serializer import dumps, pretty_output
+from storage import DataBackend
+
+# Appended to a resource URI, followed by a content hash, for a conditional read
+IF_NONE_MATCH = "/if-none-match/"
+
+# Resource URIs whose latest content hash is kept
+DEFAULT_MAX_HASHES = 4096
+
+
+def content_hash(content: Any) -> str:
+    """Hash of a response's text or bytes"""
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.sha256(content).hexdigest()[:32]
+
+
+def split_conditional(uri: str) -> Tuple[str, Optional[str]]:
+    """The resource URI and the content hash of a conditional read URI
+
+    ``realestate://market/area/Downtown/if-none-match/<hash>`` reads
+    ``realestate://market/area/Downtown`` if its hash is not ``<hash>``.
+    Other URIs are returned with no hash.
+    """
+    base, separator, seen = uri.rpartition(IF_NONE_MATCH)
+    if not separator or not base or not seen or "/" in seen:
+        return uri, None
+    return base, seen
+
+
+class ContentHashes:
+    """Latest content hash of each resource URI, tagged with a data version
+
+    A URI's hash is only served while the data version it was computed at
+    is current; recording a hash replaces the URI's entry unless that entry
+    comes from a newer version. The least recently used URIs are dropped
+    once ``max_entries`` are kept.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_HASHES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, uri: str, version: Hashable) -> Optional[str]:
+        """Hash of ``uri`` at ``version``, if one was recorded"""
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(uri)
+            return entry[1]
+
+    def record(self, uri: str, version: Hashable, digest: str):
+        """Keep the hash of ``uri`` at ``version``"""
+        with self._lock:
+            current = self._entries.get(uri)
+            if current is not None and current[0] > version:
+                return
+            self._entries[uri] = (version, digest)
+            self._entries.move_to_end(uri)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class ConditionalFastMCP(FastMCP):
+    """FastMCP server that tags resource contents with their content hash
+
+    Every resource read returns ``content_hash`` in the contents' ``_meta``.
+    Appending ``/if-none-match/<content_hash>`` to a resource URI reads it
+    conditionally: if the resource still has that hash, the answer is a
+    small ``not_modified`` object instead of the full contents.
+
+    Hashes are cached per resource URI under the versions of every dataset
+    (and the output format), so a conditional read of unchanged data is
+    answered without building or encoding the response. A hash is only
+    cached when no refresh published new versions while the response was
+    read.
+    """
+
+    def __init__(self, name: str, data: DataBackend, **settings: Any):
+        super().__init__(name, **settings)
+        self.data = data
+        self.content_hashes = ContentHashes()
+
+    def _version(self) -> Hashable:
+        """Versions every resource response is determined by"""
+        versions = self.data.snapshot().dataset_versions
+        return tuple(sorted(versions.items())), pretty_output()
+
+    async def read_resource(self, uri: AnyUrl | str) -> Iterable[ReadResourceContents]:
+        """Read a resource, or answer ``not_modified`` to a conditional read"""
+        base, seen = split_conditional(str(uri))
+        version = self._version()
+        known = self.content_hashes.get(base, version)
+        if seen is not None and seen == known:
+            return [self._not_modified(seen)]
+
+        contents: List[ReadResourceContents] = []
+        for item in await super().read_resource(base):
+            digest = known or content_hash(item.content)
+            if seen is not None and seen == digest:
+                return [self._not_modified(seen)]
+            contents.append(
+                ReadResourceContents(
+                    item.content,
+                    item.mime_type,
+                    {**(item.meta or {}), "content_hash": digest},
+                )
+            )
+        if len(contents) == 1 and known is None and self._version() == version:
+            self.content_hashes.record(base, version, contents[0].meta["content_hash"])
+        return contents
+
+    @staticmethod
+    def _not_modified(digest: str) -> ReadResourceContents:
+        return ReadResourceContents(
+            dumps({"not_modified": True, "content_hash": digest}),
+            "application/json",
+            {"content_hash": digest, "not_modified": True},
+        )
@@ -0,0 +1,181 @@
+"""
+Streaming JSON Ingestion
+Incremental parsing of data files whose bulk is one large top-level array
+"""
+
+import json
+from typing import Any, Callable, Collection, Dict, List, Optional, TextIO, Tuple
+
+# Characters read from the file per refill
+CHUNK_SIZE = 1 << 20
+
+# Longest single value, in characters, the parser reads ahead for
+MAX_VALUE_SIZE = 64 * CHUNK_SIZE
+
+_WHITESPACE = " \t\n\r"
+
+# Characters a number can continue with past the end of the window
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+# Decode errors this close to the end of the text can come from a value cut
+# off mid-token (a literal such as ``fals`` or a ``\uXXXX`` escape)
+_TRUNCATION_TAIL = 6
+
+
+class _Buffer:
+    """Sliding text window over a file, refilled on demand"""
+
+    def __init__(self, fp: TextIO, chunk_size: int, max_value_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.max_value_size = max_value_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Drop consumed text and read another chunk; False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        self.text = self.text[self.pos :] + chunk
+        self.pos = 0
+        self.eof = not chunk
+        return not self.eof
+
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise json.JSONDecodeError(
+                    "Unexpected end of file", self.text, self.pos
+                )
+
+    def expect(self, char: str):
+        """Consume the next non-whitespace character, which must be ``char``"""
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self.text, self.pos)
+        self.pos += 1
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete JSON value
+
+        The window is only extended when the value may continue past it.
+        Errors anywhere else, and values longer than ``max_value_size``,
+        raise at once instead of reading on to the end of the file.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as error:
+                # The value may continue past the window; retry with more text
+                if _truncated(error) and self._extend():
+                    continue
+                raise
+            # A number ending at the window edge may have more digits
+            if _number_runs_to_end(self.text, end) and self._extend():
+                continue
+            self.pos = end
+            return value
+
+    def _extend(self) -> bool:
+        """Read another chunk for the value being decoded; False at end of file"""
+        if len(self.text) - self.pos > self.max_value_size:
+            raise json.JSONDecodeError(
+                f"Value longer than {self.max_value_size} characters",
+                self.text,
+                self.pos,
+            )
+        return self.fill()
+
+
+def _number_runs_to_end(text: str, end: int) -> bool:
+    """Check only characters a number can continue with follow ``end``"""
+    while end < len(text) and text[end] in _NUMBER_CHARS:
+        end += 1
+    return end == len(text)
+
+
+def _truncated(error: json.JSONDecodeError) -> bool:
+    """Check a decode error could come from the text ending mid-value"""
+    return (
+        error.msg.startswith("Unterminated string")
+        or len(error.doc) - error.pos <= _TRUNCATION_TAIL
+    )
+
+
+def load(
+    fp: TextIO,
+    stream_keys: Collection[str],
+    transform: Optional[Callable[[Any], Any]] = None,
+    object_pairs_hook: Optional[Callable[[List[Tuple[str, Any]]], Any]] = None,
+    chunk_size: int = CHUNK_SIZE,
+    max_value_size: int = MAX_VALUE_SIZE,
+) -> Dict[str, Any]:
+    """Parse a JSON object, streaming the arrays under ``stream_keys``
+
+    The result equals ``json.load(fp)``, except that every element of a
+    streamed array is passed through ``transform`` as soon as it is parsed.
+    Only one element's text is held at a time, so peak memory stays close
+    to the size of the records being built rather than the file size plus
+    the object tree. Other top-level values are decoded whole. Every object
+    in the file is built with ``object_pairs_hook``, as in ``json.load``.
+
+    Raises ``json.JSONDecodeError`` for malformed input, a top-level value
+    that is not an object, or a single value (a streamed element, or another
+    top-level value) longer than ``max_value_size`` characters. Malformed
+    input is reported where it is found, without reading the rest of the
+    file.
+    """
+    decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+    buffer = _Buffer(fp, chunk_size, max_value_size)
+    result: Dict[str, Any] = {}
+
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        buffer.pos += 1
+        return result
+
+    while True:
+        key = buffer.decode(decoder)
+        if not isinstance(key, str):
+            raise json.JSONDecodeError(
+                "Expecting property name", buffer.text, buffer.pos
+            )
+        buffer.expect(":")
+
+        if key in stream_keys and buffer.peek() == "[":
+            result[key] = _load_array(buffer, decoder, transform)
+        else:
+            result[key] = buffer.decode(decoder)
+
+        if buffer.peek() == "}":
+            buffer.pos += 1
+            return result
+        buffer.expect(",")
+
+
+def _load_array(
+    buffer: _Buffer,
+    decoder: json.JSONDecoder,
+    transform: Optional[Callable[[Any], Any]],
+) -> list:
+    """Parse an array element by element"""
+    items = []
+    buffer.expect("[")
+    if buffer.peek() == "]":
+        buffer.pos += 1
+        return items
+
+    while True:
+        item = buffer.decode(decoder)
+        items.append(transform(item) if transform else item)
+        if buffer.peek() == "]":
+            buffer.pos += 1
+            return items
+        buffer.expect(",")
@@ -7,9 +7,9 @@ market analysis, client relationships, and area intelligence.
 """
 
 import asyncio
+import os
 
-from mcp.server.fastmcp import FastMCP
-
+from conditional import ConditionalFastMCP
 from prompts import register_all_prompts
 from resources import (
     register_agent_resources,
@@ -27,9 +27,10 @@ from tools.market_tools import register_market_tools
 from tools.property_tools import register_property_tools
 from tools.system_tools import register_system_tools
 from utils import data_manager
+from watcher import DataWatcher
 
 # Create the FastMCP server
-mcp = FastMCP("Real Estate MCP Server")
+mcp = ConditionalFastMCP("Real Estate MCP Server", data_manager)
 
 
 def register_all_components():
@@ -61,11 +62,14 @@ async def main():
 
     # Print startup information
     print("🏠 Real Estate MCP Server Starting...")
-    print(f"📊 Loaded {len(data_manager.get_all_properties())} properties")
-    print(f"👥 Loaded {len(data_manager.get_all_agents())} agents")
-    print(f"🏢 Loaded {len(data_manager.get_all_clients())} clients")
-    print(f"📈 Loaded {len(data_manager.get_recent_sales())} recent sales")
-    print(f"🌍 Loaded {len(data_manager.get_all_areas())} areas")
+    # Datasets load on first use, so startup does not wait on data files
+    print(f"📂 Serving data from {data_manager.data_dir} (loaded on first use)")
+    # Opt-in background reloading when files under data/ change
+    if os.environ.get("REAL_ESTATE_WATCH_DATA", "").lower() in ("1", "true", "yes"):
+        watcher = DataWatcher(data_manager)
+        watcher.start()
+        print(f"👀 Watching {data_manager.data_dir} for changes ({watcher.mode})")
+
     print("✅ Server ready for connections!")
 
     # Run the server with SSE transport using FastMCP's built-in functionality
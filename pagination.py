@@ -0,0 +1,121 @@
+"""
+Cursor Pagination
+Opaque page cursors for list responses, tied to the data version they page through
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, List, Optional, Sequence
+
+# Page size when a request gives no limit, and the largest page served
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+@dataclass
+class Page:
+    """One page of a result list with the cursor of the page after it"""
+
+    items: List[Any]
+    total_count: int
+    offset: int
+    next_cursor: Optional[str]
+
+
+class Pager:
+    """Pages through the results of one query at one data version
+
+    A cursor records the offset of the next page, the version of the dataset
+    the results come from and a fingerprint of the query. Results never
+    change within a version, so following cursors lists every result exactly
+    once; a cursor used after a refresh changed the dataset, or with another
+    query, is rejected with a ValueError instead of silently skipping or
+    repeating results.
+    """
+
+    def __init__(self, version: int, query: Hashable = ()):
+        self.version = version
+        self.fingerprint = hashlib.sha256(repr(query).encode()).hexdigest()[:16]
+
+    def page_size(self, limit: Optional[int]) -> int:
+        """Rows per page for a requested ``limit``"""
+        if limit is None:
+            return DEFAULT_PAGE_SIZE
+        if not 0 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 0 and {MAX_PAGE_SIZE}")
+        return limit
+
+    def start(self, cursor: Optional[str]) -> int:
+        """Offset a cursor continues from; 0 without a cursor"""
+        if not cursor:
+            return 0
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            offset, version, fingerprint = json.loads(
+                base64.urlsafe_b64decode(padded.encode("ascii"))
+            )
+        except (binascii.Error, UnicodeError, ValueError, TypeError):
+            raise ValueError(f"Invalid cursor: {cursor}") from None
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if fingerprint != self.fingerprint:
+            raise ValueError("Cursor was issued for a different query")
+        if version != self.version:
+            raise ValueError(
+                "Cursor expired: the data changed since it was issued, "
+                "start again without a cursor"
+            )
+        return offset
+
+    def cursor(self, offset: int) -> str:
+        """Cursor of the page starting at ``offset``"""
+        token = json.dumps([offset, self.version, self.fingerprint])
+        return base64.urlsafe_b64encode(token.encode()).decode("ascii").rstrip("=")
+
+    def page(
+        self,
+        fetch: Callable[[int, int], Sequence[Any]],
+        count: Callable[[], int],
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+    ) -> Page:
+        """Page of results after ``cursor``, or from ``offset`` without one
+
+        ``fetch(offset, size)`` returns up to ``size`` results from
+        ``offset`` and ``count()`` the total number of results. ``count`` is
+        skipped when a short page already tells the total.
+        """
+        size = self.page_size(limit)
+        if cursor and offset:
+            raise ValueError("Pass either offset or cursor, not both")
+        offset = self.start(cursor) if cursor else offset
+        items = list(fetch(offset, size))
+        if len(items) < size and (items or not offset):
+            total = offset + len(items)
+        else:
+            total = count()
+        end = offset + len(items)
+        return Page(
+            items,
+            total,
+            offset,
+            self.cursor(end) if size and end < total else None,
+        )
+
+    def slice(
+        self,
+        results: Sequence[Any],
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page:
+        """Page of an already computed result list"""
+        return self.page(
+            lambda offset, size: results[offset : offset + size],
+            lambda: len(results),
+            limit,
+            cursor,
+        )
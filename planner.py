@@ -0,0 +1,776 @@
+"""
+Filter Query Planner
+Selectivity estimates, access path choice and predicate ordering for property filters
+"""
+
+import heapq
+import itertools
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from columnar import MEMBERSHIP_PREDICATES, RANGE_PREDICATES
+from range_index import RangeIndex
+
+# Buckets of the equi-depth histogram kept per numeric column
+HISTOGRAM_BUCKETS = 32
+
+# Fields with statistics, built from a sorted range index over each
+STATISTICS_FIELDS = ("price", "bedrooms", "bathrooms", "square_feet", "list_date")
+
+# Fields whose range index is kept as an access path and a sort order
+RANGE_INDEX_FIELDS = ("price", "square_feet", "bedrooms", "list_date")
+
+# Fields compared as strings (ISO dates)
+TEXT_FIELDS = ("list_date",)
+
+# PropertyFilter date predicates as (filter attribute, field, is lower bound)
+DATE_PREDICATES = (
+    ("min_list_date", "list_date", True),
+    ("max_list_date", "list_date", False),
+)
+
+# Relative cost of one row through each step of a plan
+ROW_CHECK_COST = 1.0
+FEATURE_CHECK_COST = 4.0
+INDEX_ROW_COST = 0.5
+SORT_ROW_COST = 1.0
+VECTOR_ROW_COST = 0.02
+
+
+class ColumnStatistics:
+    """Row counts, distinct values and an equi-depth histogram of one column
+
+    ``quantiles`` holds ``HISTOGRAM_BUCKETS + 1`` values splitting the
+    ordered values into buckets of equal row counts; fractions within a
+    bucket are interpolated linearly. Rows without an orderable value are
+    counted in ``unordered``.
+    """
+
+    __slots__ = ("rows", "ordered", "unordered", "distinct", "quantiles")
+
+    def __init__(
+        self,
+        rows: int,
+        ordered: int,
+        unordered: int,
+        distinct: int,
+        quantiles: List[float],
+    ):
+        self.rows = rows
+        self.ordered = ordered
+        self.unordered = unordered
+        self.distinct = distinct
+        self.quantiles = quantiles
+
+    def __reduce__(self):
+        return ColumnStatistics, (
+            self.rows,
+            self.ordered,
+            self.unordered,
+            self.distinct,
+            self.quantiles,
+        )
+
+    @classmethod
+    def from_index(cls, index: RangeIndex) -> "ColumnStatistics":
+        """Statistics of a range index's column"""
+        values = index.values
+        count = len(values)
+        distinct = sum(
+            1
+            for position in range(count)
+            if not position or values[position] != values[position - 1]
+        )
+        quantiles = (
+            [
+                values[round(i * (count - 1) / HISTOGRAM_BUCKETS)]
+                for i in range(HISTOGRAM_BUCKETS + 1)
+            ]
+            if count
+            else []
+        )
+        return cls(
+            count + len(index.unordered),
+            count,
+            len(index.unordered),
+            distinct,
+            quantiles,
+        )
+
+    def _fraction_below(self, bound: float, inclusive: bool) -> float:
+        """Estimated fraction of the ordered values below (or at) ``bound``"""
+        quantiles = self.quantiles
+        if not quantiles:
+            return 0.0
+        position = (bisect_right if inclusive else bisect_left)(quantiles, bound)
+        if position == 0:
+            return 0.0
+        if position > HISTOGRAM_BUCKETS:
+            return 1.0
+        low, high = quantiles[position - 1], quantiles[position]
+        if high <= low:
+            within = 1.0
+        elif isinstance(bound, str):
+            # Dates are not interpolated; assume the middle of the bucket
+            within = 0.5
+        else:
+            within = (bound - low) / (high - low)
+        return (position - 1 + within) / HISTOGRAM_BUCKETS
+
+    def selectivity(self, bound: float, is_lower: bool) -> float:
+        """Estimated fraction of rows passing ``value >= bound`` or ``value <= bound``
+
+        Rows without a value pass a numeric lower bound when the default of 0
+        does, and never pass an upper bound or a date bound, as in
+        ``_matches_filter``.
+        """
+        if not self.rows:
+            return 0.0
+        if is_lower:
+            passing = 1.0 - self._fraction_below(bound, inclusive=False)
+            missing_pass = (
+                self.unordered if not isinstance(bound, str) and bound <= 0 else 0
+            )
+        else:
+            passing = self._fraction_below(bound, inclusive=True)
+            missing_pass = 0
+        return (self.ordered * passing + missing_pass) / self.rows
+
+
+class CategoryIndex:
+    """Row positions of each distinct value of a categorical field"""
+
+    __slots__ = ("field", "rows_by_value", "size")
+
+    def __init__(self, field: str, rows_by_value: Dict[Any, array], size: int):
+        self.field = field
+        self.rows_by_value = rows_by_value
+        self.size = size
+
+    def __reduce__(self):
+        return CategoryIndex, (self.field, self.rows_by_value, self.size)
+
+    @classmethod
+    def build(
+        cls, records: List[Dict[str, Any]], field: str
+    ) -> Optional["CategoryIndex"]:
+        """Index the records' values of ``field``; None if a value is unhashable"""
+        rows_by_value: Dict[Any, array] = {}
+        try:
+            for row, record in enumerate(records):
+                value = record.get(field)
+                rows = rows_by_value.get(value)
+                if rows is None:
+                    rows = rows_by_value[value] = array("i")
+                rows.append(row)
+        except TypeError:
+            return None
+        return cls(field, rows_by_value, len(records))
+
+    @property
+    def distinct(self) -> int:
+        """Number of distinct values"""
+        return len(self.rows_by_value)
+
+    def _groups(self, values: Iterable[Any]) -> List[array]:
+        """Row arrays of the distinct values among ``values``"""
+        groups, seen = [], set()
+        for value in values:
+            try:
+                rows = self.rows_by_value.get(value)
+            except TypeError:
+                continue
+            if rows is not None and id(rows) not in seen:
+                seen.add(id(rows))
+                groups.append(rows)
+        return groups
+
+    def count(self, values: Iterable[Any]) -> int:
+        """Number of rows holding one of the values"""
+        return sum(len(rows) for rows in self._groups(values))
+
+    def rows_for(self, values: Iterable[Any]) -> List[int]:
+        """Rows holding one of the values, in row order"""
+        groups = self._groups(values)
+        if len(groups) == 1:
+            return groups[0].tolist()
+        return list(heapq.merge(*groups))
+
+
+class FeatureStatistics:
+    """Number of listings carrying each distinct feature (lower-cased)"""
+
+    __slots__ = ("rows", "counts")
+
+    def __init__(self, rows: int, counts: Dict[str, int]):
+        self.rows = rows
+        self.counts = counts
+
+    def __reduce__(self):
+        return FeatureStatistics, (self.rows, self.counts)
+
+    @classmethod
+    def build(cls, records: List[Dict[str, Any]]) -> "FeatureStatistics":
+        counts: Dict[str, int] = {}
+        for record in records:
+            for feature in set(
+                f.lower() for f in record.get("features") or () if isinstance(f, str)
+            ):
+                counts[feature] = counts.get(feature, 0) + 1
+        return cls(len(records), counts)
+
+    def selectivity(self, needle: str) -> float:
+        """Estimated fraction of listings with a feature containing ``needle``"""
+        if not self.rows:
+            return 0.0
+        matching = sum(
+            count for feature, count in self.counts.items() if needle in feature
+        )
+        return min(1.0, matching / self.rows)
+
+
+class Predicate(NamedTuple):
+    """One condition of a PropertyFilter"""
+
+    description: str
+    field: str
+    check: Callable[[Dict[str, Any]], bool]
+    selectivity: float
+    cost: float
+
+
+class FilterPlan(NamedTuple):
+    """How a PropertyFilter is evaluated
+
+    ``access_path`` produces candidate rows that satisfy ``index_predicates``;
+    ``residual`` predicates are then checked on each candidate in order.
+    With an ``order`` of ``"index"`` the candidates are walked in the sort
+    field's range index order and the walk stops once the requested page is
+    full; with ``"sort"`` the matching rows are sorted afterwards.
+    """
+
+    access_path: str
+    index_predicates: List[Predicate]
+    residual: List[Predicate]
+    estimated_candidates: float
+    estimated_rows: float
+    cost: float
+    total_rows: int
+    order: Optional[str] = None
+
+    def explain(self, candidates: int, rows: int) -> Dict[str, Any]:
+        """The plan with estimated and actual row counts"""
+        explained = {
+            "access_path": self.access_path,
+            "index_predicates": [p.description for p in self.index_predicates],
+            "residual_predicates": [
+                {
+                    "predicate": p.description,
+                    "estimated_selectivity": round(p.selectivity, 4),
+                }
+                for p in self.residual
+            ],
+            "estimated_cost": round(self.cost, 1),
+            "total_rows": self.total_rows,
+            "estimated_rows": {
+                "candidates": round(self.estimated_candidates),
+                "result": round(self.estimated_rows),
+            },
+            "actual_rows": {"candidates": candidates, "result": rows},
+        }
+        if self.order is not None:
+            explained["order"] = "index_order" if self.order == "index" else "sort"
+        return explained
+
+
+class FilterPlanner:
+    """Chooses and runs the cheapest plan for each PropertyFilter
+
+    Statistics are gathered once when the listing indexes are built: an
+    equi-depth histogram and distinct count per numeric column and the
+    listing date, row lists per area and property type, and feature
+    frequencies. For each filter the planner estimates every predicate's
+    selectivity, costs each access path (area index, property type index,
+    a range index on price, square feet, bedrooms or listing date, feature
+    index, vectorized column scan or full scan) and runs the cheapest. The
+    remaining predicates are checked cheapest-to-reject first, ordered by
+    cost over rejection rate.
+
+    Results are identical to checking ``_matches_filter`` on every listing,
+    in listing order or, with ``sort_by``, in the order of that field's
+    range index: ascending or descending values, equal values in listing
+    order and listings without a value last. A sorted page can be served
+    by walking the range index and stopping once the page is full.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        statistics: Dict[str, ColumnStatistics],
+        range_indexes: Dict[str, RangeIndex],
+        categories: Dict[str, Optional[CategoryIndex]],
+        features: FeatureStatistics,
+    ):
+        self.size = size
+        self.statistics = statistics
+        self.range_indexes = range_indexes
+        self.categories = categories
+        self.features = features
+
+    def __reduce__(self):
+        return FilterPlanner, (
+            self.size,
+            self.statistics,
+            self.range_indexes,
+            self.categories,
+            self.features,
+        )
+
+    @classmethod
+    def build(cls, listings: List[Dict[str, Any]]) -> "FilterPlanner":
+        """Gather statistics and build the planner's indexes"""
+        statistics, range_indexes = {}, {}
+        for field in STATISTICS_FIELDS:
+            index = RangeIndex.build(listings, field, text=field in TEXT_FIELDS)
+            statistics[field] = ColumnStatistics.from_index(index)
+            if field in RANGE_INDEX_FIELDS:
+                range_indexes[field] = index
+        categories = {
+            field: CategoryIndex.build(listings, field)
+            for _, field in MEMBERSHIP_PREDICATES
+        }
+        return cls(
+            len(listings),
+            statistics,
+            range_indexes,
+            categories,
+            FeatureStatistics.build(listings),
+        )
+
+    def predicates(self, filters) -> List[Predicate]:
+        """The filter's predicates with their estimated selectivities"""
+        predicates = []
+        for attribute, field, is_lower in RANGE_PREDICATES + DATE_PREDICATES:
+            bound = getattr(filters, attribute)
+            if not bound:
+                continue
+            stats = self.statistics.get(field)
+            selectivity = stats.selectivity(bound, is_lower) if stats else 0.5
+            if field in TEXT_FIELDS:
+                check = _date_bound(field, bound, is_lower)
+            else:
+                check = (_at_least if is_lower else _at_most)(field, bound)
+            predicates.append(
+                Predicate(
+                    f"{field} {'>=' if is_lower else '<='} {bound}",
+                    field,
+                    check,
+                    selectivity,
+                    ROW_CHECK_COST,
+                )
+            )
+
+        for attribute, field in MEMBERSHIP_PREDICATES:
+            allowed = getattr(filters, attribute)
+            if not allowed:
+                continue
+            index = self.categories.get(field)
+            if index is not None and self.size:
+                selectivity = index.count(allowed) / self.size
+            else:
+                selectivity = 0.5
+            predicates.append(
+                Predicate(
+                    f"{field} in {list(allowed)!r}",
+                    field,
+                    _member_of(field, allowed),
+                    selectivity,
+                    ROW_CHECK_COST,
+                )
+            )
+
+        for required in filters.features or []:
+            needle = required.lower()
+            predicates.append(
+                Predicate(
+                    f"features contain {required!r}",
+                    "features",
+                    _has_feature(needle),
+                    self.features.selectivity(needle),
+                    FEATURE_CHECK_COST,
+                )
+            )
+        return predicates
+
+    def plan(self, filters, columns=None) -> FilterPlan:
+        """Cheapest plan for the filter; ``columns`` enables the vectorized scan"""
+        predicates = self.predicates(filters)
+        size = self.size
+        matching = size * _product(p.selectivity for p in predicates)
+        estimated_rows = _page_size(matching, filters)
+
+        def indexed(path, index_predicates, candidates, lookup_cost):
+            residual = _order([p for p in predicates if p not in index_predicates])
+            cost = lookup_cost + candidates * (
+                INDEX_ROW_COST + _residual_cost(residual)
+            )
+            return FilterPlan(
+                path,
+                index_predicates,
+                residual,
+                candidates,
+                estimated_rows,
+                cost,
+                size,
+            )
+
+        ordered = _order(predicates)
+        options = [
+            FilterPlan(
+                "full_scan",
+                [],
+                ordered,
+                size,
+                estimated_rows,
+                size * _residual_cost(ordered),
+                size,
+            )
+        ]
+
+        by_field: Dict[str, List[Predicate]] = {}
+        for predicate in predicates:
+            by_field.setdefault(predicate.field, []).append(predicate)
+
+        for _, field in MEMBERSHIP_PREDICATES:
+            if field in by_field and self.categories.get(field) is not None:
+                chosen = by_field[field]
+                candidates = size * chosen[0].selectivity
+                options.append(indexed(f"{field}_index", chosen, candidates, 0.0))
+
+        for field in RANGE_INDEX_FIELDS:
+            bounds = by_field.get(field)
+            if bounds:
+                candidates = size * _range_selectivity(self.statistics[field], bounds)
+                options.append(
+                    indexed(
+                        f"{field}_index",
+                        bounds,
+                        candidates,
+                        # Range index rows come in value order and are sorted back
+                        candidates * SORT_ROW_COST,
+                    )
+                )
+
+        features = by_field.get("features")
+        if features:
+            postings = sum(size * p.selectivity for p in features)
+            candidates = size * _product(p.selectivity for p in features)
+            options.append(
+                indexed(
+                    "feature_index", features, candidates, postings * INDEX_ROW_COST
+                )
+            )
+
+        vectorized = [
+            p
+            for p in predicates
+            if p.field != "features" and p.field not in TEXT_FIELDS
+        ]
+        if columns is not None and vectorized:
+            # Date predicates are checked on the rows the columns select
+            dated = _order([p for p in predicates if p.field in TEXT_FIELDS])
+            selected = size * _product(
+                p.selectivity for p in predicates if p not in dated
+            )
+            postings = sum(size * p.selectivity for p in features or [])
+            options.append(
+                FilterPlan(
+                    "columnar_scan",
+                    [p for p in predicates if p not in dated],
+                    dated,
+                    size,
+                    estimated_rows,
+                    size * VECTOR_ROW_COST * len(vectorized)
+                    + postings * INDEX_ROW_COST
+                    + selected * (INDEX_ROW_COST + _residual_cost(dated)),
+                    size,
+                )
+            )
+
+        if filters.sort_by:
+            options = [
+                option._replace(
+                    order="sort", cost=option.cost + matching * SORT_ROW_COST
+                )
+                for option in options
+            ]
+            options.append(self._ordered_plan(filters, predicates, by_field, matching))
+
+        # min() keeps the earliest option on ties, so simpler paths win
+        return min(options, key=lambda option: option.cost)
+
+    def _ordered_plan(
+        self,
+        filters,
+        predicates: List[Predicate],
+        by_field: Dict[str, List[Predicate]],
+        matching: float,
+    ) -> FilterPlan:
+        """Plan walking the sort field's range index until the page is full"""
+        field = filters.sort_by
+        bounds = by_field.get(field, [])
+        span = self.size * (
+            _range_selectivity(self.statistics[field], bounds) if bounds else 1.0
+        )
+        residual = _order([p for p in predicates if p not in bounds])
+        wanted = None if filters.limit is None else filters.offset + filters.limit
+        if wanted is None or matching <= wanted:
+            walked = span
+        else:
+            walked = min(span, wanted * span / matching)
+        return FilterPlan(
+            f"{field}_index",
+            bounds,
+            residual,
+            walked,
+            _page_size(matching, filters),
+            walked * (INDEX_ROW_COST + _residual_cost(residual)),
+            self.size,
+            "index",
+        )
+
+    def run(
+        self,
+        plan: FilterPlan,
+        filters,
+        listings: List[Dict[str, Any]],
+        columns=None,
+        feature_index=None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Evaluate a plan; returns the matching listings and the candidate count"""
+        if plan.order == "index":
+            return self._walk(plan, filters, listings)
+        rows, count = self._rows(plan, filters, listings, columns, feature_index)
+        if filters.sort_by:
+            rows.sort(
+                key=self.range_indexes[filters.sort_by].sort_key(filters.descending)
+            )
+        return [listings[row] for row in _page(rows, filters)], count
+
+    def _rows(
+        self,
+        plan: FilterPlan,
+        filters,
+        listings: List[Dict[str, Any]],
+        columns,
+        feature_index,
+    ) -> Tuple[List[int], int]:
+        """Matching rows of an unordered plan, in row order, and the candidate count"""
+        path = plan.access_path
+        if path == "full_scan":
+            candidates: Iterable[int] = range(len(listings))
+            count = len(listings)
+        elif path == "columnar_scan":
+            feature_rows = (
+                _feature_rows(feature_index, filters.features)
+                if filters.features
+                else None
+            )
+            if feature_rows is not None and not feature_rows:
+                return [], len(listings)
+            candidates = columns.matching_rows(filters, feature_rows)
+            count = len(listings)
+        elif path == "feature_index":
+            candidates = sorted(_feature_rows(feature_index, filters.features))
+            count = len(candidates)
+        elif plan.index_predicates[0].field in self.range_indexes:
+            candidates = self._range_rows(plan.index_predicates, listings)
+            count = len(candidates)
+        else:
+            field = plan.index_predicates[0].field
+            allowed = getattr(filters, _MEMBERSHIP_ATTRIBUTES[field])
+            candidates = self.categories[field].rows_for(allowed)
+            count = len(candidates)
+
+        checks = [p.check for p in plan.residual]
+        if not checks:
+            return list(candidates), count
+        return [
+            row for row in candidates if all(check(listings[row]) for check in checks)
+        ], count
+
+    def _walk(
+        self, plan: FilterPlan, filters, listings: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Walk the sort field's range index until the requested page is full"""
+        index = self.range_indexes[filters.sort_by]
+        low, high = _bounds(plan.index_predicates)
+        rows = itertools.chain(
+            index.iter_rows(low, high, filters.descending),
+            # Rows without an orderable value come last and follow the
+            # bounds' defaults for missing values
+            (
+                row
+                for row in index.unordered
+                if all(p.check(listings[row]) for p in plan.index_predicates)
+            ),
+        )
+        checks = [p.check for p in plan.residual]
+        wanted = None if filters.limit is None else filters.offset + filters.limit
+        results, walked = [], 0
+        if wanted != 0:
+            for row in rows:
+                walked += 1
+                listing = listings[row]
+                if all(check(listing) for check in checks):
+                    results.append(listing)
+                    if len(results) == wanted:
+                        break
+        return results[filters.offset :], walked
+
+    def _range_rows(
+        self, predicates: List[Predicate], listings: List[Dict[str, Any]]
+    ) -> List[int]:
+        """Rows satisfying one range index's predicates, in row order"""
+        index = self.range_indexes[predicates[0].field]
+        rows = index.rows_between(*_bounds(predicates)).tolist()
+        # Rows without an orderable value follow _matches_filter's defaults
+        rows.extend(
+            row
+            for row in index.unordered
+            if all(p.check(listings[row]) for p in predicates)
+        )
+        rows.sort()
+        return rows
+
+
+# PropertyFilter attribute of each membership field
+_MEMBERSHIP_ATTRIBUTES = {
+    field: attribute for attribute, field in MEMBERSHIP_PREDICATES
+}
+
+
+def _at_least(field: str, bound: float) -> Callable[[Dict[str, Any]], bool]:
+    """Lower bound check with ``_matches_filter``'s default for missing values"""
+
+    def check(prop):
+        return not prop.get(field, 0) < bound
+
+    check.bound, check.is_lower = bound, True
+    return check
+
+
+def _at_most(field: str, bound: float) -> Callable[[Dict[str, Any]], bool]:
+    """Upper bound check with ``_matches_filter``'s default for missing values"""
+    infinity = float("inf")
+
+    def check(prop):
+        return not prop.get(field, infinity) > bound
+
+    check.bound, check.is_lower = bound, False
+    return check
+
+
+def _date_bound(
+    field: str, bound: str, is_lower: bool
+) -> Callable[[Dict[str, Any]], bool]:
+    """Date bound check; listings without a date string never pass"""
+
+    def check(prop):
+        value = prop.get(field)
+        if not isinstance(value, str):
+            return False
+        return value >= bound if is_lower else value <= bound
+
+    check.bound, check.is_lower = bound, is_lower
+    return check
+
+
+def _member_of(field: str, allowed: List[Any]) -> Callable[[Dict[str, Any]], bool]:
+    def check(prop):
+        return prop.get(field) in allowed
+
+    return check
+
+
+def _has_feature(needle: str) -> Callable[[Dict[str, Any]], bool]:
+    def check(prop):
+        return any(needle in feature.lower() for feature in prop.get("features", []))
+
+    return check
+
+
+def _feature_rows(feature_index, features: List[str]) -> set:
+    """Rows whose features contain every required feature"""
+    candidates = None
+    for required in features:
+        rows = feature_index.rows_containing(required)
+        candidates = rows if candidates is None else candidates & rows
+        if not candidates:
+            return set()
+    return candidates
+
+
+def _bounds(predicates: List[Predicate]) -> Tuple[Optional[Any], Optional[Any]]:
+    """Tightest lower and upper bound of one field's range predicates"""
+    low = high = None
+    for predicate in predicates:
+        bound = predicate.check.bound
+        if predicate.check.is_lower:
+            low = bound if low is None else max(low, bound)
+        else:
+            high = bound if high is None else min(high, bound)
+    return low, high
+
+
+def _range_selectivity(stats: ColumnStatistics, predicates: List[Predicate]) -> float:
+    """Estimated fraction of rows within all of one field's bounds"""
+    low, high = _bounds(predicates)
+    low_pass = stats.selectivity(low, True) if low is not None else 1.0
+    high_pass = stats.selectivity(high, False) if high is not None else 1.0
+    # Both bounds restrict the same column, so the pass fractions overlap
+    return max(0.0, low_pass + high_pass - 1.0)
+
+
+def _page(rows: List[Any], filters) -> List[Any]:
+    """The filter's page of the rows"""
+    if filters.limit is None:
+        return rows[filters.offset :] if filters.offset else rows
+    return rows[filters.offset : filters.offset + filters.limit]
+
+
+def _page_size(matching: float, filters) -> float:
+    """Estimated rows in the filter's page out of ``matching`` rows"""
+    rows = max(0.0, matching - filters.offset)
+    return rows if filters.limit is None else min(rows, filters.limit)
+
+
+def _order(predicates: List[Predicate]) -> List[Predicate]:
+    """Predicates in the order minimizing expected checks per row
+
+    For independent predicates the optimum sorts by cost divided by the
+    rejection rate.
+    """
+    return sorted(
+        predicates,
+        key=lambda p: (
+            p.cost / (1.0 - p.selectivity) if p.selectivity < 1.0 else float("inf")
+        ),
+    )
+
+
+def _residual_cost(predicates: List[Predicate]) -> float:
+    """Expected cost of checking the ordered predicates on one row"""
+    cost, reach = 0.0, 1.0
+    for predicate in predicates:
+        cost += reach * predicate.cost
+        reach *= predicate.selectivity
+    return cost
+
+
+def _product(values: Iterable[float]) -> float:
+    result = 1.0
+    for value in values:
+        result *= value
+    return result
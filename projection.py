@@ -0,0 +1,120 @@
+"""
+Field Projection
+Named field sets and record projection applied before responses are serialized
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from storage import DataAccess
+
+# Field sets per record kind; "full" (or no fields) keeps every field
+FIELD_SETS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "property": {
+        "summary": ("id", "address", "area", "price", "bedrooms", "bathrooms"),
+        "card": (
+            "id",
+            "address",
+            "city",
+            "area",
+            "property_type",
+            "price",
+            "bedrooms",
+            "bathrooms",
+            "square_feet",
+            "year_built",
+            "features",
+            "list_date",
+            "status",
+            "agent_id",
+        ),
+    },
+    "agent": {
+        "summary": ("id", "name", "title", "phone", "email"),
+        "card": (
+            "id",
+            "name",
+            "title",
+            "phone",
+            "email",
+            "photo",
+            "years_experience",
+            "specializations",
+            "expertise_areas",
+            "languages",
+        ),
+    },
+    "client": {
+        "summary": ("id", "name", "type", "status", "agent_id"),
+        "card": (
+            "id",
+            "name",
+            "type",
+            "status",
+            "agent_id",
+            "timeline",
+            "last_contact",
+            "next_follow_up",
+            "preferences",
+        ),
+    },
+}
+
+FULL = "full"
+
+# Record dataset holding each kind's records
+KIND_DATASETS = {"property": "properties", "agent": "agents", "client": "clients"}
+
+
+def parse_fields(
+    kind: str, fields: Optional[str], data: "DataAccess"
+) -> Optional[Tuple[str, ...]]:
+    """Fields to keep for a ``fields`` parameter; None keeps every field
+
+    ``fields`` is a comma-separated list of field set names (``summary``,
+    ``card``, ``full``) and field names, combined in the order given.
+    Names that are neither a field set nor a field held by the kind's
+    records in ``data`` are rejected with a ValueError. Records missing a
+    requested field are returned without it.
+    """
+    if fields is None:
+        return None
+    sets = FIELD_SETS[kind]
+    known: Optional[Tuple[str, ...]] = None
+    selected: Dict[str, None] = {}
+    for name in (part.strip() for part in fields.split(",")):
+        if name == FULL:
+            return None
+        if name in sets:
+            selected.update(dict.fromkeys(sets[name]))
+        elif name:
+            if known is None:
+                known = data.get_record_fields(KIND_DATASETS[kind])
+            if name not in known:
+                raise ValueError(
+                    f"Unknown {kind} field {name!r}; expected one of "
+                    f"{', '.join([*sets, FULL])} or field names: {', '.join(known)}"
+                )
+            selected[name] = None
+    if not selected:
+        raise ValueError(
+            f"No fields given; expected field names or one of "
+            f"{', '.join([*sets, FULL])}"
+        )
+    return tuple(selected)
+
+
+def project(record: Optional[Mapping[str, Any]], fields: Optional[Tuple[str, ...]]):
+    """The record's values of ``fields``, or the record itself without fields"""
+    if fields is None or record is None:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+def project_all(
+    records: Iterable[Mapping[str, Any]], fields: Optional[Tuple[str, ...]]
+) -> List[Any]:
+    """Project every record; the records are returned as given without fields"""
+    if fields is None:
+        return records if isinstance(records, list) else list(records)
+    return [{field: r[field] for field in fields if field in r} for r in records]
@@ -0,0 +1,149 @@
+"""
+Range Indexes
+Listing rows sorted by a field's value, for range predicates resolved with bisect
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Largest integer a float64 represents exactly
+_MAX_EXACT_INT = 2**53
+
+
+class RangeIndex:
+    """Row positions of records ordered by one field
+
+    Numbers (integers and floats other than NaN), or strings for a ``text``
+    index such as ISO dates, are kept sorted in ``values``, with the row of
+    each value at the same position in ``rows``; equal values keep row
+    order. Numeric values are a float64 array, or a list of the original
+    values when an integer is beyond float64 precision, so such integers
+    still order exactly. Every other row (field missing, None, NaN, values
+    of the other kind) is listed in ``unordered``, and range lookups leave
+    those rows to the caller.
+
+    ``ranks`` maps each row to the position of the first value equal to its
+    own, or to ``len(values)`` for unordered rows, so candidate rows can be
+    put in value order without comparing the values themselves.
+    """
+
+    __slots__ = ("field", "text", "values", "rows", "unordered", "ranks")
+
+    def __init__(
+        self,
+        field: str,
+        text: bool,
+        values: Sequence,
+        rows: array,
+        unordered: array,
+        ranks: array,
+    ):
+        self.field = field
+        self.text = text
+        self.values = values
+        self.rows = rows
+        self.unordered = unordered
+        self.ranks = ranks
+
+    def __reduce__(self):
+        return RangeIndex, (
+            self.field,
+            self.text,
+            self.values,
+            self.rows,
+            self.unordered,
+            self.ranks,
+        )
+
+    @classmethod
+    def build(
+        cls, records: List[Dict[str, Any]], field: str, text: bool = False
+    ) -> "RangeIndex":
+        """Sort the records' values of ``field``; ``text`` indexes strings"""
+        orderable = _is_text if text else _is_number
+        keyed, unordered = [], array("i")
+        for row, record in enumerate(records):
+            value = record.get(field)
+            if orderable(value):
+                keyed.append((value, row))
+            else:
+                unordered.append(row)
+        keyed.sort()
+
+        values = [value for value, _ in keyed]
+        if not text and all(_is_exact_float(value) for value in values):
+            values = array("d", values)
+        ranks = array("i", [len(keyed)]) * len(records)
+        first = 0
+        for position, (value, row) in enumerate(keyed):
+            if value != keyed[first][0]:
+                first = position
+            ranks[row] = first
+        return cls(
+            field,
+            text,
+            values,
+            array("i", (row for _, row in keyed)),
+            unordered,
+            ranks,
+        )
+
+    def span(
+        self, low: Optional[Any] = None, high: Optional[Any] = None
+    ) -> Tuple[int, int]:
+        """Positions in ``values`` of the values within ``low <= value <= high``"""
+        start = 0 if low is None else bisect_left(self.values, low)
+        stop = len(self.values) if high is None else bisect_right(self.values, high)
+        return start, max(start, stop)
+
+    def rows_between(
+        self, low: Optional[Any] = None, high: Optional[Any] = None
+    ) -> array:
+        """Rows of the ordered values within the bounds, in value order"""
+        start, stop = self.span(low, high)
+        return self.rows[start:stop]
+
+    def iter_rows(
+        self,
+        low: Optional[Any] = None,
+        high: Optional[Any] = None,
+        descending: bool = False,
+    ) -> Iterator[int]:
+        """Rows of the ordered values within the bounds, lazily in value order
+
+        Rows with equal values come in row order in both directions, so a
+        caller can stop after the first few rows without sorting anything.
+        """
+        start, stop = self.span(low, high)
+        rows = self.rows
+        if not descending:
+            yield from memoryview(rows)[start:stop]
+            return
+        values = self.values
+        position = stop
+        while position > start:
+            first = bisect_left(values, values[position - 1], start, position)
+            yield from memoryview(rows)[first:position]
+            position = first
+
+    def sort_key(self, descending: bool = False):
+        """Sort key listing rows as ``iter_rows`` and then ``unordered`` do"""
+        ranks, last = self.ranks, len(self.values)
+        if not descending:
+            return lambda row: (ranks[row], row)
+        return lambda row: (ranks[row] == last, -ranks[row], row)
+
+
+def _is_number(value: Any) -> bool:
+    """Check a value is an integer or a float other than NaN"""
+    return isinstance(value, int) or (isinstance(value, float) and value == value)
+
+
+def _is_exact_float(value: Any) -> bool:
+    """Check a number sorts and compares in float64 exactly as in Python"""
+    return not isinstance(value, int) or -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT
+
+
+def _is_text(value: Any) -> bool:
+    return isinstance(value, str)
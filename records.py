@@ -0,0 +1,189 @@
+"""
+Compact Records
+Immutable, slot-based record types for listings, sales, agents and clients
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterator, Tuple
+
+# Short strings in nested lists (features, specializations, areas) are shared
+INTERN_MAX_LENGTH = 40
+
+
+class Layout:
+    """Key order shared by every record with the same set of fields"""
+
+    __slots__ = ("keys", "positions")
+
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+        self.positions = {key: position for position, key in enumerate(keys)}
+
+    def __reduce__(self):
+        return Layout, (self.keys,)
+
+
+class Record(Mapping):
+    """Read-only mapping storing its values in a tuple
+
+    A record costs one small object plus one tuple, where the equivalent
+    dict carries its own hash table. Keys live in a ``Layout`` shared by all
+    records built with the same fields in the same order, so records keep
+    the key order, presence and values of the parsed JSON. Nested objects
+    become records and nested lists become tuples.
+
+    Records compare equal to the dicts they were built from and serialize
+    through ``jsonable``.
+    """
+
+    __slots__ = ("_layout", "_values")
+
+    # Fields whose string values repeat across records and are interned
+    INTERNED_FIELDS: FrozenSet[str] = frozenset()
+
+    def __init__(self, layout: Layout, values: Tuple[Any, ...]):
+        self._layout = layout
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[self._layout.positions[key]]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self._layout.positions.get(key)
+        return default if position is None else self._values[position]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._layout.positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layout.keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Record):
+            other = other.to_dict()
+        elif not isinstance(other, Mapping):
+            return NotImplemented
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return type(self), (self._layout, self._values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Deep copy as plain dicts and lists"""
+        return {
+            key: _plain(value) for key, value in zip(self._layout.keys, self._values)
+        }
+
+
+class Listing(Record):
+    """Active property listing"""
+
+    __slots__ = ()
+    INTERNED_FIELDS = frozenset(
+        {"area", "property_type", "style", "agent_id", "status", "city", "state"}
+    )
+
+
+class Sale(Record):
+    """Recent sale transaction"""
+
+    __slots__ = ()
+    INTERNED_FIELDS = frozenset({"area", "property_type", "agent_id", "sale_date"})
+
+
+class Agent(Record):
+    """Agent profile"""
+
+    __slots__ = ()
+    INTERNED_FIELDS = frozenset({"title", "brokerage"})
+
+
+class Client(Record):
+    """Client record"""
+
+    __slots__ = ()
+    INTERNED_FIELDS = frozenset({"type", "status", "agent_id"})
+
+
+class RecordBuilder:
+    """Converts parsed JSON objects into records of one type
+
+    Layouts and interned strings are shared across all records the builder
+    creates, so one builder should be used per dataset load.
+    """
+
+    def __init__(self, record_type: type = Record):
+        self.record_type = record_type
+        self.layouts: Dict[Tuple[str, ...], Layout] = {}
+        self.strings: Dict[str, str] = {}
+
+    def __call__(self, value: Any) -> Any:
+        """Record for a parsed object; other values are returned unchanged"""
+        if not isinstance(value, dict):
+            return value
+        return self._record(value, self.record_type)
+
+    def _record(self, value: Dict[str, Any], record_type: type) -> Record:
+        """Build a record, recursing into nested objects and lists"""
+        keys = tuple(value)
+        layout = self.layouts.get(keys)
+        if layout is None:
+            layout = self.layouts[keys] = Layout(tuple(sys.intern(k) for k in keys))
+
+        interned = record_type.INTERNED_FIELDS
+        values = []
+        for key, item in value.items():
+            if type(item) is str:
+                if key in interned:
+                    item = self._intern(item)
+            else:
+                item = self._nested(item)
+            values.append(item)
+        return record_type(layout, tuple(values))
+
+    def _nested(self, value: Any) -> Any:
+        """Compact a nested value"""
+        if isinstance(value, dict):
+            return self._record(value, Record)
+        if isinstance(value, list):
+            return tuple(
+                (
+                    self._intern(item)
+                    if type(item) is str and len(item) <= INTERN_MAX_LENGTH
+                    else self._nested(item)
+                )
+                for item in value
+            )
+        return value
+
+    def _intern(self, text: str) -> str:
+        """Shared copy of the string"""
+        return self.strings.setdefault(text, text)
+
+
+def jsonable(value: Any) -> Any:
+    """``json.dumps`` default hook serializing records as objects"""
+    if isinstance(value, Record):
+        return dict(zip(value._layout.keys, value._values))
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _plain(value: Any) -> Any:
+    """Plain-JSON copy of a record value"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    return value
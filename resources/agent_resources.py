@@ -2,56 +2,74 @@
 Agent resources for the Real Estate MCP Server
 """
 
-import json
+from typing import Any, Dict, Optional
 
 from mcp.server.fastmcp import FastMCP
 
-from utils import data_manager
+from pagination import Pager
+from projection import parse_fields, project_all
+from serializer import dumps
+from storage import DataAccess
+from utils import agent_dashboard_response, data_manager
 
 
 def register_agent_resources(mcp: FastMCP):
     """Register all agent-related resources with the MCP server"""
 
+    def agents_page(
+        snapshot: DataAccess, cursor: Optional[str], fields: Optional[str] = None
+    ) -> Dict[str, Any]:
+        pager = Pager(snapshot.dataset_versions["agents"], ("all-agents",))
+        try:
+            keep = parse_fields("agent", fields, snapshot)
+            page = pager.page(
+                snapshot.get_agents_page, snapshot.count_agents, cursor=cursor
+            )
+        except ValueError as error:
+            return {"error": str(error)}
+        base = (
+            f"realestate://all-agents/fields/{fields}"
+            if fields
+            else "realestate://all-agents"
+        )
+        return {
+            "total_count": page.total_count,
+            "agents": project_all(page.items, keep),
+            "next_cursor": page.next_cursor,
+            "next_page": (
+                f"{base}/page/{page.next_cursor}" if page.next_cursor else None
+            ),
+        }
+
     @mcp.resource("realestate://all-agents")
     def get_all_agents_resource() -> str:
-        """Complete listing of all real estate agents"""
-        agents = data_manager.get_all_agents()
-        return json.dumps(agents, indent=2)
+        """Real estate agents, first page; follow next_page for the rest"""
+        return data_manager.response_cache.get(
+            data_manager.snapshot(),
+            "resource:all-agents",
+            ("agents",),
+            lambda snapshot: agents_page(snapshot, None),
+        )
 
-    @mcp.resource("realestate://agent/{agent_id}/dashboard")
-    def get_agent_dashboard_resource(agent_id: str) -> str:
-        """Agent dashboard with performance metrics and listings"""
-        agent = data_manager.get_agent_by_id(agent_id)
-        if not agent:
-            return json.dumps(
-                {"error": f"Agent with ID {agent_id} not found"}, indent=2
-            )
+    @mcp.resource("realestate://all-agents/page/{cursor}")
+    def get_all_agents_page_resource(cursor: str) -> str:
+        """Real estate agents, the page a next_cursor points to"""
+        return dumps(agents_page(data_manager.snapshot(), cursor))
 
-        properties = data_manager.get_properties_by_agent(agent_id)
-        clients = data_manager.get_clients_by_agent(agent_id)
-        sales = data_manager.get_sales_by_agent(agent_id)
-
-        recent_sales = agent.get("recent_sales", [])
-        total_sales_volume = sum(sale.get("sale_price", 0) for sale in recent_sales)
-        avg_days_on_market = (
-            sum(sale.get("days_on_market", 0) for sale in recent_sales)
-            / len(recent_sales)
-            if recent_sales
-            else 0
-        )
+    @mcp.resource("realestate://all-agents/fields/{fields}")
+    def get_all_agents_fields_resource(fields: str) -> str:
+        """Real estate agents with only the given fields (summary, card, or field names)"""
+        return dumps(agents_page(data_manager.snapshot(), None, fields))
 
-        dashboard = {
-            "agent_info": agent,
-            "performance_metrics": {
-                "active_listings": len(properties),
-                "total_clients": len(clients),
-                "recent_sales_count": len(recent_sales),
-                "total_sales_volume": total_sales_volume,
-                "avg_days_on_market": avg_days_on_market,
-            },
-            "active_listings": properties,
-            "clients": clients,
-            "recent_sales": sales,
-        }
+    @mcp.resource("realestate://all-agents/fields/{fields}/page/{cursor}")
+    def get_all_agents_fields_page_resource(fields: str, cursor: str) -> str:
+        """Real estate agents with only the given fields, the page a next_cursor points to"""
+        return dumps(agents_page(data_manager.snapshot(), cursor, fields))
 
-        return json.dumps(dashboard, indent=2)
+    @mcp.resource("realestate://agent/{agent_id}/dashboard")
+    def get_agent_dashboard_resource(agent_id: str) -> str:
+        """Agent dashboard with performance metrics and listings"""
+        dashboard = data_manager.get_agent_dashboard(agent_id)
+        if not dashboard:
+            return dumps({"error": f"Agent with ID {agent_id} not found"})
+        return dumps(agent_dashboard_response(dashboard))
@@ -2,36 +2,39 @@
 Client resources for the Real Estate MCP Server
 """
 
-import json
+from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
 
+from projection import parse_fields, project_all
+from serializer import dumps
 from utils import data_manager
 
 
 def register_client_resources(mcp: FastMCP):
     """Register all client-related resources with the MCP server"""
 
-    @mcp.resource("realestate://client/{client_id}/matches")
-    def get_client_matches_resource(client_id: str) -> str:
-        """Properties matching a client's preferences"""
+    def client_matches(client_id: str, fields: Optional[str] = None) -> str:
         from utils import PropertyFilter
 
-        client = data_manager.get_client_by_id(client_id)
+        try:
+            keep = parse_fields("property", fields, data_manager)
+        except ValueError as error:
+            return dumps({"error": str(error)})
+
+        snapshot = data_manager.snapshot()
+        client = snapshot.get_client_by_id(client_id)
         if not client:
-            return json.dumps(
-                {"error": f"Client with ID {client_id} not found"}, indent=2
-            )
+            return dumps({"error": f"Client with ID {client_id} not found"})
 
         if client.get("type") != "Buyer":
-            return json.dumps(
+            return dumps(
                 {
                     "client_id": client_id,
                     "client_name": client.get("name"),
                     "message": f"Client is not a buyer (type: {client.get('type')})",
                     "matching_properties": [],
-                },
-                indent=2,
+                }
             )
 
         preferences = client.get("preferences", {})
@@ -48,15 +51,24 @@ def register_client_resources(mcp: FastMCP):
             ),
         )
 
-        matching_properties = data_manager.filter_properties(filters)
+        matching_properties = snapshot.filter_properties(filters)
 
-        return json.dumps(
+        return dumps(
             {
                 "client_id": client_id,
                 "client_name": client.get("name"),
                 "preferences": preferences,
                 "matching_properties_count": len(matching_properties),
-                "matching_properties": matching_properties,
-            },
-            indent=2,
+                "matching_properties": project_all(matching_properties, keep),
+            }
         )
+
+    @mcp.resource("realestate://client/{client_id}/matches")
+    def get_client_matches_resource(client_id: str) -> str:
+        """Properties matching a client's preferences"""
+        return client_matches(client_id)
+
+    @mcp.resource("realestate://client/{client_id}/matches/fields/{fields}")
+    def get_client_matches_fields_resource(client_id: str, fields: str) -> str:
+        """Properties matching a client's preferences, with only the given fields"""
+        return client_matches(client_id, fields)
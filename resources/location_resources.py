@@ -2,8 +2,6 @@
 Location resources for the Real Estate MCP Server
 """
 
-import json
-
 from mcp.server.fastmcp import FastMCP
 
 from utils import data_manager
@@ -15,10 +13,19 @@ def register_location_resources(mcp: FastMCP):
     @mcp.resource("realestate://all-areas")
     def get_all_areas_resource() -> str:
         """Information about all areas in the city"""
-        areas = data_manager.get_all_areas()
-        return json.dumps(areas, indent=2)
+        return data_manager.response_cache.get(
+            data_manager.snapshot(),
+            "resource:all-areas",
+            ("areas",),
+            lambda snapshot: snapshot.get_all_areas(),
+        )
 
     @mcp.resource("realestate://amenities")
     def get_amenities_resource() -> str:
         """All amenities data including schools, parks, shopping, healthcare"""
-        return json.dumps(data_manager.amenities, indent=2)
+        return data_manager.response_cache.get(
+            data_manager.snapshot(),
+            "resource:amenities",
+            ("amenities",),
+            lambda snapshot: snapshot.get_all_amenities(),
+        )
@@ -2,10 +2,9 @@
 Market resources for the Real Estate MCP Server
 """
 
-import json
-
 from mcp.server.fastmcp import FastMCP
 
+from serializer import dumps
 from utils import data_manager
 
 
@@ -15,23 +14,27 @@ def register_market_resources(mcp: FastMCP):
     @mcp.resource("realestate://market-overview")
     def get_market_overview_resource() -> str:
         """Current market overview and trends"""
-        overview = data_manager.get_market_overview()
-        return json.dumps(overview, indent=2)
+        return data_manager.response_cache.get(
+            data_manager.snapshot(),
+            "resource:market-overview",
+            ("market",),
+            lambda snapshot: snapshot.get_market_overview(),
+        )
 
     @mcp.resource("realestate://market/area/{area}")
     def get_area_market_resource(area: str) -> str:
         """Market analysis for a specific area"""
-        market_data = data_manager.get_area_market_data(area)
-        area_info = data_manager.get_area_info(area)
-        sales = data_manager.get_sales_by_area(area)
+        snapshot = data_manager.snapshot()
+        market_data = snapshot.get_area_market_data(area)
+        area_info = snapshot.get_area_info(area)
+        sales = snapshot.get_sales_by_area(area)
 
-        return json.dumps(
+        return dumps(
             {
                 "area": area,
                 "area_info": area_info,
                 "market_data": market_data,
                 "recent_sales_count": len(sales),
                 "recent_sales": sales,
-            },
-            indent=2,
+            }
         )
@@ -2,63 +2,93 @@
 Property resources for the Real Estate MCP Server
 """
 
-import json
+from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
 
-from utils import data_manager
+from pagination import Pager
+from projection import parse_fields, project_all
+from serializer import dumps
+from utils import data_manager, property_insights_response
 
 
 def register_property_resources(mcp: FastMCP):
     """Register all property-related resources with the MCP server"""
 
+    def properties_page(cursor: Optional[str], fields: Optional[str] = None) -> str:
+        snapshot = data_manager.snapshot()
+        pager = Pager(snapshot.dataset_versions["properties"], ("all-properties",))
+        try:
+            keep = parse_fields("property", fields, snapshot)
+            page = pager.page(
+                snapshot.get_properties_page, snapshot.count_properties, cursor=cursor
+            )
+        except ValueError as error:
+            return dumps({"error": str(error)})
+        base = (
+            f"realestate://all-properties/fields/{fields}"
+            if fields
+            else "realestate://all-properties"
+        )
+        return dumps(
+            {
+                "total_count": page.total_count,
+                "properties": project_all(page.items, keep),
+                "next_cursor": page.next_cursor,
+                "next_page": (
+                    f"{base}/page/{page.next_cursor}" if page.next_cursor else None
+                ),
+            }
+        )
+
     @mcp.resource("realestate://all-properties")
     def get_all_properties_resource() -> str:
-        """Complete listing of all active properties"""
-        properties = data_manager.get_all_properties()
-        return json.dumps(properties, indent=2)
+        """Active property listings, first page; follow next_page for the rest"""
+        return properties_page(None)
 
-    @mcp.resource("realestate://properties/area/{area}")
-    def get_area_properties_resource(area: str) -> str:
-        """Properties in a specific area"""
+    @mcp.resource("realestate://all-properties/page/{cursor}")
+    def get_all_properties_page_resource(cursor: str) -> str:
+        """Active property listings, the page a next_cursor points to"""
+        return properties_page(cursor)
+
+    @mcp.resource("realestate://all-properties/fields/{fields}")
+    def get_all_properties_fields_resource(fields: str) -> str:
+        """Active property listings with only the given fields (summary, card, or field names)"""
+        return properties_page(None, fields)
+
+    @mcp.resource("realestate://all-properties/fields/{fields}/page/{cursor}")
+    def get_all_properties_fields_page_resource(fields: str, cursor: str) -> str:
+        """Active property listings with only the given fields, the page a next_cursor points to"""
+        return properties_page(cursor, fields)
+
+    def area_properties(area: str, fields: Optional[str] = None) -> str:
+        try:
+            keep = parse_fields("property", fields, data_manager)
+        except ValueError as error:
+            return dumps({"error": str(error)})
         properties = data_manager.get_properties_by_area(area)
-        return json.dumps(
+        return dumps(
             {
                 "area": area,
                 "properties_count": len(properties),
-                "properties": properties,
-            },
-            indent=2,
+                "properties": project_all(properties, keep),
+            }
         )
 
+    @mcp.resource("realestate://properties/area/{area}")
+    def get_area_properties_resource(area: str) -> str:
+        """Properties in a specific area"""
+        return area_properties(area)
+
+    @mcp.resource("realestate://properties/area/{area}/fields/{fields}")
+    def get_area_properties_fields_resource(area: str, fields: str) -> str:
+        """Properties in a specific area with only the given fields"""
+        return area_properties(area, fields)
+
     @mcp.resource("realestate://property/{property_id}/insights")
     def get_property_insights_resource(property_id: str) -> str:
         """Comprehensive property insights including market context"""
-        prop = data_manager.get_property_by_id(property_id)
-        if not prop:
-            return json.dumps(
-                {"error": f"Property with ID {property_id} not found"}, indent=2
-            )
-
-        area = prop.get("area")
-        agent = data_manager.get_agent_by_id(prop.get("agent_id"))
-        area_info = data_manager.get_area_info(area)
-        area_market = data_manager.get_area_market_data(area)
-        comparable_sales = data_manager.get_sales_by_area(area)
-        amenities = data_manager.get_area_amenities(area)
-
-        insights = {
-            "property": prop,
-            "listing_agent": agent,
-            "area_context": {
-                "area_info": area_info,
-                "market_data": area_market,
-                "amenities": amenities,
-            },
-            "comparable_sales": {
-                "count": len(comparable_sales),
-                "sales": comparable_sales,
-            },
-        }
-
-        return json.dumps(insights, indent=2)
+        insights = data_manager.get_property_insights(property_id)
+        if not insights:
+            return dumps({"error": f"Property with ID {property_id} not found"})
+        return dumps(property_insights_response(insights))
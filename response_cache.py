@@ -0,0 +1,105 @@
+"""
+Response Cache
+Encoded responses of handlers that serve whole datasets, kept per dataset version
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Tuple
+
+from serializer import dumps, pretty_output
+
+if TYPE_CHECKING:  # pragma: no cover
+    from storage import DataAccess
+
+
+class ResponseCache:
+    """Encoded JSON of responses that only change when their datasets do
+
+    Handlers such as the all-areas or amenities resources serve the same
+    text until a refresh reloads the datasets they read. Each response is
+    registered under a name with the datasets it depends on and a ``build``
+    function producing its value from a snapshot; the encoded text is kept
+    per output format and tagged with the versions of those datasets, so a
+    repeated read is a dictionary lookup with no encoding work.
+
+    ``warm`` re-encodes every response served so far whose datasets changed,
+    and the managers call it after each refresh, so readers find the new
+    text ready. Responses are built outside the lock; an entry never
+    replaces one built from newer data.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[Tuple[int, ...], str]] = {}
+        self._builders: Dict[Hashable, Tuple[Tuple[str, ...], Callable]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+
+    def get(
+        self,
+        snapshot: "DataAccess",
+        name: str,
+        datasets: Tuple[str, ...],
+        build: Callable[["DataAccess"], Any],
+        pretty: Optional[bool] = None,
+    ) -> str:
+        """Encoded ``build(snapshot)``, reusing the text while ``datasets``
+        are unchanged"""
+        key = (name, pretty_output(pretty))
+        version = self._version(snapshot, datasets)
+        with self._lock:
+            self._builders[key] = (datasets, build)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return self._build(key, build, snapshot, version)
+
+    def warm(self, snapshot: "DataAccess"):
+        """Encode every response served so far that is stale in ``snapshot``"""
+        stale = []
+        with self._lock:
+            for key, (datasets, build) in self._builders.items():
+                version = self._version(snapshot, datasets)
+                entry = self._entries.get(key)
+                if entry is None or entry[0] != version:
+                    stale.append((key, build, version))
+        for key, build, version in stale:
+            self._build(key, build, snapshot, version)
+
+    def clear(self):
+        """Drop every encoded response; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._builders.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Response and byte counts, and hit, miss and build counters"""
+        with self._lock:
+            return {
+                "responses": len(self._entries),
+                "bytes": sum(len(text) for _, text in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "builds": self.builds,
+            }
+
+    @staticmethod
+    def _version(snapshot: "DataAccess", datasets: Tuple[str, ...]) -> Tuple:
+        return tuple(snapshot.dataset_versions[name] for name in datasets)
+
+    def _build(
+        self, key: Hashable, build: Callable, snapshot: "DataAccess", version: Tuple
+    ) -> str:
+        """Encode a response and keep it unless a newer one was stored"""
+        text = dumps(build(snapshot), key[1])
+        with self._lock:
+            self.builds += 1
+            current = self._entries.get(key)
+            # A build still running on an older snapshot must not replace
+            # the text of a newer one
+            if current is None or current[0] < version:
+                self._entries[key] = (version, text)
+        return text
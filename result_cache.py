@@ -0,0 +1,123 @@
+"""
+Query Result Cache
+Size-limited LRU cache of query results, tagged with the data versions they came from
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# Default limits: cached queries, and result rows held across all of them
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_ROWS = 1_000_000
+
+
+class ResultCache:
+    """Least-recently-used cache of query results keyed by normalized queries
+
+    Each entry records the version of the data it was computed from, such as
+    the versions of the datasets the query reads. A lookup with any other
+    version is a miss and drops the entry, so results computed before a
+    refresh changed their data are never served after it. Entries are
+    evicted least recently used first once either ``max_entries`` queries
+    or ``max_rows`` result rows are cached; a single result larger than
+    ``max_rows`` is returned but not kept. A cache with ``max_entries`` of 0
+    keeps nothing.
+
+    Results are lists, or dicts such as dashboards and reports; the rows of
+    a dict are those of the lists it holds, at any depth. Results are computed outside the
+    lock, so concurrent misses on the same query may each compute it.
+    Callers receive a shallow copy on every call and may modify it; the
+    records and nested values inside are shared.
+    """
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, max_rows: int = DEFAULT_MAX_ROWS
+    ):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Any, int]]" = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale = 0
+
+    def get_or_compute(
+        self, key: Hashable, version: Any, compute: Callable[[], Any]
+    ) -> Any:
+        """Cached result of ``key`` at ``version``, computing it on a miss
+
+        Versions of one key must increase as the data changes; an int or a
+        tuple of per-dataset versions both work.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == version:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.copy(entry[1])
+                self._remove(key)
+                self.stale += 1
+            self.misses += 1
+
+        result = compute()
+        rows = _rows(result)
+        if self.max_entries > 0 and rows <= self.max_rows:
+            with self._lock:
+                current = self._entries.get(key)
+                # A query still running on an older snapshot must not
+                # replace the result of a newer one
+                if current is None or current[0] < version:
+                    if current is not None:
+                        self._remove(key)
+                    self._entries[key] = (version, result, rows)
+                    self._rows += rows
+                    self._evict()
+        return copy.copy(result)
+
+    def clear(self):
+        """Drop every entry; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry and row counts, limits, and hit, miss and eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "rows": self._rows,
+                "max_entries": self.max_entries,
+                "max_rows": self.max_rows,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "stale": self.stale,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remove(self, key: Hashable):
+        self._rows -= self._entries.pop(key)[2]
+
+    def _evict(self):
+        """Drop least recently used entries until both limits hold"""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._rows > self.max_rows
+        ):
+            _, (_, _, rows) = self._entries.popitem(last=False)
+            self._rows -= rows
+            self.evictions += 1
+
+
+def _rows(result: Any) -> int:
+    """Rows a result holds: a list's length, or the rows of a dict's values"""
+    if isinstance(result, dict):
+        return sum(
+            _rows(value) for value in result.values() if isinstance(value, (dict, list))
+        )
+    return len(result)
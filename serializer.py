@@ -0,0 +1,68 @@
+"""
+Response Serializer
+JSON encoding shared by every tool and resource, compact unless pretty is asked for
+"""
+
+import json
+import os
+from typing import Any, Optional
+
+from records import jsonable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Environment variable setting the server's default format: compact or pretty
+FORMAT_ENV = "REAL_ESTATE_JSON_FORMAT"
+FORMATS = ("compact", "pretty")
+
+
+def _pretty_format(name: str) -> bool:
+    """Whether a format name selects indented output"""
+    if name not in FORMATS:
+        raise ValueError(
+            f"Unknown JSON format {name!r}; expected one of {', '.join(FORMATS)}"
+        )
+    return name == "pretty"
+
+
+_pretty = _pretty_format(os.environ.get(FORMAT_ENV, "compact"))
+
+
+def configure(format: str):
+    """Set the server's default format, ``compact`` or ``pretty``"""
+    global _pretty
+    _pretty = _pretty_format(format)
+
+
+def pretty_output(pretty: Optional[bool] = None) -> bool:
+    """Whether ``dumps`` indents with this ``pretty`` argument"""
+    return _pretty if pretty is None else pretty
+
+
+def dumps(value: Any, pretty: Optional[bool] = None) -> str:
+    """Encode a response as JSON text, records included
+
+    Compact output has no indentation or spaces after separators; pretty
+    output is indented by two spaces. ``pretty`` overrides the server's
+    default for one call. Non-ASCII text is kept as is rather than escaped.
+
+    orjson encodes when it is installed. Values it rejects, such as integers
+    beyond 64 bits, are encoded with the json module instead.
+    """
+    pretty = pretty_output(pretty)
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, default=jsonable, option=option).decode()
+        except orjson.JSONEncodeError:
+            pass
+    if pretty:
+        return json.dumps(value, indent=2, default=jsonable, ensure_ascii=False)
+    return json.dumps(
+        value, separators=(",", ":"), default=jsonable, ensure_ascii=False
+    )
@@ -0,0 +1,768 @@
+"""
+SQLite Storage Backend
+Serves the RealEstateDataManager query surface from a SQLite database
+
+Build a database from the JSON data directory with:
+
+    python sqlite_backend.py data real_estate.db
+
+and point the server at it with ``REAL_ESTATE_DATABASE=real_estate.db``.
+"""
+
+import argparse
+import json
+import math
+from collections import Counter
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import json_stream
+from response_cache import ResponseCache
+from result_cache import ResultCache
+from storage import DataBackend
+from text_index import bm25_idf, bm25_term, query_tokens, tokenize, top_scores
+from utils import (
+    DATASET_FILES,
+    RECORD_ARRAYS,
+    DataSnapshot,
+    PropertyFilter,
+)
+
+SCHEMA = """
+CREATE TABLE documents (name TEXT PRIMARY KEY, body TEXT NOT NULL);
+CREATE TABLE record_fields (
+    dataset TEXT NOT NULL, position INTEGER NOT NULL, field TEXT NOT NULL,
+    PRIMARY KEY (dataset, position)
+);
+
+CREATE TABLE properties (
+    row INTEGER PRIMARY KEY,
+    id, area, area_key, agent_id, property_type,
+    price REAL, bedrooms REAL, bathrooms REAL, square_feet REAL,
+    list_date TEXT, features TEXT,
+    doc TEXT NOT NULL,
+    text_length INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX properties_id ON properties (id);
+CREATE INDEX properties_area ON properties (area_key);
+CREATE INDEX properties_agent ON properties (agent_id);
+CREATE INDEX properties_price ON properties (price);
+CREATE INDEX properties_bedrooms ON properties (bedrooms);
+CREATE INDEX properties_square_feet ON properties (square_feet);
+CREATE INDEX properties_list_date ON properties (list_date);
+CREATE VIRTUAL TABLE properties_fts USING fts5 (text, tokenize = 'trigram');
+CREATE TABLE properties_postings (term TEXT NOT NULL, row INTEGER NOT NULL, frequency INTEGER NOT NULL);
+CREATE INDEX properties_postings_term ON properties_postings (term, row);
+CREATE TABLE properties_terms (term TEXT PRIMARY KEY, documents INTEGER NOT NULL);
+
+CREATE TABLE agents (
+    row INTEGER PRIMARY KEY, id, doc TEXT NOT NULL,
+    text_length INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX agents_id ON agents (id);
+CREATE VIRTUAL TABLE agents_fts USING fts5 (text, tokenize = 'trigram');
+CREATE TABLE agents_postings (term TEXT NOT NULL, row INTEGER NOT NULL, frequency INTEGER NOT NULL);
+CREATE INDEX agents_postings_term ON agents_postings (term, row);
+CREATE TABLE agents_terms (term TEXT PRIMARY KEY, documents INTEGER NOT NULL);
+
+CREATE TABLE clients (row INTEGER PRIMARY KEY, id, agent_id, doc TEXT NOT NULL);
+CREATE INDEX clients_id ON clients (id);
+CREATE INDEX clients_agent ON clients (agent_id);
+
+CREATE TABLE sales (row INTEGER PRIMARY KEY, id, area_key, agent_id, doc TEXT NOT NULL);
+CREATE INDEX sales_area ON sales (area_key);
+CREATE INDEX sales_agent ON sales (agent_id);
+"""
+
+# Table holding each record dataset's array
+RECORD_TABLES = {
+    "properties": "properties",
+    "agents": "agents",
+    "clients": "clients",
+    "transactions": "sales",
+}
+
+# PropertyFilter range predicates as (filter attribute, column, operator)
+RANGE_CONDITIONS = (
+    ("min_price", "price", ">="),
+    ("max_price", "price", "<="),
+    ("min_bedrooms", "bedrooms", ">="),
+    ("max_bedrooms", "bedrooms", "<="),
+    ("min_bathrooms", "bathrooms", ">="),
+    ("max_bathrooms", "bathrooms", "<="),
+    ("min_sqft", "square_feet", ">="),
+    ("max_sqft", "square_feet", "<="),
+)
+
+# PropertyFilter date predicates as (filter attribute, column, operator)
+DATE_CONDITIONS = (
+    ("min_list_date", "list_date", ">="),
+    ("max_list_date", "list_date", "<="),
+)
+
+# Shortest query FTS5's trigram tokenizer can look up
+_MIN_TRIGRAM_QUERY = 3
+
+# Largest integer a REAL column represents exactly
+_MAX_EXACT_INT = 2**53
+
+# Rows inserted per batch during import
+_BATCH_SIZE = 5000
+
+# Suffix of the temporary database an import builds before renaming it
+_IMPORT_SUFFIX = ".importing"
+
+# Separates feature strings so a feature needle cannot match across two
+_FEATURE_SEPARATOR = "\x1f"
+
+
+class SQLiteSnapshot(DataSnapshot):
+    """Query view over a SQLite database
+
+    Listings, agents, clients and sales stay in the database and are decoded
+    per query, so datasets larger than memory can be served. The market,
+    amenities and area documents, and the non-record keys of the other
+    datasets (price ranges, lead sources, sales summaries), are small and
+    are read into memory on first access. Composite queries (dashboards,
+    insights, area reports) are inherited unchanged from ``DataSnapshot``.
+
+    Each query sees the database as of that query; unlike the in-memory
+    snapshot, a composite query can observe a concurrent import. Cached
+    filter and search results and composite views are kept until the
+    next ``refresh_data``.
+    """
+
+    def __init__(
+        self,
+        connection: Callable[[], sqlite3.Connection],
+        version: int = 0,
+        result_cache: Optional[ResultCache] = None,
+        dataset_versions: Optional[Dict[str, int]] = None,
+    ):
+        self._connection = connection
+        super().__init__(
+            {name: self._document_loader(name) for name in DATASET_FILES},
+            version=version,
+            result_cache=result_cache,
+            dataset_versions=dataset_versions,
+        )
+
+    def _document_loader(self, name: str) -> Callable:
+        """Loader reading a dataset's document on first access"""
+
+        def load() -> Tuple[Dict[str, Any], None, Dict[str, Any]]:
+            row = (
+                self._connection()
+                .execute("SELECT body FROM documents WHERE name = ?", (name,))
+                .fetchone()
+            )
+            return (json.loads(row[0]) if row else {}), None, {}
+
+        return load
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        """Decoded documents of the rows a query returns"""
+        rows = self._connection().execute(sql, params)
+        return [json.loads(doc) for (doc,) in rows]
+
+    def _first(self, sql: str, params: Tuple = ()) -> Optional[Dict[str, Any]]:
+        """Decoded document of the first row a query returns, if any"""
+        found = self._query(sql + " ORDER BY row LIMIT 1", params)
+        return found[0] if found else None
+
+    def _page(self, table: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Decoded documents of one page of a record table, in record order"""
+        return self._query(
+            f"SELECT doc FROM {table} ORDER BY row LIMIT ? OFFSET ?", (limit, offset)
+        )
+
+    def _count(self, table: str) -> int:
+        """Number of rows in a record table"""
+        return self._connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    # Record Fields
+    def get_record_fields(self, dataset: str) -> Tuple[str, ...]:
+        """Get the names of the fields held by a dataset's records"""
+        rows = self._connection().execute(
+            "SELECT field FROM record_fields WHERE dataset = ? ORDER BY position",
+            (dataset,),
+        )
+        return tuple(field for (field,) in rows)
+
+    # Property Operations
+    def get_all_properties(self) -> List[Dict[str, Any]]:
+        """Get all active property listings"""
+        return self._query("SELECT doc FROM properties ORDER BY row")
+
+    def get_properties_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` property listings from position ``offset``"""
+        return self._page("properties", offset, limit)
+
+    def count_properties(self) -> int:
+        """Get the number of active property listings"""
+        return self._count("properties")
+
+    def get_property_by_id(self, property_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific property by ID"""
+        return self._first("SELECT doc FROM properties WHERE id = ?", (property_id,))
+
+    def explain_filter(
+        self, filters: PropertyFilter
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Filter properties and describe SQLite's query plan, with row counts"""
+        sql, params = self._filter_query(filters)
+        steps = self._connection().execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        query_plan = [step[-1] for step in steps]
+        results, candidates = self._run_filter(filters)
+        return results, {
+            "access_path": "sqlite",
+            "query_plan": query_plan,
+            "actual_rows": {"candidates": candidates, "result": len(results)},
+        }
+
+    def _run_filter(self, filters: PropertyFilter) -> Tuple[List[Dict[str, Any]], int]:
+        """The filter's page of matching listings and the candidates read
+
+        Indexed SQL conditions narrow the listings, and each candidate is then
+        checked with ``_matches_filter`` so results match the in-memory backend
+        exactly. Candidates are read in result order, and reading stops once
+        the page is full.
+        """
+        sql, params = self._filter_query(filters)
+        wanted = None if filters.limit is None else filters.offset + filters.limit
+        matches: List[Dict[str, Any]] = []
+        candidates = 0
+        if wanted != 0:
+            rows = self._connection().execute(sql, params)
+            try:
+                for (doc,) in rows:
+                    candidates += 1
+                    prop = json.loads(doc)
+                    if self._matches_filter(prop, filters):
+                        matches.append(prop)
+                        if len(matches) == wanted:
+                            break
+            finally:
+                rows.close()
+        return matches[filters.offset :], candidates
+
+    @staticmethod
+    def _filter_query(filters: PropertyFilter) -> Tuple[str, Tuple]:
+        """SQL selecting a superset of the listings matching the filter"""
+        conditions, params = [], []
+        for attribute, column, operator in RANGE_CONDITIONS:
+            bound = getattr(filters, attribute)
+            if bound:
+                # NULL columns (missing or non-numeric values) are left to
+                # _matches_filter, which applies the in-memory defaults
+                conditions.append(f"({column} {operator} ? OR {column} IS NULL)")
+                params.append(bound)
+        for attribute, column, operator in DATE_CONDITIONS:
+            bound = getattr(filters, attribute)
+            if bound:
+                # Listings without a date string never match a date bound
+                conditions.append(f"{column} {operator} ?")
+                params.append(bound)
+        for attribute, column in (
+            ("areas", "area"),
+            ("property_types", "property_type"),
+        ):
+            allowed = getattr(filters, attribute)
+            if allowed:
+                conditions.append(f"{column} IN ({', '.join('?' * len(allowed))})")
+                params.extend(allowed)
+        for feature in filters.features or []:
+            conditions.append("instr(features, ?) > 0")
+            params.append(feature.lower())
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = "row"
+        if filters.sort_by:
+            # Equal values in file order and missing values last, as in the
+            # in-memory range indexes
+            direction = "DESC" if filters.descending else "ASC"
+            order = f"{filters.sort_by} {direction} NULLS LAST, row"
+        return f"SELECT doc FROM properties {where} ORDER BY {order}", tuple(params)
+
+    def _search_properties(self, query: str) -> List[Dict[str, Any]]:
+        return self._text_matches("properties", query)
+
+    def _rank_properties(
+        self, query: str, limit: Optional[int], min_score: Optional[float]
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Properties matching the query with BM25 scores, best first"""
+        return self._rank("properties", query, limit, min_score)
+
+    def _count_ranked_properties(self, query: str, min_score: float) -> int:
+        return self._count_scores("properties", query, min_score)
+
+    def get_properties_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
+        """Get all properties listed by a specific agent"""
+        return self._query(
+            "SELECT doc FROM properties WHERE agent_id = ? ORDER BY row", (agent_id,)
+        )
+
+    def get_properties_by_area(self, area: str) -> List[Dict[str, Any]]:
+        """Get all properties in a specific area"""
+        return self._query(
+            "SELECT doc FROM properties WHERE area_key = ? ORDER BY row",
+            (self._area_key({"area": area}),),
+        )
+
+    # Agent Operations
+    def get_all_agents(self) -> List[Dict[str, Any]]:
+        """Get all agents"""
+        return self._query("SELECT doc FROM agents ORDER BY row")
+
+    def get_agents_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` agents from position ``offset``"""
+        return self._page("agents", offset, limit)
+
+    def count_agents(self) -> int:
+        """Get the number of agents"""
+        return self._count("agents")
+
+    def get_agent_by_id(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific agent by ID"""
+        return self._first("SELECT doc FROM agents WHERE id = ?", (agent_id,))
+
+    def _search_agents(self, query: str) -> List[Dict[str, Any]]:
+        return self._text_matches("agents", query)
+
+    def _rank_agents(
+        self, query: str, limit: Optional[int], min_score: Optional[float]
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Agents matching the query with BM25 scores, best first"""
+        return self._rank("agents", query, limit, min_score)
+
+    def _count_ranked_agents(self, query: str, min_score: float) -> int:
+        return self._count_scores("agents", query, min_score)
+
+    # Client Operations
+    def get_all_clients(self) -> List[Dict[str, Any]]:
+        """Get all clients"""
+        return self._query("SELECT doc FROM clients ORDER BY row")
+
+    def get_clients_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` clients from position ``offset``"""
+        return self._page("clients", offset, limit)
+
+    def count_clients(self) -> int:
+        """Get the number of clients"""
+        return self._count("clients")
+
+    def get_client_by_id(self, client_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific client by ID"""
+        return self._first("SELECT doc FROM clients WHERE id = ?", (client_id,))
+
+    def get_clients_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
+        """Get all clients for a specific agent"""
+        return self._query(
+            "SELECT doc FROM clients WHERE agent_id = ? ORDER BY row", (agent_id,)
+        )
+
+    # Transaction Operations
+    def get_recent_sales(self) -> List[Dict[str, Any]]:
+        """Get all recent sales"""
+        return self._query("SELECT doc FROM sales ORDER BY row")
+
+    def get_sales_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` recent sales from position ``offset``"""
+        return self._page("sales", offset, limit)
+
+    def count_sales(self) -> int:
+        """Get the number of recent sales"""
+        return self._count("sales")
+
+    def get_sales_by_area(self, area: str) -> List[Dict[str, Any]]:
+        """Get recent sales in a specific area"""
+        return self._query(
+            "SELECT doc FROM sales WHERE area_key = ? ORDER BY row", (area.lower(),)
+        )
+
+    def get_sales_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
+        """Get recent sales by a specific agent"""
+        return self._query(
+            "SELECT doc FROM sales WHERE agent_id = ? ORDER BY row", (agent_id,)
+        )
+
+    # Text search
+    def _text_matches(self, table: str, query: str, column: str = "doc") -> List[Any]:
+        """``column`` of the records whose searchable text contains the query,
+        in record order
+
+        Queries of three or more characters go through the trigram FTS5
+        index; shorter ones scan the indexed text. Either way ``instr``
+        keeps the exact, case-insensitive substring semantics of the
+        in-memory search.
+        """
+        query_lower = query.lower()
+        if len(query_lower) >= _MIN_TRIGRAM_QUERY:
+            sql = (
+                f"SELECT t.{column} FROM {table}_fts "
+                f"JOIN {table} t ON t.row = {table}_fts.rowid "
+                f"WHERE {table}_fts MATCH ? AND instr({table}_fts.text, ?) > 0 "
+                "ORDER BY t.row"
+            )
+            phrase = '"' + query_lower.replace('"', '""') + '"'
+            params = (phrase, query_lower)
+        else:
+            sql = (
+                f"SELECT t.{column} FROM {table}_fts "
+                f"JOIN {table} t ON t.row = {table}_fts.rowid "
+                f"WHERE instr({table}_fts.text, ?) > 0 ORDER BY t.row"
+            )
+            params = (query_lower,)
+        rows = self._connection().execute(sql, params)
+        if column == "doc":
+            return [json.loads(doc) for (doc,) in rows]
+        return [value for (value,) in rows]
+
+    def _scores(self, table: str, query: str) -> Dict[int, float]:
+        """BM25 score of every text match, by row in record order
+
+        Scores are computed from the word postings stored at import exactly
+        as ``TextIndex`` computes them in memory, so both backends give the
+        same scores and ``min_score`` selects the same records.
+        """
+        scores = dict.fromkeys(self._text_matches(table, query, "row"), 0.0)
+        if not scores:
+            return scores
+        connection = self._connection()
+        documents, total_length = connection.execute(
+            f"SELECT COUNT(*), TOTAL(text_length) FROM {table}"
+        ).fetchone()
+        average_length = total_length / documents or 1.0
+        query_lower = query.lower()
+        for token, open_left, open_right in query_tokens(query_lower):
+            for term, matching in self._expand(table, token, open_left, open_right):
+                idf = bm25_idf(documents, matching)
+                postings = connection.execute(
+                    f"SELECT p.row, p.frequency, t.text_length "
+                    f"FROM {table}_postings p JOIN {table} t ON t.row = p.row "
+                    "WHERE p.term = ?",
+                    (term,),
+                )
+                for row, frequency, length in postings:
+                    if row in scores:
+                        scores[row] += bm25_term(idf, frequency, length, average_length)
+        return scores
+
+    def _expand(
+        self, table: str, token: str, open_left: bool, open_right: bool
+    ) -> List[Tuple[str, int]]:
+        """Terms a query token can match, with the number of records holding
+        each, in the order ``TextIndex`` adds them up"""
+        if not open_left and not open_right:
+            pattern = token
+        else:
+            # Word tokens hold no GLOB wildcards; a prefix pattern uses the index
+            pattern = ("*" if open_left else "") + token + ("*" if open_right else "")
+        terms = self._connection().execute(
+            f"SELECT term, documents FROM {table}_terms WHERE term GLOB ? "
+            "ORDER BY term",
+            (pattern,),
+        )
+        if open_left and not open_right:
+            return sorted(terms, key=lambda term: term[0][::-1])
+        return list(terms)
+
+    def _documents(self, table: str, rows: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Decoded documents of the given rows, by row"""
+        documents = {}
+        for start in range(0, len(rows), _BATCH_SIZE):
+            chunk = rows[start : start + _BATCH_SIZE]
+            found = self._connection().execute(
+                f"SELECT row, doc FROM {table} "
+                f"WHERE row IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            documents.update((row, json.loads(doc)) for row, doc in found)
+        return documents
+
+    def _count_scores(self, table: str, query: str, min_score: float) -> int:
+        """Number of text matches scoring at least ``min_score``"""
+        return sum(score >= min_score for score in self._scores(table, query).values())
+
+    def _rank(
+        self,
+        table: str,
+        query: str,
+        limit: Optional[int],
+        min_score: Optional[float],
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Text matches ordered by score, best first; ties keep record order
+
+        Only the rows that make the top ``limit`` are decoded.
+        """
+        if limit is not None and limit <= 0:
+            return []
+        ranked = top_scores(self._scores(table, query), limit, min_score)
+        documents = self._documents(table, [row for row, _ in ranked])
+        return [(documents[row], score) for row, score in ranked]
+
+
+class SQLiteDataManager(DataBackend):
+    """Data manager backed by a database built with ``import_json``
+
+    Offers the same query methods and dataset attributes as
+    ``RealEstateDataManager``, so tools and resources work unchanged. Each
+    thread gets its own read-only connection; the database uses WAL mode, so
+    readers are not blocked while another process writes.
+    """
+
+    def __init__(self, database: str, result_cache: Optional[ResultCache] = None):
+        self.database = database
+        # Directory watched by DataWatcher and shown at startup
+        self.data_dir = os.path.dirname(os.path.abspath(database))
+        # Reading the database changes its WAL and shared-memory files, and
+        # an import writes a temporary database; only a finished import,
+        # renamed over the database, is a change to reload
+        temp_path = database + _IMPORT_SUFFIX
+        self.watch_ignored = tuple(
+            path + suffix
+            for path in (database, temp_path)
+            for suffix in ("", "-wal", "-shm", "-journal")
+            if path + suffix != database
+        )
+        self.watch_replaced = (database,)
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+        self.response_cache = ResponseCache()
+        self._local = threading.local()
+        self._snapshot = SQLiteSnapshot(self.connection, result_cache=self.result_cache)
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection to the database"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if not os.path.exists(self.database):
+                raise FileNotFoundError(self.database)
+            connection = sqlite3.connect(self.database)
+            connection.execute("PRAGMA query_only = ON")
+            self._local.connection = connection
+        return connection
+
+    def refresh_data(self) -> Dict[str, Any]:
+        """Drop cached documents and query results so they are re-read from
+        the database
+
+        Record queries always read the database, so there is nothing else to
+        reload. The database is not compared with what was read before, so
+        every refresh bumps the data version and the version of every dataset,
+        and every cached encoded response is rebuilt.
+        """
+        previous = self._snapshot
+        self._snapshot = SQLiteSnapshot(
+            self.connection,
+            previous.version + 1,
+            self.result_cache,
+            {name: version + 1 for name, version in previous.dataset_versions.items()},
+        )
+        self.response_cache.warm(self._snapshot)
+        return {"reloaded": {}, "unchanged": [], "not_loaded": list(DATASET_FILES)}
+
+
+def _number(value: Any) -> Optional[float]:
+    """Value for a numeric column; NULL for anything that is not a number
+
+    Integers a REAL column cannot hold exactly are NULL too, so they are
+    compared by ``_matches_filter``; unlike in the in-memory range indexes,
+    they sort with the missing values.
+    """
+    if isinstance(value, int):
+        return value if -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT else None
+    if isinstance(value, float) and not math.isnan(value):
+        return value
+    return None
+
+
+def _text(value: Any) -> Optional[str]:
+    """Value for a text column; NULL for anything that is not a string"""
+    return value if isinstance(value, str) else None
+
+
+def _property_row(prop: Dict[str, Any]) -> Tuple:
+    features = prop.get("features") or []
+    return (
+        prop.get("id"),
+        prop.get("area"),
+        DataSnapshot._area_key(prop),
+        prop.get("agent_id"),
+        prop.get("property_type"),
+        _number(prop.get("price")),
+        _number(prop.get("bedrooms")),
+        _number(prop.get("bathrooms")),
+        _number(prop.get("square_feet")),
+        _text(prop.get("list_date")),
+        _FEATURE_SEPARATOR.join(f.lower() for f in features if isinstance(f, str)),
+        json.dumps(prop),
+    )
+
+
+# Per-dataset import: (INSERT statement, row builder, FTS search text builder)
+_IMPORTERS: Dict[str, Tuple[str, Callable, Optional[Callable]]] = {
+    "properties": (
+        "INSERT INTO properties (row, id, area, area_key, agent_id, property_type, "
+        "price, bedrooms, bathrooms, square_feet, list_date, features, doc) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        _property_row,
+        DataSnapshot._property_search_text,
+    ),
+    "agents": (
+        "INSERT INTO agents (row, id, doc) VALUES (?, ?, ?)",
+        lambda agent: (agent.get("id"), json.dumps(agent)),
+        DataSnapshot._agent_search_text,
+    ),
+    "clients": (
+        "INSERT INTO clients (row, id, agent_id, doc) VALUES (?, ?, ?, ?)",
+        lambda client: (
+            client.get("id"),
+            client.get("agent_id"),
+            json.dumps(client),
+        ),
+        None,
+    ),
+    "transactions": (
+        "INSERT INTO sales (row, id, area_key, agent_id, doc) VALUES (?, ?, ?, ?, ?)",
+        lambda sale: (
+            sale.get("id"),
+            DataSnapshot._area_key(sale),
+            sale.get("agent_id"),
+            json.dumps(sale),
+        ),
+        None,
+    ),
+}
+
+
+def import_json(data_dir: str, database: str) -> Dict[str, Any]:
+    """Build a SQLite database from a JSON data directory
+
+    Record arrays are streamed into their tables one element at a time, so
+    the import does not need the data to fit in memory. The database is
+    built next to ``database`` and renamed into place; do not import over a
+    database that a running server has open. Returns the number of records
+    imported per dataset and the seconds taken.
+    """
+    start = time.perf_counter()
+    temp_path = database + _IMPORT_SUFFIX
+    for path in (temp_path, f"{temp_path}-wal", f"{temp_path}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+
+    connection = sqlite3.connect(temp_path)
+    counts = {}
+    try:
+        connection.executescript(SCHEMA)
+        for name, relative_path in DATASET_FILES.items():
+            counts[name] = _import_dataset(
+                connection, name, os.path.join(data_dir, relative_path)
+            )
+        connection.commit()
+        connection.execute("PRAGMA journal_mode = WAL")
+    finally:
+        connection.close()
+
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(database + suffix):
+            os.remove(database + suffix)
+    os.replace(temp_path, database)
+    return {"records": counts, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def _import_dataset(connection: sqlite3.Connection, name: str, filepath: str) -> int:
+    """Import one dataset file; returns the number of records imported"""
+    array_key = RECORD_ARRAYS[name][0] if name in RECORD_ARRAYS else None
+    importer = _IMPORTERS.get(name)
+    batch: List[Dict[str, Any]] = []
+    fields: Dict[str, None] = {}
+    count = 0
+
+    def flush():
+        insert, row_func, text_func = importer
+        first = count - len(batch)
+        connection.executemany(
+            insert,
+            (
+                (first + offset,) + row_func(record)
+                for offset, record in enumerate(batch)
+            ),
+        )
+        if text_func is not None:
+            table = RECORD_TABLES[name]
+            texts = [text_func(record) for record in batch]
+            connection.executemany(
+                f"INSERT INTO {table}_fts (rowid, text) VALUES (?, ?)",
+                ((first + offset, text) for offset, text in enumerate(texts)),
+            )
+            # Word postings and text lengths for BM25 scoring
+            tokens = [tokenize(text) for text in texts]
+            connection.executemany(
+                f"UPDATE {table} SET text_length = ? WHERE row = ?",
+                ((len(words), first + offset) for offset, words in enumerate(tokens)),
+            )
+            connection.executemany(
+                f"INSERT INTO {table}_postings (term, row, frequency) VALUES (?, ?, ?)",
+                (
+                    (term, first + offset, frequency)
+                    for offset, words in enumerate(tokens)
+                    for term, frequency in Counter(words).items()
+                ),
+            )
+        batch.clear()
+
+    def collect(record):
+        nonlocal count
+        if isinstance(record, dict):
+            batch.append(record)
+            fields.update(dict.fromkeys(record))
+            count += 1
+            if len(batch) >= _BATCH_SIZE:
+                flush()
+
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            document = json_stream.load(
+                f, (array_key,) if array_key else (), transform=collect
+            )
+    except (FileNotFoundError, json.JSONDecodeError):
+        document = {}
+    if batch:
+        flush()
+    if importer is not None and importer[2] is not None:
+        table = RECORD_TABLES[name]
+        connection.execute(
+            f"INSERT INTO {table}_terms (term, documents) "
+            f"SELECT term, COUNT(*) FROM {table}_postings GROUP BY term"
+        )
+
+    connection.executemany(
+        "INSERT INTO record_fields (dataset, position, field) VALUES (?, ?, ?)",
+        ((name, position, field) for position, field in enumerate(fields)),
+    )
+
+    if array_key is not None:
+        document.pop(array_key, None)
+    connection.execute(
+        "INSERT INTO documents (name, body) VALUES (?, ?)", (name, json.dumps(document))
+    )
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import a JSON data directory into a SQLite database"
+    )
+    parser.add_argument("data_dir", help="directory with the JSON data files")
+    parser.add_argument("database", help="SQLite database file to create")
+    args = parser.parse_args()
+
+    report = import_json(args.data_dir, args.database)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
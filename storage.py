@@ -0,0 +1,270 @@
+"""
+Storage Backend Interface
+Data access contract shared by the in-memory and SQLite backends
+"""
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from response_cache import ResponseCache
+    from result_cache import ResultCache
+    from utils import PropertyFilter
+
+
+class DataAccess(ABC):
+    """Read queries the tools and resources run against a snapshot of the data
+
+    Implementations answer every query from one consistent version of the
+    datasets. Records are returned as mappings and may be shared with the
+    backend, so callers must not modify them.
+    """
+
+    # Data version the snapshot answers from; bumped by refresh_data whenever
+    # it changes the data
+    version: int = 0
+
+    # Version of each dataset, by name; bumped by refresh_data whenever it
+    # changes that dataset. Cached views are tagged with the versions of the
+    # datasets they read.
+    dataset_versions: Dict[str, int]
+
+    # Record fields
+    @abstractmethod
+    def get_record_fields(self, dataset: str) -> Tuple[str, ...]:
+        """Names of the fields held by the records of a dataset (properties,
+        agents, clients or transactions), in first-seen order"""
+
+    # Properties
+    @abstractmethod
+    def get_all_properties(self) -> List[Dict[str, Any]]:
+        """All active listings, in file order"""
+
+    @abstractmethod
+    def get_properties_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Up to ``limit`` listings from position ``offset``, in file order"""
+
+    @abstractmethod
+    def count_properties(self) -> int:
+        """Number of active listings"""
+
+    @abstractmethod
+    def get_property_by_id(self, property_id: str) -> Optional[Dict[str, Any]]:
+        """The listing with this ID, or None"""
+
+    @abstractmethod
+    def filter_properties(self, filters: "PropertyFilter") -> List[Dict[str, Any]]:
+        """Listings matching every criterion of the filter
+
+        Listings come in file order or, with ``sort_by``, ordered by that field
+        (equal values in file order, listings without a value last), and are
+        paged by ``offset`` and ``limit``.
+        """
+
+    @abstractmethod
+    def explain_filter(
+        self, filters: "PropertyFilter"
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """``filter_properties`` results with a description of the plan used
+
+        The description names the ``access_path`` and reports the candidate
+        and result row counts under ``actual_rows``.
+        """
+
+    @abstractmethod
+    def search_properties(self, query: str) -> List[Dict[str, Any]]:
+        """Listings whose searchable text contains the query, in file order"""
+
+    @abstractmethod
+    def rank_properties(
+        self, query: str, limit: Optional[int] = None, min_score: Optional[float] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Matching listings with relevance scores, best first"""
+
+    @abstractmethod
+    def count_ranked_properties(
+        self, query: str, min_score: Optional[float] = None
+    ) -> int:
+        """Number of listings ``rank_properties`` returns without a limit,
+        counted without ranking them"""
+
+    @abstractmethod
+    def get_properties_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
+        """Listings of one agent, in file order"""
+
+    @abstractmethod
+    def get_properties_by_area(self, area: str) -> List[Dict[str, Any]]:
+        """Listings in an area (case-insensitive), in file order"""
+
+    @abstractmethod
+    def get_price_range(self) -> Dict[str, Any]:
+        """Price range summary of the listings file"""
+
+    # Agents
+    @abstractmethod
+    def get_all_agents(self) -> List[Dict[str, Any]]:
+        """All agent profiles, in file order"""
+
+    @abstractmethod
+    def get_agents_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Up to ``limit`` agents from position ``offset``, in file order"""
+
+    @abstractmethod
+    def count_agents(self) -> int:
+        """Number of agent profiles"""
+
+    @abstractmethod
+    def get_agent_by_id(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """The agent with this ID, or None"""
+
+    @abstractmethod
+    def search_agents(self, query: str) -> List[Dict[str, Any]]:
+        """Agents whose searchable text contains the query, in file order"""
+
+    @abstractmethod
+    def rank_agents(
+        self, query: str, limit: Optional[int] = None, min_score: Optional[float] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Matching agents with relevance scores, best first"""
+
+    @abstractmethod
+    def count_ranked_agents(self, query: str, min_score: Optional[float] = None) -> int:
+        """Number of agents ``rank_agents`` returns without a limit, counted
+        without ranking them"""
+
+    # Clients
+    @abstractmethod
+    def get_all_clients(self) -> List[Dict[str, Any]]:
+        """All clients, in file order"""
+
+    @abstractmethod
+    def get_clients_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Up to ``limit`` clients from position ``offset``, in file order"""
+
+    @abstractmethod
+    def count_clients(self) -> int:
+        """Number of clients"""
+
+    @abstractmethod
+    def get_client_by_id(self, client_id: str) -> Optional[Dict[str, Any]]:
+        """The client with this ID, or None"""
+
+    @abstractmethod
+    def get_clients_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
+        """Clients of one agent, in file order"""
+
+    @abstractmethod
+    def get_lead_sources(self) -> Dict[str, Any]:
+        """Lead source counts of the client database"""
+
+    # Sales
+    @abstractmethod
+    def get_recent_sales(self) -> List[Dict[str, Any]]:
+        """All recent sales, in file order"""
+
+    @abstractmethod
+    def get_sales_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Up to ``limit`` recent sales from position ``offset``, in file order"""
+
+    @abstractmethod
+    def count_sales(self) -> int:
+        """Number of recent sales"""
+
+    @abstractmethod
+    def get_sales_by_area(self, area: str) -> List[Dict[str, Any]]:
+        """Sales in an area (case-insensitive), in file order"""
+
+    @abstractmethod
+    def get_sales_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
+        """Sales of one agent, in file order"""
+
+    @abstractmethod
+    def get_sales_summary(self) -> Dict[str, Any]:
+        """Summary statistics of the sales file"""
+
+    # Market
+    @abstractmethod
+    def get_market_overview(self) -> Dict[str, Any]:
+        """City-wide market overview"""
+
+    @abstractmethod
+    def get_area_market_data(self, area: str) -> Optional[Dict[str, Any]]:
+        """Market performance of an area, or None"""
+
+    @abstractmethod
+    def get_price_analytics(self) -> Dict[str, Any]:
+        """Price analytics by property type and price band"""
+
+    @abstractmethod
+    def get_investment_opportunities(self) -> Dict[str, Any]:
+        """Investment opportunity analysis"""
+
+    @abstractmethod
+    def compare_areas(self, areas: List[str]) -> Dict[str, Any]:
+        """Market data of several areas, keyed by area"""
+
+    # Areas and amenities
+    @abstractmethod
+    def get_all_areas(self) -> List[Dict[str, Any]]:
+        """All area profiles"""
+
+    @abstractmethod
+    def get_area_info(self, area_name: str) -> Optional[Dict[str, Any]]:
+        """The profile of an area (case-insensitive), or None"""
+
+    @abstractmethod
+    def get_city_overview(self) -> Dict[str, Any]:
+        """City name, population, income, school districts and trends"""
+
+    @abstractmethod
+    def get_all_amenities(self) -> Dict[str, Any]:
+        """All amenities data, by category"""
+
+    @abstractmethod
+    def get_amenities_by_type(self, amenity_type: str) -> Dict[str, Any]:
+        """One amenities category (schools, shopping, healthcare, ...)"""
+
+    @abstractmethod
+    def get_area_amenities(self, area: str) -> Dict[str, Any]:
+        """Schools, parks and shopping near an area"""
+
+
+class DataBackend(ABC):
+    """Storage backend serving ``DataAccess`` snapshots
+
+    Subclasses keep the current snapshot in ``_snapshot`` and replace it as a
+    whole when the data changes. Query methods called on the backend itself
+    run against the snapshot that is current at the time of the call.
+    """
+
+    # Directory watched for changes by DataWatcher
+    data_dir: str
+
+    # Files under data_dir whose changes DataWatcher ignores
+    watch_ignored: Tuple[str, ...] = ()
+
+    # Files under data_dir that DataWatcher only reloads for when they are
+    # created, deleted or replaced, not when they are written in place
+    watch_replaced: Tuple[str, ...] = ()
+
+    # Filter and search results shared by the backend's snapshots
+    result_cache: "ResultCache"
+
+    # Encoded responses of whole-dataset handlers, re-encoded after refreshes
+    response_cache: "ResponseCache"
+
+    def __getattr__(self, name: str) -> Any:
+        """Resolve query methods on the current snapshot"""
+        snapshot = self.__dict__.get("_snapshot")
+        if snapshot is None or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(snapshot, name)
+
+    def snapshot(self) -> DataAccess:
+        """Get the current data snapshot"""
+        return self._snapshot
+
+    @abstractmethod
+    def refresh_data(self) -> Dict[str, Any]:
+        """Pick up changed data and report ``reloaded``, ``unchanged`` and
+        ``not_loaded`` datasets"""
@@ -4,6 +4,7 @@ Pytest configuration and shared fixtures for the Real Estate MCP Server tests
 
 import json
 import os
+import random
 import tempfile
 from typing import Any, Dict
 from unittest.mock import Mock, patch
@@ -204,3 +205,74 @@ def property_filter():
     return PropertyFilter(
         min_price=400000, max_price=600000, min_bedrooms=2, areas=["Test Area"]
     )
+
+
+@pytest.fixture
+def random_listings():
+    """Factory of listings with random values, including missing fields and,
+    with ``nan``, NaN prices"""
+    areas = ["Downtown", "Suburbs", "Hills", "Lakeside", None]
+    types = ["House", "Condo", "Townhouse"]
+    features = ["Pool", "Garage", "Garden", "Gym", "Fireplace"]
+
+    def generate(count, seed=3, nan=False):
+        rng = random.Random(seed)
+        listings = []
+        for i in range(count):
+            listing = {
+                "id": f"P{i}",
+                "price": rng.randrange(100000, 2000000, 5000),
+                "bedrooms": rng.randint(1, 6),
+                "bathrooms": rng.choice([1, 1.5, 2, 2.5, 3]),
+                "square_feet": rng.randint(500, 5000),
+                "area": rng.choice(areas),
+                "property_type": rng.choice(types),
+                "features": rng.sample(features, rng.randint(0, 3)),
+                "list_date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            }
+            for field in (
+                "price",
+                "bedrooms",
+                "bathrooms",
+                "square_feet",
+                "area",
+                "property_type",
+                "list_date",
+            ):
+                if rng.random() < 0.05:
+                    del listing[field]
+            if nan and rng.random() < 0.02:
+                listing["price"] = float("nan")
+            if rng.random() < 0.01:
+                listing["list_date"] = 20240101
+            listings.append(listing)
+        return listings
+
+    return generate
+
+
+@pytest.fixture
+def random_filter():
+    """Factory of PropertyFilters with a random subset of predicates set,
+    drawn from the given random generator"""
+
+    def generate(rng):
+        return PropertyFilter(
+            min_price=rng.choice([None, 0, -1, 300000, 1900000]),
+            max_price=rng.choice([None, 150000, 700000]),
+            min_bedrooms=rng.choice([None, 2, 5]),
+            max_bedrooms=rng.choice([None, 3]),
+            min_bathrooms=rng.choice([None, 1.5, 2]),
+            max_bathrooms=rng.choice([None, 2.5]),
+            areas=rng.choice(
+                [None, [], ["Downtown"], ["Hills", "Lakeside", "Nowhere"]]
+            ),
+            property_types=rng.choice([None, ["Condo"], ["House", "Townhouse"]]),
+            min_sqft=rng.choice([None, 1500]),
+            max_sqft=rng.choice([None, 3500]),
+            features=rng.choice([None, ["pool"], ["Gar"], ["GAR", "gym"], ["sauna"]]),
+            min_list_date=rng.choice([None, None, "2024-03-01", "2024-11-15"]),
+            max_list_date=rng.choice([None, None, "2024-06-30"]),
+        )
+
+    return generate
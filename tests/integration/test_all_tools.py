@@ -3,15 +3,20 @@ Integration tests for all MCP tools
 """
 
 import json
+import os
 from unittest.mock import Mock, patch
 
 import pytest
 
+from result_cache import ResultCache
+from sqlite_backend import SQLiteDataManager, SQLiteSnapshot, import_json
 from tools.agent_tools import register_agent_tools
 from tools.area_tools import register_area_tools
 from tools.client_tools import register_client_tools
 from tools.market_tools import register_market_tools
+from tools.property_tools import register_property_tools
 from tools.system_tools import register_system_tools
+from utils import RealEstateDataManager
 
 
 class TestAgentTools:
@@ -40,9 +45,17 @@ class TestAgentTools:
             result = mock_mcp["get_all_agents"]()
             data = json.loads(result)
 
-            assert isinstance(data, list)
-            assert len(data) == 2
-            assert data[0]["id"] == "AGENT001"
+            assert data["total_count"] == 2
+            assert data["agents"][0]["id"] == "AGENT001"
+            assert data["next_cursor"] is None
+
+            data = json.loads(mock_mcp["get_all_agents"](fields="id,name"))
+            assert data["agents"][0] == {"id": "AGENT001", "name": "Test Agent 1"}
+
+            data = json.loads(mock_mcp["get_all_agents"](limit=1))
+            assert [a["id"] for a in data["agents"]] == ["AGENT001"]
+            data = json.loads(mock_mcp["get_all_agents"](cursor=data["next_cursor"]))
+            assert [a["id"] for a in data["agents"]] == ["AGENT002"]
 
     def test_get_agent_details(self, mock_mcp, test_data_manager):
         """Test get_agent_details tool"""
@@ -63,6 +76,30 @@ class TestAgentTools:
             assert data["results_count"] == 1
             assert data["agents"][0]["id"] == "AGENT001"
 
+    def test_search_agents_ranked(self, mock_mcp, test_data_manager):
+        """Test search_agents with ranked returns scored top matches"""
+        with patch("tools.agent_tools.data_manager", test_data_manager):
+            result = mock_mcp["search_agents"]("Test Agent", limit=5, ranked=True)
+            data = json.loads(result)
+
+            assert data["ranked"] is True
+            assert data["results_count"] == 2
+            assert "relevance_score" in data["agents"][0]
+
+            data = json.loads(
+                mock_mcp["search_agents"]("Test Agent", limit=1, ranked=True)
+            )
+            assert data["total_count"] == 2
+            rest = json.loads(
+                mock_mcp["search_agents"](
+                    "Test Agent", limit=1, ranked=True, cursor=data["next_cursor"]
+                )
+            )
+            assert [a["id"] for a in data["agents"] + rest["agents"]] == [
+                a["id"] for a in json.loads(result)["agents"]
+            ]
+            assert rest["next_cursor"] is None
+
 
 class TestMarketTools:
     """Test market-related MCP tools"""
@@ -128,9 +165,9 @@ class TestClientTools:
             result = mock_mcp["get_all_clients"]()
             data = json.loads(result)
 
-            assert isinstance(data, list)
-            assert len(data) == 1
-            assert data[0]["id"] == "CLI001"
+            assert data["total_count"] == 1
+            assert data["clients"][0]["id"] == "CLI001"
+            assert data["next_cursor"] is None
 
     def test_get_client_details(self, mock_mcp, test_data_manager):
         """Test get_client_details tool"""
@@ -141,6 +178,17 @@ class TestClientTools:
             assert data["id"] == "CLI001"
             assert data["name"] == "Test Client 1"
 
+            data = json.loads(mock_mcp["get_client_details"]("CLI001", "id,type"))
+            assert data == {"id": "CLI001", "type": "Buyer"}
+            data = json.loads(mock_mcp["get_all_clients"](fields="summary"))
+            assert set(data["clients"][0]) <= {
+                "id",
+                "name",
+                "type",
+                "status",
+                "agent_id",
+            }
+
     def test_match_client_preferences(self, mock_mcp, test_data_manager):
         """Test match_client_preferences tool"""
         with patch("tools.client_tools.data_manager", test_data_manager):
@@ -218,10 +266,35 @@ class TestSystemTools:
 
     def test_refresh_data(self, mock_mcp, test_data_manager):
         """Test refresh_data tool"""
+        test_data_manager.get_all_properties()
         with patch("tools.system_tools.data_manager", test_data_manager):
             result = mock_mcp["refresh_data"]()
 
             assert "refreshed successfully" in result
+            data = json.loads(result)
+            assert data["reloaded"] == {}
+            assert "properties" in data["unchanged"]
+
+    def test_get_reload_metrics_without_watcher(self, mock_mcp):
+        """Test get_reload_metrics when automatic reloading is disabled"""
+        with patch("watcher.active_watcher", None):
+            data = json.loads(mock_mcp["get_reload_metrics"]())
+
+            assert data["watching"] is False
+
+    def test_get_cache_stats(self, mock_mcp, test_data_manager):
+        """Test get_cache_stats reports result cache hits and misses"""
+        test_data_manager.search_properties("test")
+        test_data_manager.search_properties("test")
+        with patch("tools.system_tools.data_manager", test_data_manager):
+            data = json.loads(mock_mcp["get_cache_stats"]())
+
+            assert data["data_version"] == 0
+            assert data["dataset_versions"]["properties"] == 0
+            assert data["result_cache"]["hits"] == 1
+            assert data["result_cache"]["misses"] == 1
+            assert data["result_cache"]["evictions"] == 0
+            assert data["response_cache"]["responses"] == 0
 
     def test_get_data_summary(self, mock_mcp, test_data_manager):
         """Test get_data_summary tool"""
@@ -235,3 +308,236 @@ class TestSystemTools:
             assert data["properties"]["total_active_listings"] == 2
             assert data["agents"]["total_agents"] == 2
             assert data["clients"]["total_clients"] == 1
+
+
+class TestCachedViews:
+    """Test composite tools are served from the result cache"""
+
+    @pytest.fixture
+    def tools(self):
+        """Register the agent, area and property tools on a mock MCP server"""
+        mcp = Mock()
+        tools = {}
+
+        def mock_tool():
+            def decorator(func):
+                tools[func.__name__] = func
+                return func
+
+            return decorator
+
+        mcp.tool = mock_tool
+        register_agent_tools(mcp)
+        register_area_tools(mcp)
+        register_property_tools(mcp)
+        return tools
+
+    def test_transactions_refresh_rebuilds_dashboard_only(
+        self, tools, test_data_manager, temp_data_dir
+    ):
+        """Test a transactions-only refresh rebuilds dashboards, not filters"""
+        cache = test_data_manager.result_cache
+        with patch("tools.agent_tools.data_manager", test_data_manager), patch(
+            "tools.property_tools.data_manager", test_data_manager
+        ):
+            dashboard = json.loads(tools["get_agent_dashboard"]("AGENT001"))
+            assert dashboard["recent_sales"] == []
+            tools["filter_properties"](min_price=300000)
+
+            hits = cache.hits
+            tools["get_agent_dashboard"]("AGENT001")
+            tools["filter_properties"](min_price=300000)
+            assert cache.hits == hits + 2
+
+            filepath = os.path.join(temp_data_dir, "transactions", "recent_sales.json")
+            sale = {"id": "SALE001", "agent_id": "AGENT001", "area": "Test Area"}
+            with open(filepath, "w") as f:
+                json.dump({"recent_sales": [sale]}, f)
+            test_data_manager.refresh_data()
+
+            hits, stale = cache.hits, cache.stale
+            tools["filter_properties"](min_price=300000)
+            assert (cache.hits, cache.stale) == (hits + 1, stale)
+
+            dashboard = json.loads(tools["get_agent_dashboard"]("AGENT001"))
+            assert cache.stale == stale + 1
+            assert [s["id"] for s in dashboard["recent_sales"]] == ["SALE001"]
+
+    COMPOSITE_CALLS = [
+        ("get_agent_dashboard", "AGENT001"),
+        ("get_property_insights", "TEST001"),
+        ("get_comprehensive_area_report", "Test Area"),
+    ]
+
+    def test_cache_does_not_change_output(
+        self, tools, test_data_manager, temp_data_dir
+    ):
+        """Test composite tools answer the same with the result cache on and off"""
+        uncached = RealEstateDataManager(temp_data_dir, result_cache=ResultCache(0))
+
+        def call(manager, name, *args):
+            with patch("tools.agent_tools.data_manager", manager), patch(
+                "tools.property_tools.data_manager", manager
+            ), patch("tools.area_tools.data_manager", manager):
+                return json.loads(tools[name](*args))
+
+        for name, *args in self.COMPOSITE_CALLS:
+            expected = call(uncached, name, *args)
+            assert call(test_data_manager, name, *args) == expected
+            # The second call is answered from the cache
+            hits = test_data_manager.result_cache.hits
+            assert call(test_data_manager, name, *args) == expected
+            assert test_data_manager.result_cache.hits > hits
+
+        dashboard = call(test_data_manager, "get_agent_dashboard", "AGENT001")
+        assert list(dashboard) == [
+            "agent_info",
+            "performance_metrics",
+            "active_listings",
+            "clients",
+            "recent_sales",
+        ]
+        assert list(dashboard["performance_metrics"]) == [
+            "active_listings",
+            "total_clients",
+            "recent_sales_count",
+            "total_sales_volume",
+            "avg_days_on_market",
+        ]
+        insights = call(test_data_manager, "get_property_insights", "TEST001")
+        assert list(insights) == [
+            "property",
+            "listing_agent",
+            "area_context",
+            "comparable_sales",
+        ]
+        report = call(test_data_manager, "get_comprehensive_area_report", "Test Area")
+        assert list(report) == [
+            "area",
+            "area_info",
+            "market_data",
+            "active_properties",
+            "recent_sales",
+            "amenities",
+        ]
+        assert report["active_properties"]["count"] == 2
+
+
+class TestToolsOnSQLite:
+    """Test every tool answers the same from the SQLite backend"""
+
+    TOOL_CALLS = [
+        ("get_all_agents",),
+        ("get_agent_details", "AGENT001"),
+        ("search_agents", "luxury"),
+        ("search_agents", "luxury", None, 0.5),
+        ("get_agent_properties", "AGENT001"),
+        ("get_agent_sales", "AGENT001"),
+        ("get_agent_clients", "AGENT001"),
+        ("get_agent_dashboard", "AGENT001"),
+        ("get_all_areas",),
+        ("get_area_details", "Test Area"),
+        ("get_city_overview",),
+        ("get_area_amenities", "Test Area"),
+        ("get_schools_data",),
+        ("get_parks_and_recreation",),
+        ("get_shopping_amenities",),
+        ("get_healthcare_facilities",),
+        ("get_comprehensive_area_report", "Test Area"),
+        ("get_all_clients",),
+        ("get_client_details", "CLI001"),
+        ("match_client_preferences", "CLI001"),
+        ("get_market_overview",),
+        ("get_price_analytics",),
+        ("get_area_market_data", "Test Area"),
+        ("compare_areas", "Test Area, Other Area"),
+        ("get_investment_opportunities",),
+        ("get_recent_sales",),
+        ("get_sales_by_area", "test area"),
+        ("get_all_properties",),
+        ("get_property_details", "TEST001"),
+        ("search_properties", "test"),
+        ("search_properties", "test", 1, None, True),
+        ("search_properties", "a", None, 1.0),
+        ("filter_properties", 300000, 600000, 2),
+        ("get_properties_by_area", "Test Area"),
+        ("get_property_insights", "TEST001"),
+        ("get_data_summary",),
+    ]
+
+    @pytest.fixture
+    def tools(self):
+        """Register every tool module on a mock MCP server"""
+        mcp = Mock()
+        tools = {}
+
+        def mock_tool():
+            def decorator(func):
+                tools[func.__name__] = func
+                return func
+
+            return decorator
+
+        mcp.tool = mock_tool
+        for register in (
+            register_agent_tools,
+            register_area_tools,
+            register_client_tools,
+            register_market_tools,
+            register_property_tools,
+            register_system_tools,
+        ):
+            register(mcp)
+        return tools
+
+    def call_all(self, tools, manager):
+        """Output of every tool call with ``manager`` as the data manager"""
+        modules = ["agent", "area", "client", "market", "property", "system"]
+        patches = [patch(f"tools.{m}_tools.data_manager", manager) for m in modules]
+        for active in patches:
+            active.start()
+        try:
+            return {call[0]: tools[call[0]](*call[1:]) for call in self.TOOL_CALLS}
+        finally:
+            for active in patches:
+                active.stop()
+
+    def test_tools_match_json_backend(
+        self, tools, temp_data_dir, test_data_manager, tmp_path
+    ):
+        """Test tool responses are identical for both backends"""
+        database = str(tmp_path / "test.db")
+        import_json(temp_data_dir, database)
+
+        expected = self.call_all(tools, test_data_manager)
+        actual = self.call_all(tools, SQLiteDataManager(database))
+        for name, output in expected.items():
+            assert actual[name] == output, name
+
+    def test_list_tools_read_one_page(self, tools, temp_data_dir, tmp_path):
+        """Test list tools and the data summary never read a whole table"""
+        database = str(tmp_path / "test.db")
+        import_json(temp_data_dir, database)
+        manager = SQLiteDataManager(database)
+        whole_tables = [
+            "get_all_properties",
+            "get_all_agents",
+            "get_all_clients",
+            "get_recent_sales",
+        ]
+        patches = [
+            patch.object(SQLiteSnapshot, name, side_effect=AssertionError(name))
+            for name in whole_tables
+        ]
+        for active in patches:
+            active.start()
+        try:
+            outputs = self.call_all(tools, manager)
+        finally:
+            for active in patches:
+                active.stop()
+
+        page = json.loads(outputs["get_all_properties"])
+        assert page["total_count"] == 2 and page["results_count"] == 2
+        summary = json.loads(outputs["get_data_summary"])
+        assert summary["properties"]["total_active_listings"] == 2
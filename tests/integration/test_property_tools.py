@@ -3,10 +3,12 @@ Integration tests for property tools
 """
 
 import json
+import os
 from unittest.mock import Mock, patch
 
 import pytest
 
+from text_index import TextIndex
 from tools.property_tools import register_property_tools
 from utils import data_manager
 
@@ -37,10 +39,33 @@ class TestPropertyTools:
             result = mock_mcp["get_all_properties"]()
             data = json.loads(result)
 
-            assert isinstance(data, list)
-            assert len(data) == 2
-            assert data[0]["id"] == "TEST001"
-            assert data[1]["id"] == "TEST002"
+            assert data["total_count"] == 2
+            assert [p["id"] for p in data["properties"]] == ["TEST001", "TEST002"]
+            assert data["next_cursor"] is None
+
+    def test_get_all_properties_pages(self, mock_mcp, test_data_manager, temp_data_dir):
+        """Test get_all_properties pages with cursors tied to the data version"""
+        with patch("tools.property_tools.data_manager", test_data_manager):
+            first = json.loads(mock_mcp["get_all_properties"](limit=1))
+            assert first["total_count"] == 2
+            assert [p["id"] for p in first["properties"]] == ["TEST001"]
+
+            second = json.loads(
+                mock_mcp["get_all_properties"](limit=1, cursor=first["next_cursor"])
+            )
+            assert [p["id"] for p in second["properties"]] == ["TEST002"]
+            assert second["next_cursor"] is None
+
+            result = mock_mcp["search_properties"]("test", cursor=first["next_cursor"])
+            assert result == "Cursor was issued for a different query"
+            assert mock_mcp["get_all_properties"](limit=501).startswith("limit must")
+
+            filepath = os.path.join(temp_data_dir, "properties", "active_listings.json")
+            with open(filepath, "w") as f:
+                json.dump({"active_listings": [{"id": "NEW001"}]}, f)
+            test_data_manager.refresh_data()
+            result = mock_mcp["get_all_properties"](cursor=first["next_cursor"])
+            assert result.startswith("Cursor expired")
 
     def test_get_property_details(self, mock_mcp, test_data_manager):
         """Test get_property_details tool"""
@@ -57,6 +82,16 @@ class TestPropertyTools:
             result = mock_mcp["get_property_details"]("NONEXISTENT")
             assert "not found" in result.lower()
 
+    def test_response_format(self, mock_mcp, test_data_manager):
+        """Test responses are compact unless pretty output is asked for"""
+        with patch("tools.property_tools.data_manager", test_data_manager):
+            compact = mock_mcp["get_property_details"]("TEST001")
+            pretty = mock_mcp["get_property_details"]("TEST001", pretty=True)
+
+            assert "\n" not in compact
+            assert pretty.startswith('{\n  "id": "TEST001"')
+            assert json.loads(compact) == json.loads(pretty)
+
     def test_search_properties(self, mock_mcp, test_data_manager):
         """Test search_properties tool"""
         with patch("tools.property_tools.data_manager", test_data_manager):
@@ -68,6 +103,77 @@ class TestPropertyTools:
             assert len(data["properties"]) == 1
             assert data["properties"][0]["id"] == "TEST001"
 
+    def test_search_properties_ranked(self, mock_mcp, test_data_manager):
+        """Test search_properties with ranked returns scored top matches"""
+        with patch("tools.property_tools.data_manager", test_data_manager):
+            result = mock_mcp["search_properties"]("test", limit=1, ranked=True)
+            data = json.loads(result)
+
+            assert data["ranked"] is True
+            assert data["results_count"] == 1
+            assert data["properties"][0]["relevance_score"] > 0
+
+            result = mock_mcp["search_properties"]("test", min_score=1000.0)
+            assert json.loads(result)["results_count"] == 0
+
+            ranked = json.loads(
+                mock_mcp["search_properties"]("test", limit=5, ranked=True)
+            )
+            first = json.loads(
+                mock_mcp["search_properties"]("test", limit=1, ranked=True)
+            )
+            assert first["total_count"] == ranked["total_count"] == 2
+            second = json.loads(
+                mock_mcp["search_properties"](
+                    "test", limit=1, ranked=True, cursor=first["next_cursor"]
+                )
+            )
+            assert first["properties"] + second["properties"] == ranked["properties"]
+            assert second["next_cursor"] is None
+
+    def test_limit_only_sets_the_page_size(self, mock_mcp, test_data_manager):
+        """Test an unranked search pages in listing order at the given limit"""
+        with patch("tools.property_tools.data_manager", test_data_manager):
+            first = json.loads(mock_mcp["search_properties"]("test", limit=1))
+            assert "ranked" not in first
+            assert "relevance_score" not in first["properties"][0]
+            assert (first["results_count"], first["total_count"]) == (1, 2)
+            second = json.loads(
+                mock_mcp["search_properties"](
+                    "test", limit=1, cursor=first["next_cursor"]
+                )
+            )
+            unranked = json.loads(mock_mcp["search_properties"]("test"))
+            assert first["properties"] + second["properties"] == (
+                unranked["properties"]
+            )
+
+    def test_ranked_pages_never_rank_every_match(self, mock_mcp, test_data_manager):
+        """Test paging ranked results only ranks the top offset + limit"""
+        rank = TextIndex.rank
+        limits = []
+
+        def bounded_rank(index, query, limit=None, min_score=None):
+            limits.append(limit)
+            return rank(index, query, limit, min_score)
+
+        with patch(
+            "tools.property_tools.data_manager", test_data_manager
+        ), patch.object(TextIndex, "rank", bounded_rank):
+            for min_score in (None, 0.0):
+                data = json.loads(
+                    mock_mcp["search_properties"]("test", limit=1, min_score=min_score)
+                )
+                assert data["total_count"] == 2
+                data = json.loads(
+                    mock_mcp["search_properties"](
+                        "test", limit=1, min_score=min_score, cursor=data["next_cursor"]
+                    )
+                )
+                assert data["results_count"] == 1
+
+        assert limits and None not in limits
+
     def test_filter_properties(self, mock_mcp, test_data_manager):
         """Test filter_properties tool"""
         with patch("tools.property_tools.data_manager", test_data_manager):
@@ -82,6 +188,104 @@ class TestPropertyTools:
             assert data["results_count"] == 1
             assert data["properties"][0]["id"] == "TEST001"
 
+    def test_filter_properties_explain(self, mock_mcp, test_data_manager):
+        """Test filter_properties returns the query plan when asked"""
+        with patch("tools.property_tools.data_manager", test_data_manager):
+            data = json.loads(
+                mock_mcp["filter_properties"](min_price=400000, explain=True)
+            )
+
+            assert data["results_count"] == 1
+            assert data["plan"]["access_path"]
+            assert data["plan"]["actual_rows"]["result"] == 1
+            assert "estimated_rows" in data["plan"]
+
+            data = json.loads(mock_mcp["filter_properties"](min_price=400000))
+            assert "plan" not in data
+
+    def test_fields_projection(self, mock_mcp, test_data_manager):
+        """Test property tools return only the requested fields"""
+        with patch("tools.property_tools.data_manager", test_data_manager):
+            data = json.loads(mock_mcp["get_all_properties"](fields="id,price"))
+            assert data["properties"] == [
+                {"id": "TEST001", "price": 500000},
+                {"id": "TEST002", "price": 350000},
+            ]
+
+            data = json.loads(mock_mcp["get_property_details"]("TEST001", "summary"))
+            assert data["address"] == "123 Test St"
+            assert "features" not in data and "city" not in data
+
+            data = json.loads(
+                mock_mcp["filter_properties"](
+                    sort_by="price", fields="summary,features"
+                )
+            )
+            assert [p["id"] for p in data["properties"]] == ["TEST002", "TEST001"]
+            assert set(data["properties"][0]) == {
+                "id",
+                "address",
+                "area",
+                "price",
+                "bedrooms",
+                "bathrooms",
+                "features",
+            }
+
+            data = json.loads(
+                mock_mcp["search_properties"]("test", limit=5, ranked=True, fields="id")
+            )
+            assert set(data["properties"][0]) == {"id", "relevance_score"}
+
+            full = json.loads(mock_mcp["get_all_properties"](fields="full"))
+            assert full == json.loads(mock_mcp["get_all_properties"]())
+            assert mock_mcp["get_all_properties"](fields=" , ").startswith(
+                "No fields given"
+            )
+            for tool, args in (
+                ("get_property_details", ("TEST001",)),
+                ("get_all_properties", ()),
+            ):
+                for fields in ("nope", "sumary"):
+                    assert mock_mcp[tool](*args, fields=fields).startswith(
+                        "Unknown property field"
+                    )
+
+    def test_filter_properties_sorted_page(self, mock_mcp, test_data_manager):
+        """Test filter_properties orders and pages results by an indexed field"""
+        with patch("tools.property_tools.data_manager", test_data_manager):
+            data = json.loads(mock_mcp["filter_properties"](sort_by="price", limit=1))
+            assert [p["id"] for p in data["properties"]] == ["TEST002"]
+            assert data["page"] == {
+                "sort_by": "price",
+                "descending": False,
+                "offset": 0,
+                "limit": 1,
+            }
+            assert data["total_count"] == 2
+
+            data = json.loads(
+                mock_mcp["filter_properties"](
+                    sort_by="price", limit=1, cursor=data["next_cursor"]
+                )
+            )
+            assert [p["id"] for p in data["properties"]] == ["TEST001"]
+            assert data["page"]["offset"] == 1
+            assert data["next_cursor"] is None
+
+            data = json.loads(
+                mock_mcp["filter_properties"](sort_by="price", descending=True)
+            )
+            assert [p["id"] for p in data["properties"]] == ["TEST001", "TEST002"]
+
+            data = json.loads(
+                mock_mcp["filter_properties"](sort_by="price", offset=1, limit=5)
+            )
+            assert [p["id"] for p in data["properties"]] == ["TEST001"]
+
+            result = mock_mcp["filter_properties"](sort_by="area")
+            assert result.startswith("Cannot sort by 'area'")
+
     def test_filter_properties_with_areas(self, mock_mcp, test_data_manager):
         """Test filter_properties tool with areas parameter"""
         with patch("tools.property_tools.data_manager", test_data_manager):
@@ -91,6 +295,21 @@ class TestPropertyTools:
             assert data["filters_applied"]["areas"] == ["Test Area", "Another Area"]
             assert data["results_count"] == 2  # Both properties are in Test Area
 
+    def test_filter_properties_features_and_size(self, mock_mcp, test_data_manager):
+        """Test filter_properties with features, bathrooms and square footage"""
+        with patch("tools.property_tools.data_manager", test_data_manager):
+            result = mock_mcp["filter_properties"](features="gar, garden")
+            data = json.loads(result)
+
+            assert data["filters_applied"]["features"] == ["gar", "garden"]
+            assert [p["id"] for p in data["properties"]] == ["TEST001"]
+
+            result = mock_mcp["filter_properties"](min_sqft=1000, max_sqft=1800)
+            assert [p["id"] for p in json.loads(result)["properties"]] == ["TEST002"]
+
+            result = mock_mcp["filter_properties"](min_bathrooms=2.5)
+            assert [p["id"] for p in json.loads(result)["properties"]] == ["TEST001"]
+
     def test_get_properties_by_area(self, mock_mcp, test_data_manager):
         """Test get_properties_by_area tool"""
         with patch("tools.property_tools.data_manager", test_data_manager):
@@ -2,11 +2,14 @@
 Integration tests for MCP resources
 """
 
+import asyncio
 import json
+import os
 from unittest.mock import Mock, patch
 
 import pytest
 
+from conditional import ContentHashes, ConditionalFastMCP, content_hash
 from resources import (
     register_agent_resources,
     register_client_resources,
@@ -42,9 +45,46 @@ class TestPropertyResources:
             result = mock_mcp["realestate://all-properties"]()
             data = json.loads(result)
 
-            assert isinstance(data, list)
-            assert len(data) == 2
-            assert data[0]["id"] == "TEST001"
+            assert data["total_count"] == 2
+            assert data["properties"][0]["id"] == "TEST001"
+            assert data["next_page"] is None
+
+    def test_all_properties_pages(self, mock_mcp, test_data_manager):
+        """Test realestate://all-properties links to its following pages"""
+        with patch("resources.property_resources.data_manager", test_data_manager):
+            with patch("pagination.DEFAULT_PAGE_SIZE", 1):
+                data = json.loads(mock_mcp["realestate://all-properties"]())
+                assert data["next_page"].startswith("realestate://all-properties/page/")
+                page = mock_mcp["realestate://all-properties/page/{cursor}"]
+                data = json.loads(page(data["next_cursor"]))
+
+            assert [p["id"] for p in data["properties"]] == ["TEST002"]
+            assert data["next_page"] is None
+            assert json.loads(page("bogus"))["error"].startswith("Invalid cursor")
+
+    def test_all_properties_fields(self, mock_mcp, test_data_manager):
+        """Test realestate://all-properties/fields/{fields} projects listings"""
+        with patch("resources.property_resources.data_manager", test_data_manager):
+            resource = mock_mcp["realestate://all-properties/fields/{fields}"]
+            data = json.loads(resource("id,price"))
+            assert data["properties"] == [
+                {"id": "TEST001", "price": 500000},
+                {"id": "TEST002", "price": 350000},
+            ]
+
+            with patch("pagination.DEFAULT_PAGE_SIZE", 1):
+                data = json.loads(resource("summary"))
+            assert data["next_page"].startswith(
+                "realestate://all-properties/fields/summary/page/"
+            )
+            page = mock_mcp["realestate://all-properties/fields/{fields}/page/{cursor}"]
+            data = json.loads(page("summary", data["next_cursor"]))
+            assert data["properties"][0]["id"] == "TEST002"
+            assert "description" not in data["properties"][0]
+
+            area = mock_mcp["realestate://properties/area/{area}/fields/{fields}"]
+            data = json.loads(area("Test Area", "id"))
+            assert data["properties"] == [{"id": "TEST001"}, {"id": "TEST002"}]
 
     def test_get_properties_by_area_template(self, mock_mcp, test_data_manager):
         """Test realestate://properties/area/{area} template"""
@@ -103,9 +143,9 @@ class TestAgentResources:
             result = mock_mcp["realestate://all-agents"]()
             data = json.loads(result)
 
-            assert isinstance(data, list)
-            assert len(data) == 2
-            assert data[0]["id"] == "AGENT001"
+            assert data["total_count"] == 2
+            assert data["agents"][0]["id"] == "AGENT001"
+            assert data["next_page"] is None
 
     def test_get_agent_dashboard_template(self, mock_mcp, test_data_manager):
         """Test realestate://agent/{agent_id}/dashboard template"""
@@ -274,13 +314,21 @@ class TestAllResources:
         """Test that all expected resources are registered"""
         expected_resources = [
             "realestate://all-properties",
+            "realestate://all-properties/page/{cursor}",
+            "realestate://all-properties/fields/{fields}",
+            "realestate://all-properties/fields/{fields}/page/{cursor}",
             "realestate://properties/area/{area}",
+            "realestate://properties/area/{area}/fields/{fields}",
             "realestate://property/{property_id}/insights",
             "realestate://all-agents",
+            "realestate://all-agents/page/{cursor}",
+            "realestate://all-agents/fields/{fields}",
+            "realestate://all-agents/fields/{fields}/page/{cursor}",
             "realestate://agent/{agent_id}/dashboard",
             "realestate://market-overview",
             "realestate://market/area/{area}",
             "realestate://client/{client_id}/matches",
+            "realestate://client/{client_id}/matches/fields/{fields}",
             "realestate://all-areas",
             "realestate://amenities",
         ]
@@ -290,4 +338,73 @@ class TestAllResources:
 
     def test_resource_count(self, mock_mcp):
         """Test that we have the expected number of resources"""
-        assert len(mock_mcp) == 10, f"Expected 10 resources, got {len(mock_mcp)}"
+        assert len(mock_mcp) == 18, f"Expected 18 resources, got {len(mock_mcp)}"
+
+
+class TestConditionalReads:
+    """Test content hashes and not-modified reads on a real server"""
+
+    @pytest.fixture
+    def server(self, test_data_manager):
+        """Server with the property and market resources over test data"""
+        mcp = ConditionalFastMCP("test", test_data_manager)
+        register_property_resources(mcp)
+        register_market_resources(mcp)
+        with patch("resources.property_resources.data_manager", test_data_manager):
+            with patch("resources.market_resources.data_manager", test_data_manager):
+                yield mcp
+
+    @staticmethod
+    def read(server, uri):
+        (contents,) = asyncio.run(server.read_resource(uri))
+        return contents
+
+    def test_hash_in_metadata(self, server):
+        """Test every read reports the hash of its contents"""
+        contents = self.read(server, "realestate://all-properties")
+        assert contents.meta["content_hash"] == content_hash(contents.content)
+        assert json.loads(contents.content)["total_count"] == 2
+
+        again = self.read(server, "realestate://all-properties")
+        assert again.meta["content_hash"] == contents.meta["content_hash"]
+
+    def test_not_modified_with_current_hash(self, server):
+        """Test a conditional read with the current hash returns no contents"""
+        uri = "realestate://market/area/Test Area"
+        digest = self.read(server, uri).meta["content_hash"]
+
+        contents = self.read(server, f"{uri}/if-none-match/{digest}")
+        assert contents.meta == {"content_hash": digest, "not_modified": True}
+        assert json.loads(contents.content) == {
+            "not_modified": True,
+            "content_hash": digest,
+        }
+
+    def test_first_read_can_be_conditional(self, server):
+        """Test a hash the server has not cached yet is still recognized"""
+        uri = "realestate://all-properties"
+        digest = content_hash(self.read(server, uri).content)
+        server.content_hashes = ContentHashes()
+
+        contents = self.read(server, f"{uri}/if-none-match/{digest}")
+        assert contents.meta["not_modified"] is True
+
+    def test_changed_data_returns_contents(
+        self, server, test_data_manager, temp_data_dir
+    ):
+        """Test a stale hash gets the new contents after a refresh"""
+        uri = "realestate://all-properties"
+        digest = self.read(server, uri).meta["content_hash"]
+
+        filepath = os.path.join(temp_data_dir, "properties", "active_listings.json")
+        with open(filepath) as f:
+            listings = json.load(f)
+        listings["active_listings"] = listings["active_listings"][:1]
+        with open(filepath, "w") as f:
+            json.dump(listings, f)
+        test_data_manager.refresh_data()
+
+        contents = self.read(server, f"{uri}/if-none-match/{digest}")
+        assert contents.meta["content_hash"] != digest
+        assert "not_modified" not in contents.meta
+        assert json.loads(contents.content)["total_count"] == 1
@@ -0,0 +1,104 @@
+"""
+Unit tests for columnar.py - vectorized property filtering
+"""
+
+import pickle
+import random
+from unittest.mock import patch
+
+import pytest
+
+from columnar import ListingColumns
+from utils import DataSnapshot, PropertyFilter, RealEstateDataManager
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def manager(random_listings):
+    """Data snapshot loaded with random listings"""
+    return DataSnapshot({"properties": {"active_listings": random_listings(500)}})
+
+
+class TestListingColumns:
+    """Test the columnar filter engine"""
+
+    def test_columns_built(self, manager):
+        """Test columns are built when NumPy is available"""
+        assert manager._listing_columns is not None
+        assert manager._listing_columns.size == 500
+
+    def test_matches_scan_path(self, manager, random_filter):
+        """Test vectorized filtering returns exactly the scan results"""
+        rng = random.Random(3)
+        properties = manager.get_all_properties()
+        for _ in range(200):
+            filters = random_filter(rng)
+            expected = [p for p in properties if manager._matches_filter(p, filters)]
+            assert manager.filter_properties(filters) == expected
+
+    def test_unrepresentable_values_fall_back(self):
+        """Test columns are not built for values a float column can't hold"""
+        assert ListingColumns.build([{"price": "500000"}]) is None
+        assert ListingColumns.build([{"price": 2**60}]) is None
+        assert ListingColumns.build([{"area": ["Downtown"]}]) is None
+
+    def test_scan_fallback_without_numpy(self, temp_data_dir):
+        """Test filtering still works when NumPy is unavailable"""
+        with patch("columnar.np", None):
+            manager = RealEstateDataManager(data_dir=temp_data_dir)
+            assert manager._listing_columns is None
+
+        results = manager.filter_properties(PropertyFilter(min_price=400000))
+        assert [p["id"] for p in results] == ["TEST001"]
+        results = manager.filter_properties(PropertyFilter(features=["pool"]))
+        assert [p["id"] for p in results] == ["TEST002"]
+
+
+class TestMappedColumns:
+    """Test exporting columns and mapping them back read-only"""
+
+    def test_export_and_map_round_trip(self, manager, tmp_path, random_filter):
+        """Test mapped columns filter exactly like the in-memory ones"""
+        path = str(tmp_path / "columns.bin")
+        assert manager._listing_columns.export(path, "source-1")
+        mapped = ListingColumns.map_file(path, "source-1")
+
+        assert isinstance(mapped.lower["price"], np.memmap)
+        assert not mapped.lower["price"].flags.writeable
+        assert mapped.vocabularies == manager._listing_columns.vocabularies
+
+        rng = random.Random(5)
+        for _ in range(100):
+            filters = random_filter(rng)
+            assert mapped.matching_rows(filters) == (
+                manager._listing_columns.matching_rows(filters)
+            )
+
+    def test_map_rejects_other_sources(self, manager, tmp_path):
+        """Test a columns file built from other listings is not mapped"""
+        path = str(tmp_path / "columns.bin")
+        manager._listing_columns.export(path, "source-1")
+
+        assert ListingColumns.map_file(path, "source-2") is None
+        assert ListingColumns.map_file(str(tmp_path / "missing.bin"), "x") is None
+
+    def test_pickled_mapped_columns_map_again(self, manager, tmp_path):
+        """Test mapped columns pickle by reference to their file"""
+        path = str(tmp_path / "columns.bin")
+        manager._listing_columns.export(path, "source-1")
+        restored = pickle.loads(pickle.dumps(ListingColumns.map_file(path, "source-1")))
+        assert isinstance(restored.codes["area"], np.memmap)
+
+    def test_managers_share_columns_file(self, temp_data_dir, tmp_path):
+        """Test managers export the columns once and map them afterwards"""
+        path = str(tmp_path / "columns.bin")
+        first = RealEstateDataManager(temp_data_dir, columns_path=path)
+        assert isinstance(first._listing_columns.lower["price"], np.memmap)
+
+        second = RealEstateDataManager(temp_data_dir, columns_path=path)
+        with patch.object(ListingColumns, "build", side_effect=AssertionError):
+            columns = second._listing_columns
+        assert columns.path == path
+        results = second.filter_properties(PropertyFilter(min_price=400000))
+        assert [p["id"] for p in results] == ["TEST001"]
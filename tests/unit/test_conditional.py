@@ -0,0 +1,53 @@
+"""
+Unit tests for conditional.py - content hashes and conditional read URIs
+"""
+
+from conditional import ContentHashes, content_hash, split_conditional
+
+
+class TestConditional:
+    """Test hashing, URI parsing and the hash cache"""
+
+    def test_content_hash(self):
+        assert content_hash('{"a":1}') == content_hash(b'{"a":1}')
+        assert content_hash('{"a":1}') != content_hash('{"a":2}')
+        assert len(content_hash("")) == 32
+
+    def test_split_conditional(self):
+        assert split_conditional("realestate://all-properties/if-none-match/abc") == (
+            "realestate://all-properties",
+            "abc",
+        )
+        assert split_conditional("realestate://market/area/Downtown") == (
+            "realestate://market/area/Downtown",
+            None,
+        )
+        for uri in (
+            "realestate://all-properties/if-none-match/",
+            "realestate://all-properties/if-none-match/abc/page/x",
+        ):
+            assert split_conditional(uri) == (uri, None)
+
+    def test_hash_served_at_its_version_only(self):
+        hashes = ContentHashes()
+        hashes.record("r", 1, "h1")
+        assert hashes.get("r", 1) == "h1"
+        assert hashes.get("r", 2) is None
+        assert hashes.get("other", 1) is None
+
+    def test_older_version_does_not_replace_newer(self):
+        hashes = ContentHashes()
+        hashes.record("r", 2, "new")
+        hashes.record("r", 1, "old")
+        assert hashes.get("r", 2) == "new"
+        hashes.record("r", 3, "newer")
+        assert hashes.get("r", 3) == "newer"
+
+    def test_least_recently_used_dropped(self):
+        hashes = ContentHashes(max_entries=2)
+        hashes.record("a", 0, "ha")
+        hashes.record("b", 0, "hb")
+        hashes.get("a", 0)
+        hashes.record("c", 0, "hc")
+        assert hashes.get("b", 0) is None
+        assert (hashes.get("a", 0), hashes.get("c", 0)) == ("ha", "hc")
@@ -0,0 +1,80 @@
+"""
+Unit tests for json_stream.py - streaming JSON ingestion
+"""
+
+import io
+import json
+
+import pytest
+
+import json_stream
+from utils import RealEstateDataManager
+
+DOCUMENT = {
+    "version": 3,
+    "active_listings": [
+        {"id": "A", "price": 123456789, "features": ["Pool", "Garage"]},
+        {"id": "B", "price": 1.5e-3, "open_house": {"scheduled": False}},
+        [],
+        'text with "quotes", commas, ] and }',
+        12345678901234567890,
+        -2.5e-7,
+        None,
+    ],
+    "summary": {"nested": [1, 2, {"deep": True}]},
+    "empty": [],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_matches_json_load(chunk_size, indent):
+    """Test streaming parses exactly what json.load does at any chunk size"""
+    text = json.dumps(DOCUMENT, indent=indent)
+    result = json_stream.load(
+        io.StringIO(text), ("active_listings", "empty"), chunk_size=chunk_size
+    )
+    assert result == json.loads(text)
+
+
+def test_transform_applies_to_streamed_items():
+    """Test only elements of the streamed arrays are transformed"""
+    text = json.dumps({"items": [1, 2, 3], "other": [4, 5]})
+    result = json_stream.load(io.StringIO(text), ("items",), transform=str)
+    assert result == {"items": ["1", "2", "3"], "other": [4, 5]}
+
+
+@pytest.mark.parametrize(
+    "text", ["", "[1, 2]", '{"items": [1, 2}', '{"items": [1 2]}', '{"a": 1,}']
+)
+def test_malformed_input_raises(text):
+    """Test malformed documents raise JSONDecodeError like json.load"""
+    with pytest.raises(json.JSONDecodeError):
+        json_stream.load(io.StringIO(text), ("items",), chunk_size=4)
+
+
+def test_malformed_element_raises_without_reading_on():
+    """Test an error before the end of the window is not retried with more text"""
+    items = ",".join(json.dumps({"id": i}) for i in range(10000))
+    fp = io.StringIO('{"items": [{"id": x}, ' + items + "]}")
+    with pytest.raises(json.JSONDecodeError, match="Expecting value"):
+        json_stream.load(fp, ("items",), chunk_size=64)
+    assert fp.tell() == 64
+
+
+def test_value_longer_than_limit_raises():
+    """Test an unterminated string stops once it passes max_value_size"""
+    fp = io.StringIO('{"items": ["' + "a" * 100000 + "]}")
+    with pytest.raises(json.JSONDecodeError, match="longer than 1000"):
+        json_stream.load(fp, ("items",), chunk_size=64, max_value_size=1000)
+    assert fp.tell() < 2000
+
+
+def test_manager_streams_large_files(temp_data_dir):
+    """Test the manager's streaming path loads the same data"""
+    streamed = RealEstateDataManager(data_dir=temp_data_dir, streaming_threshold=0)
+    loaded = RealEstateDataManager(data_dir=temp_data_dir)
+
+    assert streamed.get_all_properties() == loaded.get_all_properties()
+    assert streamed.get_recent_sales() == loaded.get_recent_sales()
+    assert streamed.get_property_by_id("TEST001")["id"] == "TEST001"
@@ -0,0 +1,62 @@
+"""
+Unit tests for pagination.py - cursor pagination
+"""
+
+import pytest
+
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Pager
+
+
+class TestPager:
+    """Test pages and cursors of a result list"""
+
+    def test_cursors_list_every_result_once(self):
+        results = list(range(7))
+        pager = Pager(version=3, query=("all",))
+        seen, cursor = [], None
+        while True:
+            page = pager.slice(results, limit=3, cursor=cursor)
+            assert page.total_count == 7
+            seen.extend(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert seen == results
+
+    def test_default_and_maximum_page_size(self):
+        pager = Pager(version=0)
+        results = list(range(DEFAULT_PAGE_SIZE + 1))
+        assert len(pager.slice(results).items) == DEFAULT_PAGE_SIZE
+        assert pager.slice(results, limit=0).items == []
+        assert pager.slice(results, limit=0).next_cursor is None
+        with pytest.raises(ValueError):
+            pager.slice(results, limit=MAX_PAGE_SIZE + 1)
+        with pytest.raises(ValueError):
+            pager.slice(results, limit=-1)
+
+    def test_cursor_tied_to_version_and_query(self):
+        cursor = Pager(version=1, query=("a",)).cursor(2)
+        assert Pager(version=1, query=("a",)).start(cursor) == 2
+        with pytest.raises(ValueError, match="expired"):
+            Pager(version=2, query=("a",)).start(cursor)
+        with pytest.raises(ValueError, match="different query"):
+            Pager(version=1, query=("b",)).start(cursor)
+        for bogus in ["bogus", "!!!", Pager(0).cursor(0)[:-2]]:
+            with pytest.raises(ValueError):
+                Pager(version=1, query=("a",)).start(bogus)
+
+    def test_count_skipped_for_short_pages(self):
+        pager = Pager(version=0)
+
+        def fetch(offset, size):
+            return list(range(10))[offset : offset + size]
+
+        def count():
+            raise AssertionError("count not needed")
+
+        page = pager.page(fetch, count, limit=4, offset=8)
+        assert (page.items, page.total_count, page.next_cursor) == ([8, 9], 10, None)
+        page = pager.page(fetch, lambda: 10, limit=4, offset=20)
+        assert (page.items, page.total_count) == ([], 10)
+        with pytest.raises(ValueError):
+            pager.page(fetch, count, cursor=pager.cursor(4), offset=4)
@@ -0,0 +1,343 @@
+"""
+Unit tests for planner.py - selectivity-based filter planning
+"""
+
+import pickle
+import random
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+
+from planner import RANGE_INDEX_FIELDS, ColumnStatistics, FilterPlan
+from range_index import RangeIndex
+from utils import DataSnapshot, PropertyFilter
+
+
+def random_order(rng, filters):
+    """The filter with a random sort order and page"""
+    return replace(
+        filters,
+        sort_by=rng.choice(RANGE_INDEX_FIELDS),
+        descending=rng.random() < 0.5,
+        offset=rng.choice([0, 0, 3, 50]),
+        limit=rng.choice([None, 0, 1, 10, 100]),
+    )
+
+
+def sorted_reference(listings, sort_by, descending):
+    """Listings ordered by a field, equal values in listing order, listings
+    without an orderable value last"""
+
+    def orderable(value):
+        if sort_by == "list_date":
+            return isinstance(value, str)
+        return isinstance(value, (int, float)) and value == value
+
+    present = [p for p in listings if orderable(p.get(sort_by))]
+    present.sort(key=lambda p: p[sort_by], reverse=descending)
+    return present + [p for p in listings if not orderable(p.get(sort_by))]
+
+
+def page_reference(snapshot, listings, filters):
+    """Expected filter_properties result, from a scan and a full sort"""
+    matching = [p for p in listings if snapshot._matches_filter(p, filters)]
+    if filters.sort_by:
+        matching = sorted_reference(matching, filters.sort_by, filters.descending)
+    end = None if filters.limit is None else filters.offset + filters.limit
+    return matching[filters.offset : end]
+
+
+@pytest.fixture
+def snapshot(random_listings):
+    return DataSnapshot({"properties": {"active_listings": random_listings(2000)}})
+
+
+class TestPlannerResults:
+    """Test every plan returns what _matches_filter selects"""
+
+    @pytest.mark.parametrize("nan", [False, True])
+    def test_random_filters_match_scan(self, nan, random_listings, random_filter):
+        listings = random_listings(2000, nan=nan)
+        snapshot = DataSnapshot({"properties": {"active_listings": listings}})
+        rng = random.Random(11)
+        paths = set()
+        for _ in range(300):
+            filters = random_filter(rng)
+            expected = [p for p in listings if snapshot._matches_filter(p, filters)]
+            results, plan = snapshot.explain_filter(filters)
+            assert results == expected, plan
+            assert plan["actual_rows"]["result"] == len(expected)
+            paths.add(plan["access_path"])
+        # NaN prices keep the columnar engine out, leaving the other paths
+        assert len(paths) >= 3
+
+    @pytest.mark.parametrize(
+        "path", ["full_scan", "area_index", "property_type_index", "price_index"]
+    )
+    def test_each_access_path_matches_scan(self, snapshot, path, random_filter):
+        planner = snapshot._filter_planner
+        listings = snapshot.get_all_properties()
+        rng = random.Random(5)
+        checked = 0
+        for _ in range(200):
+            filters = random_filter(rng)
+            options = {
+                "full_scan": True,
+                "area_index": filters.areas,
+                "property_type_index": filters.property_types,
+                "price_index": filters.min_price or filters.max_price,
+            }
+            if not options[path]:
+                continue
+            plan = planner.plan(filters)
+            forced = plan._replace(
+                access_path=path,
+                index_predicates=[
+                    p for p in planner.predicates(filters) if _path_field(p) == path
+                ],
+            )
+            forced = forced._replace(
+                residual=[
+                    p
+                    for p in planner.predicates(filters)
+                    if p.description
+                    not in {q.description for q in forced.index_predicates}
+                ]
+            )
+            results, _ = planner.run(
+                forced, filters, listings, None, snapshot._feature_index
+            )
+            assert results == [
+                p for p in listings if snapshot._matches_filter(p, filters)
+            ]
+            checked += 1
+        assert checked
+
+    @pytest.mark.parametrize("nan", [False, True])
+    def test_random_sorted_pages_match_reference(
+        self, nan, random_listings, random_filter
+    ):
+        listings = random_listings(2000, nan=nan)
+        snapshot = DataSnapshot({"properties": {"active_listings": listings}})
+        rng = random.Random(17)
+        orders = set()
+        for _ in range(300):
+            filters = random_order(rng, random_filter(rng))
+            results, plan = snapshot.explain_filter(filters)
+            assert results == page_reference(snapshot, listings, filters), plan
+            orders.add(plan["order"])
+        assert orders == {"index_order", "sort"}
+
+    def test_index_walk_matches_sort(self, snapshot, random_filter):
+        planner = snapshot._filter_planner
+        listings = snapshot.get_all_properties()
+        rng = random.Random(23)
+        for _ in range(200):
+            filters = random_order(rng, random_filter(rng))
+            predicates = planner.predicates(filters)
+            by_field = {}
+            for predicate in predicates:
+                by_field.setdefault(predicate.field, []).append(predicate)
+            walk = planner._ordered_plan(filters, predicates, by_field, 1.0)
+            scan = FilterPlan("full_scan", [], predicates, 0, 0, 0, 0, "sort")
+            expected = page_reference(snapshot, listings, filters)
+            assert planner.run(walk, filters, listings)[0] == expected
+            assert planner.run(scan, filters, listings)[0] == expected
+
+    def test_without_numpy(self, random_listings):
+        snapshot = DataSnapshot(
+            {"properties": {"active_listings": random_listings(500)}}
+        )
+        with patch("columnar.np", None):
+            filters = PropertyFilter(min_price=300000, areas=["Hills"])
+            results, plan = snapshot.explain_filter(filters)
+        assert plan["access_path"] != "columnar_scan"
+        assert results == [
+            p
+            for p in snapshot.get_all_properties()
+            if snapshot._matches_filter(p, filters)
+        ]
+
+    def test_empty_listings(self):
+        snapshot = DataSnapshot({"properties": {"active_listings": []}})
+        results, plan = snapshot.explain_filter(PropertyFilter(min_price=1))
+        assert results == []
+        assert plan["actual_rows"] == {"candidates": 0, "result": 0}
+
+
+class TestPlanChoice:
+    """Test the planner picks the cheapest access path"""
+
+    def test_selective_area_uses_area_index(self, snapshot):
+        listings = snapshot.get_all_properties() + [
+            {"id": "RARE", "area": "Rare", "price": 1}
+        ]
+        snapshot = DataSnapshot({"properties": {"active_listings": listings}})
+        with patch("columnar.np", None):
+            results, plan = snapshot.explain_filter(PropertyFilter(areas=["Rare"]))
+        assert plan["access_path"] == "area_index"
+        assert plan["actual_rows"] == {"candidates": 1, "result": 1}
+        assert [p["id"] for p in results] == ["RARE"]
+
+    def test_narrow_price_range_uses_price_index(self, snapshot):
+        with patch("columnar.np", None):
+            _, plan = snapshot.explain_filter(
+                PropertyFilter(min_price=1000000, max_price=1010000)
+            )
+        assert plan["access_path"] == "price_index"
+        assert plan["index_predicates"] == ["price >= 1000000", "price <= 1010000"]
+
+    def test_broad_filter_uses_columns(self, snapshot):
+        _, plan = snapshot.explain_filter(
+            PropertyFilter(min_price=200000, min_bedrooms=2)
+        )
+        assert plan["access_path"] == "columnar_scan"
+
+    def test_no_predicates_returns_everything(self, snapshot):
+        results, plan = snapshot.explain_filter(PropertyFilter())
+        assert plan["access_path"] == "full_scan"
+        assert results == snapshot.get_all_properties()
+
+    def test_residual_predicates_most_selective_first(self, snapshot):
+        plan = snapshot._filter_planner.plan(
+            PropertyFilter(min_bedrooms=2, min_sqft=4500, max_bathrooms=2)
+        )
+        assert plan.access_path == "square_feet_index"
+        assert [p.field for p in plan.residual] == ["bathrooms", "bedrooms"]
+
+    def test_small_sorted_page_walks_index(self, snapshot):
+        results, plan = snapshot.explain_filter(
+            PropertyFilter(min_bedrooms=2, sort_by="price", limit=10)
+        )
+        assert plan["access_path"] == "price_index"
+        assert plan["order"] == "index_order"
+        # The walk stops once the page is full
+        assert plan["actual_rows"]["candidates"] < 40
+        prices = [p["price"] for p in results]
+        assert len(prices) == 10 and prices == sorted(prices)
+
+    def test_integers_beyond_float_precision_sort_exactly(self, random_listings):
+        listings = random_listings(2000)
+        listings[7]["price"] = 2**53 + 1
+        listings[8]["price"] = 2**53
+        listings[9]["price"] = -(2**53) - 1
+        snapshot = DataSnapshot({"properties": {"active_listings": listings}})
+
+        results, plan = snapshot.explain_filter(
+            PropertyFilter(sort_by="price", descending=True, limit=2)
+        )
+        assert plan["order"] == "index_order"
+        assert [p["id"] for p in results] == ["P7", "P8"]
+        cheapest = snapshot.filter_properties(PropertyFilter(sort_by="price", limit=1))
+        assert cheapest[0]["id"] == "P9"
+
+        for filters in (
+            PropertyFilter(sort_by="price", descending=True, limit=5),
+            PropertyFilter(min_bedrooms=2, sort_by="price", descending=True),
+            PropertyFilter(min_price=2**53, sort_by="price"),
+            PropertyFilter(areas=["Hills"], sort_by="price", descending=True),
+        ):
+            results, plan = snapshot.explain_filter(filters)
+            assert results == page_reference(snapshot, listings, filters), plan
+
+    def test_newest_first_within_date_range(self, snapshot):
+        results, plan = snapshot.explain_filter(
+            PropertyFilter(
+                min_list_date="2024-06-01",
+                max_list_date="2024-06-30",
+                sort_by="list_date",
+                descending=True,
+            )
+        )
+        assert plan["access_path"] == "list_date_index"
+        dates = [p["list_date"] for p in results]
+        assert dates and dates == sorted(dates, reverse=True)
+        assert all("2024-06-01" <= date <= "2024-06-30" for date in dates)
+
+    def test_invalid_order_rejected(self):
+        with pytest.raises(ValueError, match="Cannot sort by 'area'"):
+            PropertyFilter(sort_by="area")
+        with pytest.raises(ValueError):
+            PropertyFilter(limit=-1)
+
+    def test_estimates_close_to_actual(self, snapshot):
+        _, plan = snapshot.explain_filter(
+            PropertyFilter(min_price=500000, max_price=1500000)
+        )
+        actual = plan["actual_rows"]["result"]
+        assert abs(plan["estimated_rows"]["result"] - actual) < 0.05 * 2000
+
+
+class TestStatistics:
+    """Test column statistics and the planner's indexes"""
+
+    def test_histogram_selectivity(self):
+        listings = [{"price": value} for value in range(1000)] + [{}] * 100
+        stats = ColumnStatistics.from_index(RangeIndex.build(listings, "price"))
+        assert stats.rows == 1100
+        assert stats.distinct == 1000
+        assert stats.selectivity(500, True) == pytest.approx(500 / 1100, abs=0.01)
+        assert stats.selectivity(249, False) == pytest.approx(250 / 1100, abs=0.01)
+        # Missing values pass a non-positive lower bound, never an upper one
+        assert stats.selectivity(-5, True) == pytest.approx(1.0)
+        assert stats.selectivity(10**9, False) == pytest.approx(1000 / 1100)
+
+    def test_range_index_keeps_unordered_rows_apart(self):
+        listings = [{"price": 3}, {}, {"price": float("nan")}, {"price": 1}]
+        index = RangeIndex.build(listings, "price")
+        assert list(index.values) == [1.0, 3.0]
+        assert list(index.rows) == [3, 0]
+        assert list(index.unordered) == [1, 2]
+        assert list(index.rows_between(2, None)) == [0]
+
+        big = RangeIndex.build([{"price": 2**53 + 1}, {"price": 2**53}], "price")
+        assert list(index.unordered) == [1, 2] and not big.unordered
+        assert list(big.iter_rows(descending=True)) == [0, 1]
+        assert list(big.rows_between(2**53 + 1)) == [0]
+
+    def test_text_index_orders_strings(self):
+        listings = [
+            {"list_date": "2024-02-01"},
+            {"list_date": 20240101},
+            {"list_date": "2024-01-15"},
+            {"list_date": "2024-02-01"},
+        ]
+        index = RangeIndex.build(listings, "list_date", text=True)
+        assert index.values == ["2024-01-15", "2024-02-01", "2024-02-01"]
+        assert list(index.unordered) == [1]
+        assert list(index.rows_between("2024-01-20")) == [0, 3]
+
+    def test_iter_rows_keeps_row_order_of_equal_values(self):
+        listings = [{"price": value} for value in [2, 1, 2, 3, 1, None]]
+        index = RangeIndex.build(listings, "price")
+        assert list(index.iter_rows()) == [1, 4, 0, 2, 3]
+        assert list(index.iter_rows(descending=True)) == [3, 0, 2, 1, 4]
+        assert list(index.iter_rows(2, 3, descending=True)) == [3, 0, 2]
+        for descending in (False, True):
+            key = index.sort_key(descending)
+            assert sorted(range(6), key=key) == list(
+                index.iter_rows(descending=descending)
+            ) + list(index.unordered)
+
+    def test_planner_pickles(self, snapshot):
+        planner = pickle.loads(pickle.dumps(snapshot._filter_planner))
+        filters = PropertyFilter(areas=["Hills"], min_price=500000)
+        plan = planner.plan(filters)
+        results, _ = planner.run(
+            plan,
+            filters,
+            snapshot.get_all_properties(),
+            snapshot._listing_columns,
+            snapshot._feature_index,
+        )
+        assert results == snapshot.filter_properties(filters)
+
+
+def _path_field(predicate):
+    """Access path resolving a predicate's field"""
+    return {
+        "area": "area_index",
+        "property_type": "property_type_index",
+        "price": "price_index",
+    }.get(predicate.field)
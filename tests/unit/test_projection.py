@@ -0,0 +1,87 @@
+"""
+Unit tests for projection.py - field sets and record projection
+"""
+
+import pytest
+
+from projection import FIELD_SETS, KIND_DATASETS, parse_fields, project, project_all
+from records import Listing, RecordBuilder
+from utils import DataSnapshot, RealEstateDataManager
+
+DATA = DataSnapshot(
+    {
+        "properties": {
+            "active_listings": [
+                {"id": "P1", "address": "1 Main St", "price": 1},
+                {"id": "P2", "description": "Bright", "solar_panels": True},
+            ]
+        },
+        "agents": {"agents": [{"id": "A1", "name": "Ann"}]},
+        "clients": {"clients": [{"id": "C1"}]},
+    }
+)
+
+
+class TestParseFields:
+    """Test resolving a fields parameter"""
+
+    def test_field_sets_and_names(self):
+        summary = FIELD_SETS["property"]["summary"]
+        assert parse_fields("property", "summary", DATA) == summary
+        assert parse_fields("property", "summary, description", DATA) == (
+            *summary,
+            "description",
+        )
+        assert parse_fields("property", "price,id,price", DATA) == ("price", "id")
+        assert parse_fields("agent", "card", DATA)[0] == "id"
+
+    def test_full_keeps_every_field(self):
+        assert parse_fields("property", None, DATA) is None
+        assert parse_fields("property", "full", DATA) is None
+        assert parse_fields("client", "id,full", DATA) is None
+
+    def test_empty_fields_rejected(self):
+        with pytest.raises(ValueError):
+            parse_fields("property", "", DATA)
+        with pytest.raises(ValueError):
+            parse_fields("property", " , ", DATA)
+
+    def test_unknown_fields_rejected(self):
+        for fields in ("nope", "sumary", "id,nope", "summary,relevance_score"):
+            with pytest.raises(ValueError, match="Unknown property field"):
+                parse_fields("property", fields, DATA)
+        with pytest.raises(ValueError, match="summary, card, full"):
+            parse_fields("agent", "address", DATA)
+
+    def test_fields_come_from_the_data(self):
+        assert parse_fields("property", "solar_panels", DATA) == ("solar_panels",)
+        with pytest.raises(ValueError, match="id, address, price, description"):
+            parse_fields("property", "year_built", DATA)
+
+    def test_field_sets_use_data_fields(self):
+        data = RealEstateDataManager().snapshot()
+        for kind, sets in FIELD_SETS.items():
+            known = data.get_record_fields(KIND_DATASETS[kind])
+            for fields in sets.values():
+                assert set(fields) <= set(known)
+
+
+class TestProject:
+    """Test projecting records and dicts"""
+
+    def test_project_records_and_dicts(self):
+        source = {"id": "P1", "price": 1, "images": ["a.jpg"], "open_house": {}}
+        record = RecordBuilder(Listing)(source)
+        for value in (source, record):
+            assert project(value, ("id", "price", "missing")) == {
+                "id": "P1",
+                "price": 1,
+            }
+            assert project(value, None) is value
+        assert project(None, ("id",)) is None
+
+    def test_project_all(self):
+        records = [{"id": "P1", "price": 1}, {"id": "P2"}]
+        assert project_all(records, ("price",)) == [{"price": 1}, {}]
+        assert project_all(records, None) is records
+        assert project_all(iter(records), None) == records
@@ -0,0 +1,85 @@
+"""
+Unit tests for records.py - compact record types
+"""
+
+import json
+import pickle
+
+import pytest
+
+from benchmarks.synthetic import generate
+from records import Listing, Record, RecordBuilder, Sale, jsonable
+
+
+@pytest.fixture
+def listings():
+    """Synthetic listings as parsed JSON"""
+    return json.loads(json.dumps(generate(50)["listings"]))
+
+
+class TestRecords:
+    """Test records behave like the dicts they were built from"""
+
+    def test_mapping_interface(self, listings):
+        """Test lookups, key order and missing keys match the dict"""
+        raw = listings[0]
+        record = RecordBuilder(Listing)(raw)
+
+        assert isinstance(record, Listing)
+        assert list(record) == list(raw)
+        assert len(record) == len(raw)
+        assert record["price"] == raw["price"]
+        assert record.get("missing") is None
+        assert record.get("missing", 0) == 0
+        assert "area" in record and "missing" not in record
+        with pytest.raises(KeyError):
+            record["missing"]
+        with pytest.raises(TypeError):
+            record["price"] = 1
+
+    def test_equal_and_serialize_like_dicts(self, listings):
+        """Test records compare equal to and serialize as their source dicts"""
+        build = RecordBuilder(Listing)
+        records = [build(raw) for raw in listings]
+
+        assert records == listings
+        assert records[0] != listings[1]
+        assert json.dumps(records, default=jsonable) == json.dumps(listings)
+        assert dict(records[0], score=1)["score"] == 1
+        assert isinstance(records[0]["open_house"], Record)
+        assert records[0].to_dict() == listings[0]
+
+    def test_shared_layouts_and_strings(self, listings):
+        """Test records share key layouts and repeated strings"""
+        build = RecordBuilder(Listing)
+        first, second = build(listings[0]), build(dict(listings[1]))
+
+        assert first._layout is second._layout
+        assert first["city"] is second["city"]
+        features = [f for raw in listings for f in build(raw)["features"]]
+        assert len({id(f) for f in features}) == len(set(features))
+
+        reordered = build(dict(reversed(listings[2].items())))
+        assert reordered._layout is not first._layout
+        assert list(reordered) == list(reversed(listings[2]))
+
+    def test_non_objects_pass_through(self):
+        """Test values other than objects are returned unchanged"""
+        build = RecordBuilder(Sale)
+        assert build("text") == "text"
+        assert build(None) is None
+
+    def test_pickle_round_trip(self, listings):
+        """Test records pickle with their type and shared layout"""
+        build = RecordBuilder(Listing)
+        records = [build(raw) for raw in listings[:2]]
+
+        restored = pickle.loads(pickle.dumps(records, protocol=5))
+        assert restored == records
+        assert type(restored[0]) is Listing
+        assert restored[0]._layout is restored[1]._layout
+
+    def test_jsonable_rejects_other_objects(self):
+        """Test the json default hook still rejects unknown types"""
+        with pytest.raises(TypeError):
+            json.dumps({"value": object()}, default=jsonable)
@@ -0,0 +1,87 @@
+"""
+Unit tests for response_cache.py - encoded responses kept per dataset version
+"""
+
+import json
+from types import SimpleNamespace
+
+from response_cache import ResponseCache
+
+
+def snapshot(**versions):
+    """Stand-in snapshot with the given dataset versions"""
+    return SimpleNamespace(dataset_versions={"areas": 0, "agents": 0, **versions})
+
+
+def building(value):
+    """build callable that records how often it ran"""
+
+    def build(snapshot):
+        build.calls += 1
+        return {"value": value, "areas": snapshot.dataset_versions["areas"]}
+
+    build.calls = 0
+    return build
+
+
+class TestResponseCache:
+    """Test lookups, versions, formats and warming"""
+
+    def test_repeated_reads_encode_once(self):
+        cache = ResponseCache()
+        build = building("x")
+        first = cache.get(snapshot(), "r", ("areas",), build)
+        assert cache.get(snapshot(), "r", ("areas",), build) is first
+        assert json.loads(first) == {"value": "x", "areas": 0}
+        assert build.calls == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["builds"]) == (1, 1, 1)
+        assert stats["bytes"] == len(first)
+
+    def test_rebuilt_when_a_dependency_changes(self):
+        cache = ResponseCache()
+        build = building("x")
+        cache.get(snapshot(), "r", ("areas",), build)
+        cache.get(snapshot(agents=1), "r", ("areas",), build)
+        assert build.calls == 1
+
+        text = cache.get(snapshot(areas=1), "r", ("areas",), build)
+        assert json.loads(text)["areas"] == 1
+        assert build.calls == 2
+
+    def test_formats_cached_separately(self):
+        cache = ResponseCache()
+        build = building("x")
+        compact = cache.get(snapshot(), "r", ("areas",), build)
+        pretty = cache.get(snapshot(), "r", ("areas",), build, pretty=True)
+        assert "\n" not in compact and "\n" in pretty
+        assert cache.get(snapshot(), "r", ("areas",), build, pretty=False) is compact
+        assert cache.stats()["responses"] == 2
+
+    def test_warm_rebuilds_stale_responses(self):
+        cache = ResponseCache()
+        areas, agents = building("areas"), building("agents")
+        cache.get(snapshot(), "a", ("areas",), areas)
+        cache.get(snapshot(), "b", ("agents",), agents)
+
+        cache.warm(snapshot(areas=1))
+        assert (areas.calls, agents.calls) == (2, 1)
+        text = cache.get(snapshot(areas=1), "a", ("areas",), areas)
+        assert json.loads(text)["areas"] == 1
+        assert areas.calls == 2
+
+    def test_older_build_does_not_replace_newer(self):
+        cache = ResponseCache()
+        cache.get(snapshot(areas=2), "r", ("areas",), building("new"))
+        cache.get(snapshot(areas=1), "r", ("areas",), building("old"))
+        text = cache.get(snapshot(areas=2), "r", ("areas",), building("other"))
+        assert json.loads(text)["value"] == "new"
+
+    def test_clear(self):
+        cache = ResponseCache()
+        build = building("x")
+        cache.get(snapshot(), "r", ("areas",), build)
+        cache.clear()
+        cache.warm(snapshot(areas=1))
+        assert cache.stats()["responses"] == 0
+        assert build.calls == 1
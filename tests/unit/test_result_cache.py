@@ -0,0 +1,101 @@
+"""
+Unit tests for result_cache.py - versioned LRU cache of query results
+"""
+
+from result_cache import ResultCache
+
+
+def computing(result):
+    """compute callable that records how often it ran"""
+
+    def compute():
+        compute.calls += 1
+        return list(result)
+
+    compute.calls = 0
+    return compute
+
+
+class TestResultCache:
+    """Test lookups, versions and eviction"""
+
+    def test_hit_after_miss(self):
+        cache = ResultCache()
+        compute = computing([1, 2])
+        assert cache.get_or_compute("q", 0, compute) == [1, 2]
+        assert cache.get_or_compute("q", 0, compute) == [1, 2]
+        assert compute.calls == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_callers_get_their_own_list(self):
+        cache = ResultCache()
+        first = cache.get_or_compute("q", 0, computing([1, 2]))
+        first.append(3)
+        assert cache.get_or_compute("q", 0, computing([])) == [1, 2]
+
+    def test_other_version_is_stale(self):
+        cache = ResultCache()
+        cache.get_or_compute("q", 0, computing(["old"]))
+        assert cache.get_or_compute("q", 1, computing(["new"])) == ["new"]
+        assert cache.get_or_compute("q", 1, computing([])) == ["new"]
+        stats = cache.stats()
+        assert stats["stale"] == 1
+        assert stats["entries"] == 1
+
+    def test_older_version_does_not_replace_newer(self):
+        cache = ResultCache()
+
+        def late():
+            # A slow query on an old snapshot finishing after a newer result
+            cache._entries["q"] = (2, ["new"])
+            return ["old"]
+
+        assert cache.get_or_compute("q", 1, late) == ["old"]
+        assert cache.get_or_compute("q", 2, computing([])) == ["new"]
+
+    def test_least_recently_used_evicted_first(self):
+        cache = ResultCache(max_entries=2)
+        cache.get_or_compute("a", 0, computing(["a"]))
+        cache.get_or_compute("b", 0, computing(["b"]))
+        cache.get_or_compute("a", 0, computing([]))
+        cache.get_or_compute("c", 0, computing(["c"]))
+
+        compute = computing(["b2"])
+        assert cache.get_or_compute("a", 0, computing([])) == ["a"]
+        assert cache.get_or_compute("b", 0, compute) == ["b2"]
+        assert compute.calls == 1
+        assert cache.stats()["evictions"] == 2
+
+    def test_row_limit(self):
+        cache = ResultCache(max_rows=5)
+        cache.get_or_compute("a", 0, computing(range(3)))
+        cache.get_or_compute("b", 0, computing(range(3)))
+        stats = cache.stats()
+        assert (stats["entries"], stats["rows"], stats["evictions"]) == (1, 3, 1)
+
+        # Results over the limit are returned but not kept
+        assert cache.get_or_compute("c", 0, computing(range(6))) == list(range(6))
+        assert cache.stats()["entries"] == 1
+
+    def test_rows_of_nested_reports_count(self):
+        cache = ResultCache(max_rows=5)
+        report = {
+            "area": "Downtown",
+            "active_properties": {"count": 4, "properties": [1, 2, 3, 4]},
+            "recent_sales": {"count": 2, "sales": [5, 6]},
+        }
+        assert cache.get_or_compute("report", 0, lambda: report) == report
+        assert cache.stats()["entries"] == 0
+
+        cache.get_or_compute("small", 0, lambda: {"sales": {"sales": [1, 2]}})
+        assert cache.stats()["rows"] == 2
+
+    def test_disabled(self):
+        cache = ResultCache(max_entries=0)
+        compute = computing([1])
+        cache.get_or_compute("q", 0, compute)
+        cache.get_or_compute("q", 0, compute)
+        assert compute.calls == 2
+        assert cache.stats()["entries"] == 0
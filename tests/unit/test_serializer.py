@@ -0,0 +1,80 @@
+"""
+Unit tests for serializer.py - the shared response encoder
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+import serializer
+from records import Listing, RecordBuilder
+from serializer import dumps
+
+VALUE = {
+    "id": "P1",
+    "price": 500000,
+    "bathrooms": 2.5,
+    "features": ["Pool", "Café"],
+    "open_house": {"date": "2024-02-01"},
+    "empty": None,
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request):
+    """Run a test with orjson, if installed, and with the json module"""
+    if request.param == "orjson":
+        if serializer.orjson is None:
+            pytest.skip("orjson is not installed")
+        yield
+    else:
+        with patch("serializer.orjson", None):
+            yield
+
+
+class TestDumps:
+    """Test encoding in both formats with both encoders"""
+
+    def test_compact_by_default(self, encoder):
+        text = dumps(VALUE)
+        assert json.loads(text) == VALUE
+        assert "\n" not in text and ", " not in text and '": ' not in text
+        assert "Café" in text
+
+    def test_pretty_per_call(self, encoder):
+        text = dumps(VALUE, pretty=True)
+        assert json.loads(text) == VALUE
+        assert text.startswith('{\n  "id": "P1",')
+
+    def test_records_and_tuples(self, encoder):
+        record = RecordBuilder(Listing)(VALUE)
+        assert json.loads(dumps({"properties": [record], "pair": (1, 2)})) == {
+            "properties": [VALUE],
+            "pair": [1, 2],
+        }
+
+    def test_non_string_keys_and_big_integers(self, encoder):
+        assert json.loads(dumps({1: "a"})) == {"1": "a"}
+        assert json.loads(dumps({"n": 2**70})) == {"n": 2**70}
+
+    def test_unserializable_values_raise(self, encoder):
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
+
+
+class TestConfigure:
+    """Test the server-wide default format"""
+
+    def test_configure_default_format(self):
+        try:
+            serializer.configure("pretty")
+            assert "\n" in dumps(VALUE)
+            assert "\n" not in dumps(VALUE, pretty=False)
+        finally:
+            serializer.configure("compact")
+        assert "\n" not in dumps(VALUE)
+
+    def test_unknown_format_rejected(self):
+        with pytest.raises(ValueError):
+            serializer.configure("yaml")
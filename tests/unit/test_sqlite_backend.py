@@ -0,0 +1,290 @@
+"""
+Unit tests for sqlite_backend.py - SQLite storage backend
+"""
+
+import json
+import os
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+import utils
+from records import jsonable
+from sqlite_backend import SQLiteDataManager, import_json
+from utils import PropertyFilter, RealEstateDataManager
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+
+
+def serialized(value):
+    """JSON text of a query result, as tools return it"""
+    return json.dumps(value, default=jsonable)
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Database imported from the repository's data directory"""
+    path = str(tmp_path / "real_estate.db")
+    import_json(DATA_DIR, path)
+    return path
+
+
+@pytest.fixture
+def managers(database):
+    """JSON-backed and SQLite-backed managers over the same data"""
+    return RealEstateDataManager(DATA_DIR), SQLiteDataManager(database)
+
+
+class TestImport:
+    """Test building the database from JSON files"""
+
+    def test_import_counts_records(self, database, managers):
+        json_manager, _ = managers
+        connection = sqlite3.connect(database)
+        counts = {
+            table: connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            for table in ("properties", "agents", "clients", "sales")
+        }
+        assert counts == {
+            "properties": len(json_manager.get_all_properties()),
+            "agents": len(json_manager.get_all_agents()),
+            "clients": len(json_manager.get_all_clients()),
+            "sales": len(json_manager.get_recent_sales()),
+        }
+
+    def test_database_uses_wal(self, database):
+        connection = sqlite3.connect(database)
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_indexes_exist(self, database):
+        connection = sqlite3.connect(database)
+        indexes = {
+            name
+            for (name,) in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        assert {
+            "properties_id",
+            "properties_area",
+            "properties_agent",
+            "properties_price",
+            "properties_bedrooms",
+            "properties_square_feet",
+            "properties_list_date",
+            "properties_postings_term",
+            "agents_postings_term",
+        } <= indexes
+
+    def test_missing_files_import_empty(self, tmp_path):
+        path = str(tmp_path / "empty.db")
+        report = import_json(str(tmp_path / "missing"), path)
+        assert report["records"]["properties"] == 0
+
+        manager = SQLiteDataManager(path)
+        assert manager.get_all_properties() == []
+        assert manager.market == {}
+
+    def test_reimport_replaces_database(self, temp_data_dir, tmp_path):
+        path = str(tmp_path / "test.db")
+        import_json(temp_data_dir, path)
+        listings_path = os.path.join(
+            temp_data_dir, "properties", "active_listings.json"
+        )
+        with open(listings_path, "w") as f:
+            json.dump({"active_listings": [{"id": "NEW001", "price": 1}]}, f)
+
+        import_json(temp_data_dir, path)
+        manager = SQLiteDataManager(path)
+        assert [p["id"] for p in manager.get_all_properties()] == ["NEW001"]
+
+
+class TestQueryParity:
+    """Test the SQLite backend answers queries like the JSON backend"""
+
+    def test_record_lookups(self, managers):
+        json_manager, sqlite_manager = managers
+        assert sqlite_manager.get_all_properties() == json_manager.get_all_properties()
+        assert sqlite_manager.get_all_agents() == json_manager.get_all_agents()
+        assert sqlite_manager.get_all_clients() == json_manager.get_all_clients()
+        assert sqlite_manager.get_recent_sales() == json_manager.get_recent_sales()
+
+        for prop in json_manager.get_all_properties():
+            assert sqlite_manager.get_property_by_id(prop["id"]) == prop
+        for agent in json_manager.get_all_agents():
+            agent_id = agent["id"]
+            assert sqlite_manager.get_agent_by_id(agent_id) == agent
+            assert sqlite_manager.get_properties_by_agent(
+                agent_id
+            ) == json_manager.get_properties_by_agent(agent_id)
+            assert sqlite_manager.get_clients_by_agent(
+                agent_id
+            ) == json_manager.get_clients_by_agent(agent_id)
+            assert sqlite_manager.get_sales_by_agent(
+                agent_id
+            ) == json_manager.get_sales_by_agent(agent_id)
+        assert sqlite_manager.get_property_by_id("NOPE") is None
+
+    def test_area_lookups_are_case_insensitive(self, managers):
+        json_manager, sqlite_manager = managers
+        for area in json_manager.get_all_areas() + ["DOWNTOWN", "nowhere"]:
+            name = area["name"] if isinstance(area, dict) else area
+            assert sqlite_manager.get_properties_by_area(
+                name
+            ) == json_manager.get_properties_by_area(name)
+            assert sqlite_manager.get_sales_by_area(
+                name
+            ) == json_manager.get_sales_by_area(name)
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            PropertyFilter(),
+            PropertyFilter(min_price=500000, max_price=900000),
+            PropertyFilter(min_bedrooms=3, max_bathrooms=2.5),
+            PropertyFilter(areas=["Downtown", "Suburbs"]),
+            PropertyFilter(property_types=["Condo"], min_sqft=1000),
+            PropertyFilter(features=["pool"]),
+            PropertyFilter(features=["GAR", "fire"], max_sqft=4000),
+            PropertyFilter(min_price=-1),
+        ],
+    )
+    def test_filter_properties(self, managers, filters):
+        json_manager, sqlite_manager = managers
+        assert sqlite_manager.filter_properties(
+            filters
+        ) == json_manager.filter_properties(filters)
+
+    def test_filter_handles_missing_values(self, temp_data_dir, tmp_path):
+        listings_path = os.path.join(
+            temp_data_dir, "properties", "active_listings.json"
+        )
+        with open(listings_path, "w") as f:
+            json.dump({"active_listings": [{"id": "A"}, {"id": "B", "price": 5}]}, f)
+        path = str(tmp_path / "test.db")
+        import_json(temp_data_dir, path)
+        manager = SQLiteDataManager(path)
+
+        assert manager.filter_properties(PropertyFilter(min_price=-10)) == [
+            {"id": "A"},
+            {"id": "B", "price": 5},
+        ]
+        assert manager.filter_properties(PropertyFilter(max_price=10)) == [
+            {"id": "B", "price": 5}
+        ]
+
+    @pytest.mark.parametrize(
+        "query", ["downtown", "Pool", "a", "ch", "modern kitchen", "zzz", "", "'\""]
+    )
+    def test_search(self, managers, query):
+        json_manager, sqlite_manager = managers
+        assert sqlite_manager.search_properties(
+            query
+        ) == json_manager.search_properties(query)
+        assert sqlite_manager.search_agents(query) == json_manager.search_agents(query)
+
+    def test_rank_returns_search_matches_best_first(self, managers):
+        json_manager, sqlite_manager = managers
+        ranked = sqlite_manager.rank_properties("pool")
+        assert sorted(p["id"] for p, _ in ranked) == sorted(
+            p["id"] for p in json_manager.search_properties("pool")
+        )
+        scores = [score for _, score in ranked]
+        assert scores == sorted(scores, reverse=True)
+
+        assert len(sqlite_manager.rank_agents("luxury", limit=1)) <= 1
+        assert sqlite_manager.rank_properties("pool", limit=0) == []
+        assert sqlite_manager.rank_properties("pool", min_score=float("inf")) == []
+
+        threshold = scores[len(scores) // 2]
+        for manager in managers:
+            assert manager.count_ranked_properties("pool", threshold) == len(
+                manager.rank_properties("pool", min_score=threshold)
+            )
+            assert manager.count_ranked_agents("luxury") == len(
+                manager.rank_agents("luxury")
+            )
+
+    def test_composite_queries(self, managers):
+        json_manager, sqlite_manager = managers
+        agent_id = json_manager.get_all_agents()[0]["id"]
+        property_id = json_manager.get_all_properties()[0]["id"]
+        client_id = json_manager.get_all_clients()[0]["id"]
+        queries = [
+            ("get_agent_dashboard", agent_id),
+            ("get_property_insights", property_id),
+            ("match_clients_to_properties", client_id),
+            ("get_market_overview",),
+            ("get_comprehensive_area_report", "Downtown"),
+        ]
+        for name, *args in queries:
+            # Records hold lists as tuples, so compare the serialized responses
+            assert serialized(getattr(sqlite_manager, name)(*args)) == serialized(
+                getattr(json_manager, name)(*args)
+            )
+        assert sqlite_manager.clients.get("lead_sources") == json_manager.clients.get(
+            "lead_sources"
+        )
+
+
+class TestSQLiteDataManager:
+    """Test manager behaviour specific to the SQLite backend"""
+
+    def test_missing_database_raises(self, tmp_path):
+        manager = SQLiteDataManager(str(tmp_path / "missing.db"))
+        with pytest.raises(FileNotFoundError):
+            manager.get_all_properties()
+
+    def test_connections_are_read_only(self, database):
+        manager = SQLiteDataManager(database)
+        with pytest.raises(sqlite3.OperationalError):
+            manager.connection().execute("DELETE FROM properties")
+
+    def test_refresh_reads_reimported_documents(self, temp_data_dir, tmp_path):
+        path = str(tmp_path / "test.db")
+        import_json(temp_data_dir, path)
+        manager = SQLiteDataManager(path)
+        assert manager.market.get("market_overview")
+
+        with open(
+            os.path.join(temp_data_dir, "market", "market_analytics.json"), "w"
+        ) as f:
+            json.dump({"market_overview": {"market_type": "Buyer's Market"}}, f)
+        import_json(temp_data_dir, path)
+        manager.connection().close()
+        manager._local.connection = None
+
+        report = manager.refresh_data()
+        assert "market" in report["not_loaded"]
+        assert manager.market["market_overview"]["market_type"] == "Buyer's Market"
+
+    def test_refresh_invalidates_cached_results(self, temp_data_dir, tmp_path):
+        path = str(tmp_path / "test.db")
+        import_json(temp_data_dir, path)
+        manager = SQLiteDataManager(path)
+        filters = PropertyFilter(areas=["Test Area"])
+        assert len(manager.filter_properties(filters)) == 2
+
+        with open(
+            os.path.join(temp_data_dir, "properties", "active_listings.json"), "w"
+        ) as f:
+            json.dump({"active_listings": [{"id": "NEW001", "area": "Test Area"}]}, f)
+        import_json(temp_data_dir, path)
+        manager.connection().close()
+        manager._local.connection = None
+
+        # Served from the result cache until the next refresh
+        assert len(manager.filter_properties(filters)) == 2
+        manager.refresh_data()
+        assert manager.snapshot().version == 1
+        assert set(manager.snapshot().dataset_versions.values()) == {1}
+        assert [p["id"] for p in manager.filter_properties(filters)] == ["NEW001"]
+
+    def test_factory_selects_sqlite(self, database):
+        with patch.object(utils, "_data_manager", None), patch.dict(
+            os.environ, {utils.DATABASE_ENV: database}
+        ):
+            manager = utils.get_data_manager()
+        assert isinstance(manager, SQLiteDataManager)
+        assert manager.database == database
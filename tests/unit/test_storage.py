@@ -0,0 +1,386 @@
+"""
+Backend conformance tests for storage.py - the data access interface
+
+``BackendConformance`` checks a backend against the data access contract
+using the repository's ``data/`` directory. Test a new backend by
+subclassing it and overriding the ``backend`` fixture.
+"""
+
+import json
+import os
+import shutil
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+
+from sqlite_backend import SQLiteDataManager, import_json
+from storage import DataAccess, DataBackend
+from text_index import TextIndex
+from utils import (
+    DATASET_FILES,
+    RECORD_ARRAYS,
+    DataSnapshot,
+    PropertyFilter,
+    RealEstateDataManager,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "data")
+
+FILTERS = [
+    PropertyFilter(),
+    PropertyFilter(min_price=500000, max_price=900000),
+    PropertyFilter(min_bedrooms=3, max_bedrooms=4),
+    PropertyFilter(min_bathrooms=2, max_bathrooms=3),
+    PropertyFilter(min_sqft=1500, max_sqft=3000),
+    PropertyFilter(areas=["Downtown Riverside", "Canyon Crest"]),
+    PropertyFilter(property_types=["Condo", "Townhouse"]),
+    PropertyFilter(features=["pool"]),
+    PropertyFilter(features=["GARAGE", "kitchen"], min_price=1),
+    PropertyFilter(min_list_date="2024-01-20", max_list_date="2024-01-30"),
+]
+
+SORT_FIELDS = ["price", "square_feet", "bedrooms", "list_date"]
+
+QUERIES = ["downtown", "Pool", "a", "ch", "modern kitchen", "zzz", "", "'\""]
+
+
+def matches(prop, filters):
+    """Reference PropertyFilter semantics, written out independently"""
+    ranges = [
+        ("price", filters.min_price, filters.max_price),
+        ("bedrooms", filters.min_bedrooms, filters.max_bedrooms),
+        ("bathrooms", filters.min_bathrooms, filters.max_bathrooms),
+        ("square_feet", filters.min_sqft, filters.max_sqft),
+    ]
+    for field, low, high in ranges:
+        if low and prop.get(field, 0) < low:
+            return False
+        if high and prop.get(field, float("inf")) > high:
+            return False
+    if filters.areas and prop.get("area") not in filters.areas:
+        return False
+    if filters.property_types and prop.get("property_type") not in (
+        filters.property_types
+    ):
+        return False
+    list_date = prop.get("list_date")
+    if filters.min_list_date and not (
+        isinstance(list_date, str) and list_date >= filters.min_list_date
+    ):
+        return False
+    if filters.max_list_date and not (
+        isinstance(list_date, str) and list_date <= filters.max_list_date
+    ):
+        return False
+    return all(
+        any(required.lower() in feature.lower() for feature in prop["features"])
+        for required in filters.features or []
+    )
+
+
+def sort_reference(listings, sort_by, descending):
+    """Listings ordered by a field, equal values in file order, missing last"""
+    present = [p for p in listings if sort_by in p]
+    present.sort(key=lambda p: p[sort_by], reverse=descending)
+    return present + [p for p in listings if sort_by not in p]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Private copy of the repository's data directory"""
+    return shutil.copytree(DATA_DIR, str(tmp_path / "data"))
+
+
+@pytest.fixture
+def source(data_dir):
+    """The data files, parsed with the json module"""
+    documents = {}
+    for name, relative_path in DATASET_FILES.items():
+        with open(os.path.join(data_dir, relative_path)) as f:
+            documents[name] = json.load(f)
+    return documents
+
+
+class BackendConformance:
+    """Data access contract every storage backend must satisfy"""
+
+    @pytest.fixture
+    def backend(self, data_dir) -> DataBackend:
+        """The backend under test, serving ``data_dir``"""
+        raise NotImplementedError
+
+    def test_implements_interface(self, backend):
+        assert isinstance(backend, DataBackend)
+        assert isinstance(backend.snapshot(), DataAccess)
+
+    def test_record_collections(self, backend, source):
+        assert backend.get_all_properties() == source["properties"]["active_listings"]
+        assert backend.get_all_agents() == source["agents"]["agents"]
+        assert backend.get_all_clients() == source["clients"]["clients"]
+        assert backend.get_recent_sales() == source["transactions"]["recent_sales"]
+
+    def test_record_pages_and_counts(self, backend, source):
+        for page, count, records in [
+            (
+                backend.get_properties_page,
+                backend.count_properties,
+                source["properties"]["active_listings"],
+            ),
+            (backend.get_agents_page, backend.count_agents, source["agents"]["agents"]),
+            (
+                backend.get_clients_page,
+                backend.count_clients,
+                source["clients"]["clients"],
+            ),
+            (
+                backend.get_sales_page,
+                backend.count_sales,
+                source["transactions"]["recent_sales"],
+            ),
+        ]:
+            assert count() == len(records)
+            pages = [page(offset, 3) for offset in range(0, len(records) + 3, 3)]
+            assert [r for chunk in pages for r in chunk] == records
+            assert pages[-1] == []
+            assert page(1, 0) == []
+
+    def test_record_fields(self, backend, source):
+        for dataset, array_key in RECORD_ARRAYS.items():
+            fields = {}
+            for record in source[dataset][array_key[0]]:
+                fields.update(dict.fromkeys(record))
+            assert backend.get_record_fields(dataset) == tuple(fields)
+
+    def test_lookups_by_id(self, backend, source):
+        for prop in source["properties"]["active_listings"]:
+            assert backend.get_property_by_id(prop["id"]) == prop
+        for agent in source["agents"]["agents"]:
+            assert backend.get_agent_by_id(agent["id"]) == agent
+        for client in source["clients"]["clients"]:
+            assert backend.get_client_by_id(client["id"]) == client
+        assert backend.get_property_by_id("MISSING") is None
+        assert backend.get_agent_by_id("MISSING") is None
+        assert backend.get_client_by_id("MISSING") is None
+
+    def test_records_by_agent(self, backend, source):
+        agent_ids = [agent["id"] for agent in source["agents"]["agents"]]
+        for agent_id in agent_ids + ["MISSING"]:
+            for method, records in [
+                (backend.get_properties_by_agent, source["properties"]),
+                (backend.get_clients_by_agent, source["clients"]),
+                (backend.get_sales_by_agent, source["transactions"]),
+            ]:
+                array = next(v for v in records.values() if isinstance(v, list))
+                expected = [r for r in array if r.get("agent_id") == agent_id]
+                assert method(agent_id) == expected
+
+    def test_records_by_area_ignore_case(self, backend, source):
+        listings = source["properties"]["active_listings"]
+        sales = source["transactions"]["recent_sales"]
+        for area in {p["area"] for p in listings} | {"NOWHERE"}:
+            for name in (area, area.upper()):
+                assert backend.get_properties_by_area(name) == [
+                    p for p in listings if p["area"].lower() == area.lower()
+                ]
+                assert backend.get_sales_by_area(name) == [
+                    s for s in sales if s["area"].lower() == area.lower()
+                ]
+
+    @pytest.mark.parametrize("filters", FILTERS)
+    def test_filter_properties(self, backend, source, filters):
+        listings = source["properties"]["active_listings"]
+        assert backend.filter_properties(filters) == [
+            p for p in listings if matches(p, filters)
+        ]
+
+    @pytest.mark.parametrize("filters", FILTERS)
+    def test_explain_filter(self, backend, filters):
+        results, plan = backend.explain_filter(filters)
+        assert results == backend.filter_properties(filters)
+        assert isinstance(plan["access_path"], str)
+        assert plan["actual_rows"]["result"] == len(results)
+        assert plan["actual_rows"]["candidates"] >= len(results)
+
+    @pytest.mark.parametrize("sort_by", SORT_FIELDS)
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_sorted_pages(self, backend, source, sort_by, descending):
+        listings = source["properties"]["active_listings"]
+        for criteria in FILTERS:
+            expected = sort_reference(
+                [p for p in listings if matches(p, criteria)], sort_by, descending
+            )
+            filters = replace(criteria, sort_by=sort_by, descending=descending)
+            assert backend.filter_properties(filters) == expected
+            pages = [
+                backend.filter_properties(replace(filters, offset=offset, limit=2))
+                for offset in range(0, len(expected) + 2, 2)
+            ]
+            assert [p for page in pages for p in page] == expected
+            assert pages[-1] == []
+
+    def test_page_without_sort(self, backend, source):
+        listings = source["properties"]["active_listings"]
+        filters = PropertyFilter(offset=1, limit=3)
+        assert backend.filter_properties(filters) == listings[1:4]
+        assert backend.filter_properties(replace(filters, limit=0)) == []
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_search(self, backend, query):
+        snapshot = backend.snapshot()
+        expected_properties = [
+            p
+            for p in snapshot.get_all_properties()
+            if query.lower() in DataSnapshot._property_search_text(p)
+        ]
+        expected_agents = [
+            a
+            for a in snapshot.get_all_agents()
+            if query.lower() in DataSnapshot._agent_search_text(a)
+        ]
+        assert snapshot.search_properties(query) == expected_properties
+        assert snapshot.search_agents(query) == expected_agents
+
+    @pytest.mark.parametrize("query", ["pool", "riverside", "luxury homes"])
+    def test_rank(self, backend, query):
+        for search, rank in [
+            (backend.search_properties, backend.rank_properties),
+            (backend.search_agents, backend.rank_agents),
+        ]:
+            ranked = rank(query)
+            assert sorted(r["id"] for r, _ in ranked) == sorted(
+                r["id"] for r in search(query)
+            )
+            scores = [score for _, score in ranked]
+            assert scores == sorted(scores, reverse=True)
+            assert rank(query, limit=1) == ranked[:1]
+            assert rank(query, limit=0) == []
+            if ranked:
+                threshold = ranked[0][1]
+                assert all(s >= threshold for _, s in rank(query, min_score=threshold))
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_rank_scores_are_backend_independent(self, backend, source, query):
+        for records, text, rank, count in [
+            (
+                source["properties"]["active_listings"],
+                DataSnapshot._property_search_text,
+                backend.rank_properties,
+                backend.count_ranked_properties,
+            ),
+            (
+                source["agents"]["agents"],
+                DataSnapshot._agent_search_text,
+                backend.rank_agents,
+                backend.count_ranked_agents,
+            ),
+        ]:
+            index = TextIndex(records, text)
+            expected = [(records[row]["id"], score) for row, score in index.rank(query)]
+            assert [(r["id"], score) for r, score in rank(query)] == expected
+            for threshold in (0.0, 1.0, 3.0):
+                assert count(query, threshold) == index.count(query, threshold)
+                assert len(rank(query, min_score=threshold)) == index.count(
+                    query, threshold
+                )
+
+    def test_dataset_summaries(self, backend, source):
+        assert backend.get_price_range() == source["properties"]["price_range"]
+        assert backend.get_lead_sources() == source["clients"]["lead_sources"]
+        assert backend.get_sales_summary() == source["transactions"]["sales_summary"]
+
+    def test_market(self, backend, source):
+        market = source["market"]
+        areas = list(market["area_performance"])
+        assert backend.get_market_overview() == market["market_overview"]
+        assert backend.get_price_analytics() == market["price_analytics"]
+        assert (
+            backend.get_investment_opportunities() == market["investment_opportunities"]
+        )
+        for area in areas:
+            assert (
+                backend.get_area_market_data(area) == market["area_performance"][area]
+            )
+        assert backend.get_area_market_data("NOWHERE") is None
+        assert backend.compare_areas(areas[:2] + ["NOWHERE"]) == {
+            area: market["area_performance"][area] for area in areas[:2]
+        }
+
+    def test_areas_and_amenities(self, backend, source):
+        areas, amenities = source["areas"], source["amenities"]
+        assert backend.get_all_areas() == areas["areas"]
+        for area in areas["areas"]:
+            assert backend.get_area_info(area["name"].upper()) == area
+        assert backend.get_area_info("NOWHERE") is None
+        assert backend.get_city_overview()["city_name"] == areas["city_name"]
+        assert backend.get_all_amenities() == amenities
+        for category, data in amenities.items():
+            assert backend.get_amenities_by_type(category) == data
+        area_amenities = backend.get_area_amenities(areas["areas"][0]["name"])
+        assert set(area_amenities) == {"schools", "parks", "shopping"}
+
+    def test_snapshot_is_stable_across_refresh(self, backend, source):
+        snapshot = backend.snapshot()
+        listings = snapshot.get_all_properties()
+        report = backend.refresh_data()
+        assert set(report) >= {"reloaded", "unchanged", "not_loaded"}
+        assert snapshot.get_all_properties() == listings
+
+
+class TestInMemoryBackend(BackendConformance):
+    """JSON files parsed into indexed, columnar in-memory snapshots"""
+
+    @pytest.fixture
+    def backend(self, data_dir):
+        return RealEstateDataManager(data_dir)
+
+
+class TestScanBackend(BackendConformance):
+    """In-memory snapshots without NumPy, filtering by row scan"""
+
+    @pytest.fixture
+    def backend(self, data_dir):
+        manager = RealEstateDataManager(data_dir)
+        with patch("columnar.np", None):
+            manager.snapshot().warm(["properties"])
+        assert manager.snapshot()._listing_columns is None
+        return manager
+
+
+class TestSnapshotCacheBackend(BackendConformance):
+    """In-memory snapshots restored from the binary snapshot cache"""
+
+    @pytest.fixture
+    def backend(self, data_dir, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        RealEstateDataManager(data_dir, snapshot_dir=cache_dir).snapshot().warm(
+            DATASET_FILES
+        )
+        return RealEstateDataManager(data_dir, snapshot_dir=cache_dir)
+
+
+class TestSQLiteBackend(BackendConformance):
+    """SQLite database imported from the JSON files"""
+
+    @pytest.fixture
+    def backend(self, data_dir, tmp_path):
+        database = str(tmp_path / "real_estate.db")
+        import_json(data_dir, database)
+        return SQLiteDataManager(database)
+
+
+class TestInterface:
+    """Test the abstract interface itself"""
+
+    def test_backend_requires_refresh(self):
+        class Incomplete(DataBackend):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_backend_delegates_queries_to_snapshot(self, test_data_manager):
+        snapshot = test_data_manager.snapshot()
+        assert test_data_manager.get_all_agents() == snapshot.get_all_agents()
+        with pytest.raises(AttributeError):
+            test_data_manager.no_such_query
@@ -0,0 +1,176 @@
+"""
+Unit tests for text_index.py - inverted index substring search
+"""
+
+import random
+
+import pytest
+
+from text_index import TextIndex, TrigramIndex, tokenize
+
+DOCUMENTS = [
+    "123 Test St Victorian home with hardwood floors",
+    "456 Test Ave modern townhouse, swimming pool & gym",
+    "789 Oak Street single-family home near the park",
+    "Downtown loft: open floor plan, rooftop deck",
+    "",
+]
+
+
+def naive_search(documents, query):
+    """Reference implementation: lower-cased substring test"""
+    return [row for row, doc in enumerate(documents) if query.lower() in doc.lower()]
+
+
+@pytest.fixture
+def index():
+    """Index over the sample documents"""
+    return TextIndex(DOCUMENTS, str.lower)
+
+
+class TestTextIndex:
+    """Test the inverted text index"""
+
+    def test_tokenize(self):
+        """Test tokens are maximal runs of word characters"""
+        assert tokenize("single-family home, 3br") == [
+            "single",
+            "family",
+            "home",
+            "3br",
+        ]
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "Test St",
+            "test",
+            "pool",
+            "ool & g",
+            "st st",
+            "floor",
+            "floors",
+            "family home",
+            "e-fam",
+            "Street single",
+            "loft: open",
+            " ",
+            "",
+            ", ",
+            "nonexistent",
+            "t St Vic",
+        ],
+    )
+    def test_matches_substring_semantics(self, index, query):
+        """Test index results equal a full substring scan"""
+        assert index.search(query) == naive_search(DOCUMENTS, query)
+
+    def test_random_substrings(self, index):
+        """Test arbitrary slices of the documents are found exactly"""
+        rng = random.Random(11)
+        for _ in range(500):
+            doc = rng.choice(DOCUMENTS[:-1])
+            start = rng.randrange(len(doc))
+            query = doc[start : start + rng.randint(1, 15)]
+            assert index.search(query) == naive_search(DOCUMENTS, query)
+
+    def test_property_search_uses_index(self, test_data_manager):
+        """Test search_properties is answered from the index"""
+        index = test_data_manager._property_text_index
+        assert index.postings["townhouse"] == [1]
+        assert [p["id"] for p in test_data_manager.search_properties("test")] == [
+            "TEST001",
+            "TEST002",
+        ]
+
+
+class TestBM25Ranking:
+    """Test BM25 relevance ranking"""
+
+    @pytest.fixture
+    def ranked_index(self):
+        """Index where documents mention 'pool' with different frequency"""
+        documents = [
+            "garage and garden",
+            "pool",
+            "pool house with pool and pool table",
+            "large house with a pool among many other lovely features",
+        ]
+        return TextIndex(documents, str.lower)
+
+    def test_rank_orders_by_score(self, ranked_index):
+        """Test the long document mentioning the term once ranks last"""
+        ranked = ranked_index.rank("pool")
+        assert [row for row, _ in ranked][-1] == 3
+        scores = [score for _, score in ranked]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_rank_matches_search(self, ranked_index):
+        """Test ranking returns exactly the search matches"""
+        for query in ["pool", "house", "ool h", "nothing", ""]:
+            ranked_rows = {row for row, _ in ranked_index.rank(query)}
+            assert ranked_rows == set(ranked_index.search(query))
+
+    def test_rank_limit_and_min_score(self, ranked_index):
+        """Test top-k truncation and score threshold"""
+        full = ranked_index.rank("pool")
+        assert ranked_index.rank("pool", limit=2) == full[:2]
+        assert ranked_index.rank("pool", limit=0) == []
+
+        threshold = full[1][1]
+        assert ranked_index.rank("pool", min_score=threshold) == full[:2]
+
+    def test_count_matches_rank(self, ranked_index):
+        """Test counting agrees with the length of the full ranking"""
+        full = ranked_index.rank("pool")
+        for min_score in [None, full[1][1], float("inf")]:
+            assert ranked_index.count("pool", min_score) == len(
+                ranked_index.rank("pool", min_score=min_score)
+            )
+        assert ranked_index.count("nothing") == 0
+
+    def test_rank_agents(self, test_data_manager):
+        """Test ranked agent search returns scored agents"""
+        ranked = test_data_manager.rank_agents("test agent", limit=1)
+        assert len(ranked) == 1
+        agent, score = ranked[0]
+        assert agent["id"] == "AGENT001"
+        assert score > 0
+
+
+class TestTrigramIndex:
+    """Test the feature trigram index"""
+
+    FEATURES = [
+        ["Garage", "Garden", "Swimming Pool"],
+        ["Pool", "Gym"],
+        [],
+        ["Two-car garage", 42],
+    ]
+
+    @pytest.fixture
+    def trigram_index(self):
+        """Index over the sample feature lists"""
+        return TrigramIndex(self.FEATURES, lambda features: features)
+
+    @pytest.mark.parametrize(
+        "needle", ["pool", "POOL", "gar", "ga", "g", "", "car gar", "den", "xyz"]
+    )
+    def test_rows_containing(self, trigram_index, needle):
+        """Test results equal a lower-cased substring scan over features"""
+        expected = {
+            row
+            for row, features in enumerate(self.FEATURES)
+            if any(
+                needle.lower() in feature.lower()
+                for feature in features
+                if isinstance(feature, str)
+            )
+        }
+        assert trigram_index.rows_containing(needle) == expected
+
+    def test_distinct_strings_stored_once(self, trigram_index):
+        """Test repeated strings share one entry"""
+        index = TrigramIndex([["Pool"], ["pool"], ["POOL"]], lambda f: f)
+        assert index.strings == ["pool"]
+        assert index.rows_by_string == [[0, 1, 2]]
@@ -4,11 +4,14 @@ Unit tests for utils.py - RealEstateDataManager and PropertyFilter
 
 import json
 import os
-from unittest.mock import mock_open, patch
+import shutil
+import threading
+from unittest.mock import Mock, mock_open, patch
 
 import pytest
 
-from utils import PropertyFilter, RealEstateDataManager
+import utils
+from utils import DATASET_FILES, DataSnapshot, PropertyFilter, RealEstateDataManager
 
 
 class TestPropertyFilter:
@@ -43,6 +46,27 @@ class TestPropertyFilter:
         assert pf.areas is None
         assert pf.property_types is None
 
+    def test_cache_key_normalizes_equivalent_filters(self):
+        """Test filters selecting the same listings share a cache key"""
+        assert (
+            PropertyFilter(
+                min_price=0, areas=["B", "A"], features=["Pool", "gym"]
+            ).cache_key()
+            == PropertyFilter(areas=["A", "B"], features=["GYM", "pool"]).cache_key()
+        )
+        assert PropertyFilter(areas=[]).cache_key() == PropertyFilter().cache_key()
+        assert (
+            PropertyFilter(descending=True).cache_key() == PropertyFilter().cache_key()
+        )
+        assert (
+            PropertyFilter(min_price=1).cache_key()
+            != PropertyFilter(max_price=1).cache_key()
+        )
+        assert (
+            PropertyFilter(sort_by="price", descending=True).cache_key()
+            != PropertyFilter(sort_by="price").cache_key()
+        )
+
 
 class TestRealEstateDataManager:
     """Test RealEstateDataManager class"""
@@ -62,6 +86,27 @@ class TestRealEstateDataManager:
         assert properties[0]["id"] == "TEST001"
         assert properties[1]["id"] == "TEST002"
 
+    def test_datasets_load_on_first_access(self, temp_data_dir):
+        """Test constructing a manager reads no data files"""
+        manager = RealEstateDataManager(data_dir=temp_data_dir)
+        snapshot = manager.snapshot()
+        assert not any(snapshot.is_loaded(name) for name in DATASET_FILES)
+
+        assert manager.get_agent_by_id("AGENT001") is not None
+        assert snapshot.is_loaded("agents") and snapshot.has_indexes("agents")
+        assert not snapshot.is_loaded("properties")
+        assert not snapshot.has_indexes("properties")
+
+    def test_get_data_manager_honors_env(self, temp_data_dir, monkeypatch):
+        """Test the shared manager is created once for REAL_ESTATE_DATA_DIR"""
+        monkeypatch.setattr(utils, "_data_manager", None)
+        monkeypatch.setenv(utils.DATA_DIR_ENV, temp_data_dir)
+
+        manager = utils.get_data_manager()
+        assert manager.data_dir == temp_data_dir
+        assert utils.get_data_manager() is manager
+        assert len(manager.get_all_properties()) == 2
+
     def test_get_property_by_id(self, test_data_manager):
         """Test getting property by ID"""
         prop = test_data_manager.get_property_by_id("TEST001")
@@ -73,6 +118,23 @@ class TestRealEstateDataManager:
         prop = test_data_manager.get_property_by_id("NONEXISTENT")
         assert prop is None
 
+    def test_id_indexes_rebuilt_on_refresh(self, test_data_manager, temp_data_dir):
+        """Test ID indexes pick up new records after refresh"""
+        assert test_data_manager.get_property_by_id("TEST001") is not None
+        filepath = os.path.join(temp_data_dir, "properties", "active_listings.json")
+        with open(filepath, "w") as f:
+            json.dump(
+                {"active_listings": [{"id": "NEW001"}, {"id": "NEW001", "x": 1}]}, f
+            )
+
+        # The loaded snapshot keeps serving the old file until a refresh
+        assert test_data_manager.get_property_by_id("NEW001") is None
+        test_data_manager.refresh_data()
+
+        # Duplicate IDs resolve to the first record, as the linear scan did
+        assert test_data_manager.get_property_by_id("NEW001") == {"id": "NEW001"}
+        assert test_data_manager.get_property_by_id("TEST001") is None
+
     def test_search_properties(self, test_data_manager):
         """Test property search functionality"""
         # Search by address
@@ -182,6 +244,33 @@ class TestRealEstateDataManager:
         properties = test_data_manager.get_properties_by_area("Nonexistent Area")
         assert len(properties) == 0
 
+    def test_area_index_is_case_insensitive(self, test_data_manager):
+        """Test area lookups ignore case and return independent lists"""
+        properties = test_data_manager.get_properties_by_area("TEST area")
+        assert [p["id"] for p in properties] == ["TEST001", "TEST002"]
+
+        # Mutating a result must not corrupt the index
+        properties.clear()
+        assert len(test_data_manager.get_properties_by_area("Test Area")) == 2
+
+    def test_sales_indexes(self, test_data_manager, temp_data_dir):
+        """Test sales are indexed by area and agent"""
+        filepath = os.path.join(temp_data_dir, "transactions", "recent_sales.json")
+        sales = [
+            {"id": "SALE1", "area": "Test Area", "agent_id": "AGENT001"},
+            {"id": "SALE2", "area": "Other Area", "agent_id": "AGENT001"},
+            {"id": "SALE3", "agent_id": "AGENT002"},
+        ]
+        with open(filepath, "w") as f:
+            json.dump({"recent_sales": sales}, f)
+        test_data_manager.refresh_data()
+
+        by_agent = test_data_manager.get_sales_by_agent("AGENT001")
+        assert [s["id"] for s in by_agent] == ["SALE1", "SALE2"]
+        by_area = test_data_manager.get_sales_by_area("other AREA")
+        assert [s["id"] for s in by_area] == ["SALE2"]
+        assert test_data_manager.get_clients_by_agent("AGENT001") == []
+
     def test_get_properties_by_agent(self, test_data_manager):
         """Test getting properties by agent"""
         properties = test_data_manager.get_properties_by_agent("AGENT001")
@@ -254,6 +343,180 @@ class TestRealEstateDataManager:
         test_data_manager.refresh_data()
         assert "test" not in test_data_manager._cache
 
+    def test_refresh_publishes_new_snapshot(self, test_data_manager, temp_data_dir):
+        """Test readers holding a snapshot are unaffected by a refresh"""
+        before = test_data_manager.snapshot()
+        before.warm(["properties"])
+        filepath = os.path.join(temp_data_dir, "properties", "active_listings.json")
+        with open(filepath, "w") as f:
+            json.dump({"active_listings": [{"id": "NEW001", "area": "New"}]}, f)
+
+        test_data_manager.refresh_data()
+
+        after = test_data_manager.snapshot()
+        assert after is not before
+        assert [p["id"] for p in before.get_all_properties()] == ["TEST001", "TEST002"]
+        assert before.get_property_by_id("TEST001") is not None
+        assert [p["id"] for p in after.get_properties_by_area("new")] == ["NEW001"]
+        assert test_data_manager.get_property_by_id("NEW001") is not None
+
+    def test_refresh_reloads_only_changed_files(self, test_data_manager, temp_data_dir):
+        """Test refresh re-parses and re-indexes only datasets that changed"""
+        before = test_data_manager.snapshot()
+        assert test_data_manager.refresh_data()["not_loaded"] == list(DATASET_FILES)
+
+        before = test_data_manager.snapshot()
+        before.warm(DATASET_FILES)
+        assert test_data_manager.refresh_data() == {
+            "reloaded": {},
+            "unchanged": list(DATASET_FILES),
+            "not_loaded": [],
+        }
+
+        filepath = os.path.join(temp_data_dir, "agents", "agent_profiles.json")
+        with open(filepath, "w") as f:
+            json.dump({"agents": [{"id": "AGENT009", "name": "New Agent"}]}, f)
+
+        report = test_data_manager.refresh_data()
+        assert list(report["reloaded"]) == ["agents"]
+        assert test_data_manager.snapshot().has_indexes("agents")
+        assert "properties" in report["unchanged"]
+
+        after = test_data_manager.snapshot()
+        assert after.properties is before.properties
+        assert after._property_text_index is before._property_text_index
+        assert after._agent_text_index is not before._agent_text_index
+        assert after.get_agent_by_id("AGENT009")["name"] == "New Agent"
+
+    def test_refresh_ignores_touch_without_content_change(
+        self, test_data_manager, temp_data_dir
+    ):
+        """Test a new mtime with identical content does not trigger a reload"""
+        test_data_manager.get_all_clients()
+        filepath = os.path.join(temp_data_dir, "clients", "client_database.json")
+        stat = os.stat(filepath)
+        os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert test_data_manager.refresh_data()["reloaded"] == {}
+
+    def test_results_cached_until_data_changes(self, test_data_manager, temp_data_dir):
+        """Test filter and search results are served from the result cache
+        until a refresh reloads changed data"""
+        cache = test_data_manager.result_cache
+        filters = PropertyFilter(areas=["Test Area"])
+        first = test_data_manager.filter_properties(filters)
+        assert test_data_manager.filter_properties(filters) == first
+        test_data_manager.search_properties("Test")
+        test_data_manager.search_properties("TEST")
+        assert (cache.hits, cache.misses) == (2, 2)
+
+        # A refresh without changes keeps the data version and the entries
+        test_data_manager.refresh_data()
+        assert test_data_manager.snapshot().version == 0
+        test_data_manager.filter_properties(filters)
+        assert cache.hits == 3
+
+        filepath = os.path.join(temp_data_dir, "properties", "active_listings.json")
+        with open(filepath, "w") as f:
+            json.dump({"active_listings": [{"id": "NEW001", "area": "Test Area"}]}, f)
+        test_data_manager.refresh_data()
+
+        assert test_data_manager.snapshot().version == 1
+        assert [p["id"] for p in test_data_manager.filter_properties(filters)] == [
+            "NEW001"
+        ]
+        assert cache.stale == 1
+
+    def test_refresh_invalidates_dependent_views(
+        self, test_data_manager, temp_data_dir
+    ):
+        """Test a refresh only invalidates cached views reading changed data"""
+        cache = test_data_manager.result_cache
+        filters = PropertyFilter(areas=["Test Area"])
+        test_data_manager.filter_properties(filters)
+        test_data_manager.get_agent_performance("AGENT001")
+        assert test_data_manager.get_agent_dashboard("AGENT001")["recent_sales"] == []
+        report = test_data_manager.get_comprehensive_area_report("Test Area")
+        assert report["recent_sales"] == []
+
+        filepath = os.path.join(temp_data_dir, "transactions", "recent_sales.json")
+        sale = {"id": "SALE001", "agent_id": "AGENT001", "area": "Test Area"}
+        with open(filepath, "w") as f:
+            json.dump({"recent_sales": [sale]}, f)
+        test_data_manager.refresh_data()
+
+        versions = test_data_manager.snapshot().dataset_versions
+        assert versions["transactions"] == 1
+        assert versions["properties"] == versions["agents"] == 0
+
+        hits = cache.hits
+        test_data_manager.filter_properties(filters)
+        test_data_manager.get_agent_performance("AGENT001")
+        assert cache.hits == hits + 2
+
+        dashboard = test_data_manager.get_agent_dashboard("AGENT001")
+        assert [s["id"] for s in dashboard["recent_sales"]] == ["SALE001"]
+        report = test_data_manager.get_comprehensive_area_report("Test Area")
+        assert [s["id"] for s in report["recent_sales"]] == ["SALE001"]
+        assert report["market_trends"]["total_sales"] == 1
+
+    def test_refresh_rebuilds_encoded_responses(self, test_data_manager, temp_data_dir):
+        """Test a refresh re-encodes cached responses whose datasets changed"""
+        cache = test_data_manager.response_cache
+
+        def read():
+            return cache.get(
+                test_data_manager.snapshot(),
+                "market-overview",
+                ("market",),
+                lambda snapshot: snapshot.get_market_overview(),
+            )
+
+        before = read()
+        assert read() is before
+
+        filepath = os.path.join(temp_data_dir, "market", "market_analytics.json")
+        with open(filepath, "w") as f:
+            json.dump({"market_overview": {"average_price": 1}}, f)
+        test_data_manager.refresh_data()
+
+        builds = cache.builds
+        after = read()
+        assert cache.builds == builds
+        assert after != before and json.loads(after)["average_price"] == 1
+
+    def test_view_dependencies(self):
+        """Test composite views declare the datasets they read"""
+        assert DataSnapshot.calculate_market_trends.depends_on == ("transactions",)
+        assert "transactions" in DataSnapshot.get_agent_dashboard.depends_on
+        assert "transactions" not in DataSnapshot.get_agent_performance.depends_on
+
+    def test_concurrent_reads_during_refresh(self, test_data_manager):
+        """Test readers never see a partially loaded dataset"""
+        stop = threading.Event()
+        seen = set()
+
+        def reader():
+            while not stop.is_set():
+                snapshot = test_data_manager.snapshot()
+                seen.add(
+                    (
+                        len(snapshot.get_all_properties()),
+                        len(snapshot.get_properties_by_area("Test Area")),
+                    )
+                )
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        try:
+            for _ in range(20):
+                test_data_manager.refresh_data()
+        finally:
+            stop.set()
+            thread.join()
+
+        assert seen == {(2, 2)}
+
     def test_load_json_file_caching(self, test_data_manager, temp_data_dir):
         """Test JSON file loading with caching"""
         filepath = os.path.join(temp_data_dir, "properties", "active_listings.json")
@@ -276,3 +539,111 @@ class TestRealEstateDataManager:
         with patch("builtins.open", mock_open(read_data="invalid json")):
             data = test_data_manager._load_json_file("invalid.json")
             assert data == {}
+
+
+class TestSnapshotCache:
+    """Test the binary snapshot cache used for cold starts"""
+
+    @pytest.fixture
+    def snapshot_dir(self, temp_data_dir):
+        """Snapshot cache directory populated by a first, JSON-loading manager"""
+        snapshot_dir = temp_data_dir + ".snapshot"
+        manager = RealEstateDataManager(temp_data_dir, snapshot_dir=snapshot_dir)
+        manager.snapshot().warm(DATASET_FILES)
+        yield snapshot_dir
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+    def cached_manager(self, temp_data_dir, snapshot_dir):
+        """Manager that fails the test if it parses any JSON file"""
+        manager = RealEstateDataManager(temp_data_dir, snapshot_dir=snapshot_dir)
+        manager._load_json_file = Mock(side_effect=AssertionError("parsed JSON"))
+        return manager
+
+    def test_cache_written_for_every_dataset(self, snapshot_dir):
+        """Test each dataset gets a cache file once loaded and indexed"""
+        assert sorted(os.listdir(snapshot_dir)) == sorted(
+            f"{name}.snapshot" for name in DATASET_FILES
+        )
+
+    def test_valid_cache_skips_json_and_index_builds(self, temp_data_dir, snapshot_dir):
+        """Test a valid cache restores data and prebuilt indexes"""
+        manager = self.cached_manager(temp_data_dir, snapshot_dir)
+        snapshot = manager.snapshot()
+
+        assert snapshot.get_property_by_id("TEST001")["address"] == "123 Test St"
+        assert snapshot.has_indexes("properties")
+        assert snapshot.index_times == {}
+        assert len(snapshot.get_all_properties()) == 2
+        assert (
+            snapshot._property_index["TEST001"]
+            is snapshot.properties["active_listings"][0]
+        )
+        assert [p["id"] for p in snapshot.search_properties("test ave")] == ["TEST002"]
+        assert snapshot.get_agent_by_id("AGENT001") is not None
+
+    def test_touched_file_still_uses_cache(self, temp_data_dir, snapshot_dir):
+        """Test a new mtime with identical content keeps the cache valid"""
+        filepath = os.path.join(temp_data_dir, "agents", "agent_profiles.json")
+        stat = os.stat(filepath)
+        os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        manager = self.cached_manager(temp_data_dir, snapshot_dir)
+        assert len(manager.get_all_agents()) == 2
+
+    def test_stale_cache_falls_back_to_json(self, temp_data_dir, snapshot_dir):
+        """Test a changed source file invalidates its cache entry"""
+        filepath = os.path.join(temp_data_dir, "agents", "agent_profiles.json")
+        with open(filepath, "w") as f:
+            json.dump({"agents": [{"id": "AGENT009"}]}, f)
+
+        manager = RealEstateDataManager(temp_data_dir, snapshot_dir=snapshot_dir)
+        assert [a["id"] for a in manager.get_all_agents()] == ["AGENT009"]
+        assert manager.get_agent_by_id("AGENT009") is not None
+
+        # The rebuilt entry serves the next start
+        manager = self.cached_manager(temp_data_dir, snapshot_dir)
+        assert manager.get_agent_by_id("AGENT009") is not None
+
+    def test_corrupted_cache_is_detected_and_rebuilt(self, temp_data_dir, snapshot_dir):
+        """Test a checksum mismatch falls back to JSON and rewrites the entry"""
+        cache_path = os.path.join(snapshot_dir, "properties.snapshot")
+        with open(cache_path, "r+b") as f:
+            f.seek(-8, os.SEEK_END)
+            byte = f.read(1)
+            f.seek(-8, os.SEEK_END)
+            f.write(bytes([byte[0] ^ 0xFF]))
+
+        manager = RealEstateDataManager(temp_data_dir, snapshot_dir=snapshot_dir)
+        assert manager.get_property_by_id("TEST002") is not None
+
+        manager = self.cached_manager(temp_data_dir, snapshot_dir)
+        assert manager.get_property_by_id("TEST002") is not None
+
+    def test_refresh_rewrites_reloaded_entries(self, temp_data_dir, snapshot_dir):
+        """Test datasets reloaded by a refresh replace their cache entries"""
+        manager = RealEstateDataManager(temp_data_dir, snapshot_dir=snapshot_dir)
+        manager.snapshot().warm(["agents", "market"])
+        for name, document in (
+            ("agents", {"agents": [{"id": "AGENT009"}]}),
+            ("market", {"market_overview": {"market_type": "Buyer's market"}}),
+        ):
+            with open(os.path.join(temp_data_dir, DATASET_FILES[name]), "w") as f:
+                json.dump(document, f)
+        assert sorted(manager.refresh_data()["reloaded"]) == ["agents", "market"]
+
+        manager = self.cached_manager(temp_data_dir, snapshot_dir)
+        assert manager.get_agent_by_id("AGENT009") is not None
+        assert manager.get_market_overview()["market_type"] == "Buyer's market"
+
+    def test_get_data_manager_caches_only_when_configured(
+        self, temp_data_dir, monkeypatch
+    ):
+        """Test the shared manager only caches snapshots in a configured directory"""
+        monkeypatch.setattr(utils, "_data_manager", None)
+        monkeypatch.setenv(utils.DATA_DIR_ENV, temp_data_dir)
+        monkeypatch.delenv(utils.SNAPSHOT_DIR_ENV, raising=False)
+        assert utils.get_data_manager().snapshot_dir is None
+
+        monkeypatch.setattr(utils, "_data_manager", None)
+        monkeypatch.setenv(utils.SNAPSHOT_DIR_ENV, temp_data_dir + ".snapshot")
+        assert utils.get_data_manager().snapshot_dir == temp_data_dir + ".snapshot"
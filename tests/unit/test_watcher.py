@@ -0,0 +1,141 @@
+"""
+Unit tests for watcher.py - debounced background reloads
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+import watcher
+from sqlite_backend import SQLiteDataManager, import_json
+from watcher import DataWatcher
+
+
+async def wait_for(condition, timeout=5.0):
+    """Poll until the condition holds or the timeout expires"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.02)
+
+
+def write_agents(temp_data_dir, agents):
+    """Overwrite the agents data file"""
+    filepath = os.path.join(temp_data_dir, "agents", "agent_profiles.json")
+    with open(filepath, "w") as f:
+        json.dump({"agents": agents}, f)
+
+
+class TestDataWatcher:
+    """Test the polling data watcher"""
+
+    @pytest.mark.asyncio
+    async def test_reloads_changed_file(self, test_data_manager, temp_data_dir):
+        """Test a file change triggers an incremental reload"""
+        test_data_manager.get_all_agents()
+        data_watcher = DataWatcher(
+            test_data_manager, poll_interval=0.02, debounce=0.1, use_inotify=False
+        )
+        data_watcher.start()
+        try:
+            assert watcher.active_watcher is data_watcher
+            await asyncio.sleep(0.05)
+            write_agents(temp_data_dir, [{"id": "AGENT100"}])
+
+            await wait_for(lambda: data_watcher.metrics["reloads"] == 1)
+        finally:
+            await data_watcher.stop()
+
+        assert watcher.active_watcher is None
+        assert test_data_manager.get_agent_by_id("AGENT100") is not None
+        assert list(data_watcher.metrics["last_reloaded"]) == ["agents"]
+        assert data_watcher.metrics["last_reload_seconds"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_debounces_bursts(self, test_data_manager, temp_data_dir):
+        """Test a burst of writes results in a single reload"""
+        data_watcher = DataWatcher(
+            test_data_manager, poll_interval=0.02, debounce=0.3, use_inotify=False
+        )
+        data_watcher.start()
+        try:
+            await asyncio.sleep(0.05)
+            for i in range(5):
+                write_agents(temp_data_dir, [{"id": f"AGENT{i}"}] * (i + 1))
+                await asyncio.sleep(0.05)
+
+            await wait_for(lambda: data_watcher.metrics["reloads"] >= 1)
+            await asyncio.sleep(0.4)
+        finally:
+            await data_watcher.stop()
+
+        assert data_watcher.metrics["reloads"] == 1
+        assert test_data_manager.get_agent_by_id("AGENT4") is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_reload_is_recorded(self, test_data_manager, temp_data_dir):
+        """Test the watcher survives a reload error"""
+
+        def broken_refresh():
+            raise RuntimeError("disk on fire")
+
+        test_data_manager.refresh_data = broken_refresh
+        data_watcher = DataWatcher(
+            test_data_manager, poll_interval=0.02, debounce=0.05, use_inotify=False
+        )
+        data_watcher.start()
+        try:
+            await asyncio.sleep(0.05)
+            write_agents(temp_data_dir, [])
+            await wait_for(lambda: data_watcher.metrics["failed_reloads"] == 1)
+        finally:
+            await data_watcher.stop()
+
+        assert "disk on fire" in data_watcher.metrics["last_error"]
+
+    @pytest.mark.asyncio
+    async def test_sqlite_reloads_only_for_imports(self, temp_data_dir, tmp_path):
+        """Test database reads and journal writes do not trigger reloads"""
+        database = str(tmp_path / "real_estate.db")
+        import_json(temp_data_dir, database)
+        manager = SQLiteDataManager(database)
+        data_watcher = DataWatcher(
+            manager, poll_interval=0.02, debounce=0.05, use_inotify=False
+        )
+        data_watcher.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert manager.get_property_by_id("TEST001") is not None
+            for suffix in ("-wal", "-shm", ".importing"):
+                with open(database + suffix, "ab") as f:
+                    f.write(b"\0" * 64)
+            await asyncio.sleep(0.3)
+            assert data_watcher.metrics["reloads"] == 0
+
+            import_json(temp_data_dir, database)
+            await wait_for(lambda: data_watcher.metrics["reloads"] == 1)
+        finally:
+            await data_watcher.stop()
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(watcher.inotify_simple is None, reason="needs inotify_simple")
+    async def test_inotify_watches_new_directories(
+        self, test_data_manager, temp_data_dir
+    ):
+        """Test files in a directory created after startup are watched"""
+        data_watcher = DataWatcher(test_data_manager, debounce=0.05)
+        data_watcher.start()
+        try:
+            await asyncio.sleep(0.05)
+            new_dir = os.path.join(temp_data_dir, "imports")
+            os.mkdir(new_dir)
+            await wait_for(lambda: data_watcher.metrics["reloads"] == 1)
+
+            with open(os.path.join(new_dir, "listings.json"), "w") as f:
+                json.dump({}, f)
+            await wait_for(lambda: data_watcher.metrics["reloads"] == 2)
+        finally:
+            await data_watcher.stop()
@@ -0,0 +1,268 @@
+"""
+Full-Text Index
+Inverted token index answering case-insensitive substring queries,
+with optional BM25 relevance ranking
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Split lower-cased text into word tokens"""
+    return _TOKEN_RE.findall(text)
+
+
+def query_tokens(query_lower: str) -> List[Tuple[str, bool, bool]]:
+    """Tokens of a lower-cased query, each with whether it is open on the
+    left and on the right (may match the end or start of a longer term)"""
+    return [
+        (match.group(), match.start() == 0, match.end() == len(query_lower))
+        for match in _TOKEN_RE.finditer(query_lower)
+    ]
+
+
+def bm25_idf(documents: int, matching: int) -> float:
+    """Inverse document frequency of a term found in ``matching`` records"""
+    return math.log(1 + (documents - matching + 0.5) / (matching + 0.5))
+
+
+def bm25_term(idf: float, frequency: int, length: int, average_length: float) -> float:
+    """One term's BM25 contribution to the score of a record"""
+    norm = 1 - BM25_B + BM25_B * length / average_length
+    return idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+
+
+def top_scores(
+    scores: Dict[int, float], limit: Optional[int], min_score: Optional[float]
+) -> List[Tuple[int, float]]:
+    """(row, score) pairs ordered best first, ties in row order
+
+    With a ``limit`` only that many rows are kept, using a bounded heap
+    instead of sorting every score.
+    """
+    if limit is not None and limit <= 0:
+        return []
+    scored = (
+        (score, row)
+        for row, score in scores.items()
+        if min_score is None or score >= min_score
+    )
+
+    def order(item):
+        return item[0], -item[1]
+
+    if limit is None:
+        ranked = sorted(scored, key=order, reverse=True)
+    else:
+        ranked = heapq.nlargest(limit, scored, key=order)
+    return [(row, score) for score, row in ranked]
+
+
+class TextIndex:
+    """Inverted index over one searchable text per record
+
+    Queries keep the semantics of ``query.lower() in text`` where ``text`` is
+    the record's lower-cased searchable text. Tokens are maximal runs of word
+    characters, so every query token bounded by a non-word character (or by
+    the other query tokens) must appear as a whole token of a matching
+    record. Only the first and last query tokens can be partial, as a
+    suffix or prefix of a record token. Posting lists narrow the records to
+    candidates, and each candidate is then checked with an exact substring
+    test.
+
+    Term frequencies and document lengths are kept alongside the postings so
+    matches can be ranked with BM25.
+    """
+
+    def __init__(self, records: List[Any], text_func: Callable[[Any], str]):
+        self.records = records
+        self.text_func = text_func
+        self.postings: Dict[str, List[int]] = {}
+        self.frequencies: Dict[str, List[int]] = {}
+        self.lengths: List[int] = []
+
+        for row, record in enumerate(records):
+            tokens = tokenize(text_func(record))
+            self.lengths.append(len(tokens))
+            for token, count in Counter(tokens).items():
+                self.postings.setdefault(token, []).append(row)
+                self.frequencies.setdefault(token, []).append(count)
+
+        self.average_length = sum(self.lengths) / len(records) if records else 0.0
+
+        # Sorted vocabularies for prefix and suffix expansion
+        self._terms = sorted(self.postings)
+        self._reversed_terms = sorted(term[::-1] for term in self.postings)
+
+    def search(self, query: str) -> List[int]:
+        """Row positions of records containing the query, in record order"""
+        query_lower = query.lower()
+        matches = list(_TOKEN_RE.finditer(query_lower))
+        if not matches:
+            # Nothing to look up (empty or punctuation-only query)
+            return self._scan(query_lower, range(len(self.records)))
+
+        expansions = [self._expand(match, len(query_lower)) for match in matches]
+        candidates = None
+        for terms in sorted(expansions, key=len):
+            rows = self._rows_for_terms(terms)
+            candidates = rows if candidates is None else candidates & rows
+            if not candidates:
+                return []
+
+        if len(matches) == 1 and matches[0].group() == query_lower:
+            # A bare word matches exactly the records holding a term containing it
+            return sorted(candidates)
+        return self._scan(query_lower, sorted(candidates))
+
+    def rank(
+        self, query: str, limit: Optional[int] = None, min_score: Optional[float] = None
+    ) -> List[Tuple[int, float]]:
+        """Matching rows ordered by BM25 score, best first
+
+        Matches are the same rows ``search`` returns. Each query token is
+        scored over the index terms it expands to. With a ``limit`` only
+        that many rows are kept, using a bounded heap instead of sorting all
+        matches. Ties keep record order.
+        """
+        return top_scores(self._scores(query), limit, min_score)
+
+    def count(self, query: str, min_score: Optional[float] = None) -> int:
+        """Number of rows ``rank`` returns without a limit, counted in one
+        pass over the scores instead of ranking them"""
+        if min_score is None:
+            return len(self.search(query))
+        return sum(score >= min_score for score in self._scores(query).values())
+
+    def _scores(self, query: str) -> Dict[int, float]:
+        """BM25 score of every row ``search`` returns, in record order"""
+        query_lower = query.lower()
+        scores = dict.fromkeys(self.search(query), 0.0)
+        for match in _TOKEN_RE.finditer(query_lower):
+            for term in self._expand(match, len(query_lower)):
+                self._accumulate_bm25(term, scores)
+        return scores
+
+    def _accumulate_bm25(self, term: str, scores: Dict[int, float]):
+        """Add one term's BM25 contribution to the scores of matching rows"""
+        rows = self.postings[term]
+        idf = bm25_idf(len(self.records), len(rows))
+        average_length = self.average_length or 1.0
+        for row, frequency in zip(rows, self.frequencies[term]):
+            if row in scores:
+                scores[row] += bm25_term(
+                    idf, frequency, self.lengths[row], average_length
+                )
+
+    def _expand(self, match: "re.Match", query_length: int) -> List[str]:
+        """Index terms a query token can match in a record's text"""
+        token = match.group()
+        open_left = match.start() == 0
+        open_right = match.end() == query_length
+
+        if open_left and open_right:
+            return [term for term in self._terms if token in term]
+        if open_right:
+            return self._with_prefix(self._terms, token)
+        if open_left:
+            return [
+                term[::-1]
+                for term in self._with_prefix(self._reversed_terms, token[::-1])
+            ]
+        return [token] if token in self.postings else []
+
+    @staticmethod
+    def _with_prefix(terms: List[str], prefix: str) -> List[str]:
+        """Terms in a sorted list that start with the prefix"""
+        start = bisect_left(terms, prefix)
+        end = start
+        while end < len(terms) and terms[end].startswith(prefix):
+            end += 1
+        return terms[start:end]
+
+    def _rows_for_terms(self, terms: Iterable[str]) -> Set[int]:
+        """Union of the posting lists for the terms"""
+        rows = set()
+        for term in terms:
+            rows.update(self.postings[term])
+        return rows
+
+    def _scan(self, query_lower: str, rows: Iterable[int]) -> List[int]:
+        """Rows whose searchable text contains the query"""
+        return [row for row in rows if query_lower in self.text_func(self.records[row])]
+
+
+class TrigramIndex:
+    """Trigram index over the distinct lower-cased strings of each record
+
+    Answers "which records have a string containing this needle" (the
+    ``PropertyFilter.features`` predicate) by intersecting trigram posting
+    lists to find candidate strings. Only those candidates get a substring
+    test, and the matches are then mapped back to record rows. Each distinct
+    string is lower-cased and checked once, however many records share it.
+    """
+
+    def __init__(self, records: List[Any], values_func: Callable[[Any], Iterable]):
+        self.strings: List[str] = []
+        self.rows_by_string: List[List[int]] = []
+        self.trigrams: Dict[str, List[int]] = {}
+        string_ids: Dict[str, int] = {}
+
+        for row, record in enumerate(records):
+            for value in values_func(record):
+                if not isinstance(value, str):
+                    continue
+                normalized = value.lower()
+                string_id = string_ids.get(normalized)
+                if string_id is None:
+                    string_id = string_ids[normalized] = len(self.strings)
+                    self.strings.append(normalized)
+                    self.rows_by_string.append([])
+                    for trigram in _trigrams(normalized):
+                        self.trigrams.setdefault(trigram, []).append(string_id)
+                rows = self.rows_by_string[string_id]
+                if not rows or rows[-1] != row:
+                    rows.append(row)
+
+    def rows_containing(self, needle: str) -> Set[int]:
+        """Rows with at least one string containing the needle, ignoring case"""
+        needle_lower = needle.lower()
+        trigrams = _trigrams(needle_lower)
+        if trigrams:
+            candidates = None
+            for trigram in sorted(
+                trigrams, key=lambda t: len(self.trigrams.get(t, ()))
+            ):
+                string_ids = self.trigrams.get(trigram, ())
+                candidates = (
+                    set(string_ids)
+                    if candidates is None
+                    else candidates & set(string_ids)
+                )
+                if not candidates:
+                    return set()
+        else:
+            # Needles shorter than a trigram are checked against every string
+            candidates = range(len(self.strings))
+
+        rows = set()
+        for string_id in candidates:
+            if needle_lower in self.strings[string_id]:
+                rows.update(self.rows_by_string[string_id])
+        return rows
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Distinct three-character substrings of the text"""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
@@ -2,119 +2,191 @@
 Agent-related MCP tools
 """
 
-import json
+from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
 
-from utils import data_manager
+from pagination import Pager
+from projection import parse_fields, project, project_all
+from serializer import dumps
+from utils import agent_dashboard_response, data_manager
 
 
 def register_agent_tools(mcp: FastMCP):
     """Register all agent-related tools with the MCP server"""
 
     @mcp.tool()
-    def get_all_agents() -> str:
-        """Get all real estate agent profiles"""
-        agents = data_manager.get_all_agents()
-        return json.dumps(agents, indent=2)
+    def get_all_agents(
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        pretty: Optional[bool] = None,
+    ) -> str:
+        """Get real estate agent profiles, a page at a time (50 by default, up to 500).
+        Pass the next_cursor of a response as cursor to get the following page.
+        Set fields to summary, card or full, or to comma-separated field names, to return only those fields.
+        """
+        snapshot = data_manager.snapshot()
+        pager = Pager(snapshot.dataset_versions["agents"], ("get_all_agents",))
+        try:
+            keep = parse_fields("agent", fields, snapshot)
+            page = pager.page(
+                snapshot.get_agents_page, snapshot.count_agents, limit, cursor
+            )
+        except ValueError as error:
+            return str(error)
+        return dumps(
+            {
+                "total_count": page.total_count,
+                "results_count": len(page.items),
+                "agents": project_all(page.items, keep),
+                "next_cursor": page.next_cursor,
+            },
+            pretty,
+        )
 
     @mcp.tool()
-    def get_agent_details(agent_id: str) -> str:
-        """Get detailed information about a specific agent by ID"""
+    def get_agent_details(
+        agent_id: str, fields: Optional[str] = None, pretty: Optional[bool] = None
+    ) -> str:
+        """Get detailed information about a specific agent by ID.
+        Set fields to summary, card or full, or to comma-separated field names, to return only those fields.
+        """
+        try:
+            keep = parse_fields("agent", fields, data_manager)
+        except ValueError as error:
+            return str(error)
         agent = data_manager.get_agent_by_id(agent_id)
         if agent:
-            return json.dumps(agent, indent=2)
+            return dumps(project(agent, keep), pretty)
         return f"Agent with ID {agent_id} not found"
 
     @mcp.tool()
-    def search_agents(query: str) -> str:
-        """Search agents by name, specialization, or expertise area"""
-        results = data_manager.search_agents(query)
-        return json.dumps(
-            {"query": query, "results_count": len(results), "agents": results}, indent=2
+    def search_agents(
+        query: str,
+        limit: Optional[int] = None,
+        min_score: Optional[float] = None,
+        ranked: bool = False,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        pretty: Optional[bool] = None,
+    ) -> str:
+        """Search agents by name, specialization, or expertise area.
+        Set ranked to get matches ordered by relevance, best first, with their scores;
+        min_score keeps only matches scoring at least that much and implies ranked.
+        Results come 50 per page by default (limit up to 500); pass next_cursor as cursor for the next page.
+        Set fields to summary, card or full, or to comma-separated field names, to return only those fields.
+        """
+        snapshot = data_manager.snapshot()
+        ranked = ranked or min_score is not None
+        pager = Pager(
+            snapshot.dataset_versions["agents"],
+            ("search_agents", query.lower(), ranked, min_score),
+        )
+        try:
+            keep = parse_fields("agent", fields, snapshot)
+            if not ranked:
+                page = pager.slice(snapshot.search_agents(query), limit, cursor)
+            else:
+                page = pager.page(
+                    lambda offset, size: snapshot.rank_agents(
+                        query, offset + size, min_score
+                    )[offset:],
+                    lambda: snapshot.count_ranked_agents(query, min_score),
+                    limit,
+                    cursor,
+                )
+        except ValueError as error:
+            return str(error)
+
+        response = {"query": query}
+        if ranked:
+            response["ranked"] = True
+            agents = [
+                dict(project(agent, keep), relevance_score=round(score, 4))
+                for agent, score in page.items
+            ]
+        else:
+            agents = project_all(page.items, keep)
+        response.update(
+            total_count=page.total_count,
+            results_count=len(agents),
+            agents=agents,
+            next_cursor=page.next_cursor,
         )
+        return dumps(response, pretty)
 
     @mcp.tool()
-    def get_agent_properties(agent_id: str) -> str:
-        """Get all properties handled by a specific agent"""
-        properties = data_manager.get_properties_by_agent(agent_id)
-        agent = data_manager.get_agent_by_id(agent_id)
-
-        return json.dumps(
+    def get_agent_properties(
+        agent_id: str, fields: Optional[str] = None, pretty: Optional[bool] = None
+    ) -> str:
+        """Get all properties handled by a specific agent.
+        Set fields to summary, card or full, or to comma-separated property field names.
+        """
+        try:
+            keep = parse_fields("property", fields, data_manager)
+        except ValueError as error:
+            return str(error)
+        snapshot = data_manager.snapshot()
+        properties = snapshot.get_properties_by_agent(agent_id)
+        agent = snapshot.get_agent_by_id(agent_id)
+
+        return dumps(
             {
                 "agent_id": agent_id,
                 "agent_name": agent.get("name", "Unknown") if agent else "Unknown",
                 "properties_count": len(properties),
-                "properties": properties,
+                "properties": project_all(properties, keep),
             },
-            indent=2,
+            pretty,
         )
 
     @mcp.tool()
-    def get_agent_sales(agent_id: str) -> str:
+    def get_agent_sales(agent_id: str, pretty: Optional[bool] = None) -> str:
         """Get recent sales by a specific agent"""
-        sales = data_manager.get_sales_by_agent(agent_id)
-        agent = data_manager.get_agent_by_id(agent_id)
+        snapshot = data_manager.snapshot()
+        sales = snapshot.get_sales_by_agent(agent_id)
+        agent = snapshot.get_agent_by_id(agent_id)
 
-        return json.dumps(
+        return dumps(
             {
                 "agent_id": agent_id,
                 "agent_name": agent.get("name", "Unknown") if agent else "Unknown",
                 "sales_count": len(sales),
                 "sales": sales,
             },
-            indent=2,
+            pretty,
         )
 
     @mcp.tool()
-    def get_agent_clients(agent_id: str) -> str:
-        """Get all clients for a specific agent"""
-        clients = data_manager.get_clients_by_agent(agent_id)
-        agent = data_manager.get_agent_by_id(agent_id)
-
-        return json.dumps(
+    def get_agent_clients(
+        agent_id: str, fields: Optional[str] = None, pretty: Optional[bool] = None
+    ) -> str:
+        """Get all clients for a specific agent.
+        Set fields to summary, card or full, or to comma-separated client field names.
+        """
+        try:
+            keep = parse_fields("client", fields, data_manager)
+        except ValueError as error:
+            return str(error)
+        snapshot = data_manager.snapshot()
+        clients = snapshot.get_clients_by_agent(agent_id)
+        agent = snapshot.get_agent_by_id(agent_id)
+
+        return dumps(
             {
                 "agent_id": agent_id,
                 "agent_name": agent.get("name", "Unknown") if agent else "Unknown",
                 "clients_count": len(clients),
-                "clients": clients,
+                "clients": project_all(clients, keep),
             },
-            indent=2,
+            pretty,
         )
 
     @mcp.tool()
-    def get_agent_dashboard(agent_id: str) -> str:
+    def get_agent_dashboard(agent_id: str, pretty: Optional[bool] = None) -> str:
         """Get comprehensive dashboard for an agent including performance metrics"""
-        agent = data_manager.get_agent_by_id(agent_id)
-        if not agent:
+        dashboard = data_manager.get_agent_dashboard(agent_id)
+        if not dashboard:
             return f"Agent with ID {agent_id} not found"
-
-        properties = data_manager.get_properties_by_agent(agent_id)
-        clients = data_manager.get_clients_by_agent(agent_id)
-        sales = data_manager.get_sales_by_agent(agent_id)
-
-        # Calculate performance metrics
-        recent_sales = agent.get("recent_sales", [])
-        total_sales_volume = sum(sale.get("sale_price", 0) for sale in recent_sales)
-        avg_days_on_market = (
-            sum(sale.get("days_on_market", 0) for sale in recent_sales)
-            / len(recent_sales)
-            if recent_sales
-            else 0
-        )
-
-        dashboard = {
-            "agent_info": agent,
-            "performance_metrics": {
-                "active_listings": len(properties),
-                "total_clients": len(clients),
-                "recent_sales_count": len(recent_sales),
-                "total_sales_volume": total_sales_volume,
-                "avg_days_on_market": avg_days_on_market,
-            },
-            "active_listings": properties,
-            "clients": clients,
-            "recent_sales": sales,
-        }
-
-        return json.dumps(dashboard, indent=2)
+        return dumps(agent_dashboard_response(dashboard), pretty)
@@ -2,83 +2,79 @@
 Area and amenities MCP tools
 """
 
-import json
+from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
 
-from utils import data_manager
+from serializer import dumps
+from utils import area_report_response, data_manager
 
 
 def register_area_tools(mcp: FastMCP):
     """Register all area and amenities tools with the MCP server"""
 
     @mcp.tool()
-    def get_all_areas() -> str:
+    def get_all_areas(pretty: Optional[bool] = None) -> str:
         """Get information about all areas in the city"""
         areas = data_manager.get_all_areas()
-        return json.dumps(areas, indent=2)
+        return dumps(areas, pretty)
 
     @mcp.tool()
-    def get_area_details(area_name: str) -> str:
+    def get_area_details(area_name: str, pretty: Optional[bool] = None) -> str:
         """Get detailed information about a specific area"""
         area_info = data_manager.get_area_info(area_name)
         if area_info:
-            return json.dumps(area_info, indent=2)
+            return dumps(area_info, pretty)
         return f"Area '{area_name}' not found"
 
     @mcp.tool()
-    def get_city_overview() -> str:
+    def get_city_overview(pretty: Optional[bool] = None) -> str:
         """Get overall city information and demographics"""
-        overview = data_manager.get_city_overview()
-        return json.dumps(overview, indent=2)
+        return data_manager.response_cache.get(
+            data_manager.snapshot(),
+            "tool:get_city_overview",
+            ("areas",),
+            lambda snapshot: snapshot.get_city_overview(),
+            pretty,
+        )
 
     @mcp.tool()
-    def get_area_amenities(area: str) -> str:
+    def get_area_amenities(area: str, pretty: Optional[bool] = None) -> str:
         """Get amenities (schools, parks, shopping) for a specific area"""
         amenities = data_manager.get_area_amenities(area)
-        return json.dumps({"area": area, "amenities": amenities}, indent=2)
+        return dumps({"area": area, "amenities": amenities}, pretty)
 
     @mcp.tool()
-    def get_schools_data() -> str:
+    def get_schools_data(pretty: Optional[bool] = None) -> str:
         """Get all schools information including ratings and programs"""
-        schools = data_manager.amenities.get("schools", {})
-        return json.dumps(schools, indent=2)
+        return data_manager.response_cache.get(
+            data_manager.snapshot(),
+            "tool:get_schools_data",
+            ("amenities",),
+            lambda snapshot: snapshot.get_amenities_by_type("schools"),
+            pretty,
+        )
 
     @mcp.tool()
-    def get_parks_and_recreation() -> str:
+    def get_parks_and_recreation(pretty: Optional[bool] = None) -> str:
         """Get parks and recreation facilities information"""
-        parks_rec = data_manager.amenities.get("parks_and_recreation", {})
-        return json.dumps(parks_rec, indent=2)
+        parks_rec = data_manager.get_amenities_by_type("parks_and_recreation")
+        return dumps(parks_rec, pretty)
 
     @mcp.tool()
-    def get_shopping_amenities() -> str:
+    def get_shopping_amenities(pretty: Optional[bool] = None) -> str:
         """Get shopping centers and retail information"""
-        shopping = data_manager.amenities.get("shopping", {})
-        return json.dumps(shopping, indent=2)
+        shopping = data_manager.get_amenities_by_type("shopping")
+        return dumps(shopping, pretty)
 
     @mcp.tool()
-    def get_healthcare_facilities() -> str:
+    def get_healthcare_facilities(pretty: Optional[bool] = None) -> str:
         """Get healthcare facilities and medical services"""
-        healthcare = data_manager.amenities.get("healthcare", {})
-        return json.dumps(healthcare, indent=2)
+        healthcare = data_manager.get_amenities_by_type("healthcare")
+        return dumps(healthcare, pretty)
 
     @mcp.tool()
-    def get_comprehensive_area_report(area: str) -> str:
+    def get_comprehensive_area_report(area: str, pretty: Optional[bool] = None) -> str:
         """Get a comprehensive report for an area including properties, market data, and amenities"""
-        # Get area info
-        area_info = data_manager.get_area_info(area)
-        market_data = data_manager.get_area_market_data(area)
-        properties = data_manager.get_properties_by_area(area)
-        sales = data_manager.get_sales_by_area(area)
-        amenities = data_manager.get_area_amenities(area)
-
-        report = {
-            "area": area,
-            "area_info": area_info,
-            "market_data": market_data,
-            "active_properties": {"count": len(properties), "properties": properties},
-            "recent_sales": {"count": len(sales), "sales": sales},
-            "amenities": amenities,
-        }
-
-        return json.dumps(report, indent=2)
+        report = data_manager.get_comprehensive_area_report(area)
+        return dumps(area_report_response(area, report), pretty)
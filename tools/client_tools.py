@@ -2,10 +2,13 @@
 Client management MCP tools
 """
 
-import json
+from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
 
+from pagination import Pager
+from projection import parse_fields, project, project_all
+from serializer import dumps
 from utils import PropertyFilter, data_manager
 
 
@@ -13,23 +16,64 @@ def register_client_tools(mcp: FastMCP):
     """Register all client management tools with the MCP server"""
 
     @mcp.tool()
-    def get_all_clients() -> str:
-        """Get all client information"""
-        clients = data_manager.get_all_clients()
-        return json.dumps(clients, indent=2)
+    def get_all_clients(
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        pretty: Optional[bool] = None,
+    ) -> str:
+        """Get client information, a page at a time (50 by default, up to 500).
+        Pass the next_cursor of a response as cursor to get the following page.
+        Set fields to summary, card or full, or to comma-separated field names, to return only those fields.
+        """
+        snapshot = data_manager.snapshot()
+        pager = Pager(snapshot.dataset_versions["clients"], ("get_all_clients",))
+        try:
+            keep = parse_fields("client", fields, snapshot)
+            page = pager.page(
+                snapshot.get_clients_page, snapshot.count_clients, limit, cursor
+            )
+        except ValueError as error:
+            return str(error)
+        return dumps(
+            {
+                "total_count": page.total_count,
+                "results_count": len(page.items),
+                "clients": project_all(page.items, keep),
+                "next_cursor": page.next_cursor,
+            },
+            pretty,
+        )
 
     @mcp.tool()
-    def get_client_details(client_id: str) -> str:
-        """Get detailed information about a specific client by ID"""
+    def get_client_details(
+        client_id: str, fields: Optional[str] = None, pretty: Optional[bool] = None
+    ) -> str:
+        """Get detailed information about a specific client by ID.
+        Set fields to summary, card or full, or to comma-separated field names, to return only those fields.
+        """
+        try:
+            keep = parse_fields("client", fields, data_manager)
+        except ValueError as error:
+            return str(error)
         client = data_manager.get_client_by_id(client_id)
         if client:
-            return json.dumps(client, indent=2)
+            return dumps(project(client, keep), pretty)
         return f"Client with ID {client_id} not found"
 
     @mcp.tool()
-    def match_client_preferences(client_id: str) -> str:
-        """Match properties to a client's preferences and budget"""
-        client = data_manager.get_client_by_id(client_id)
+    def match_client_preferences(
+        client_id: str, fields: Optional[str] = None, pretty: Optional[bool] = None
+    ) -> str:
+        """Match properties to a client's preferences and budget.
+        Set fields to summary, card or full, or to comma-separated property field names.
+        """
+        try:
+            keep = parse_fields("property", fields, data_manager)
+        except ValueError as error:
+            return str(error)
+        snapshot = data_manager.snapshot()
+        client = snapshot.get_client_by_id(client_id)
         if not client:
             return f"Client with ID {client_id} not found"
 
@@ -50,15 +94,15 @@ def register_client_tools(mcp: FastMCP):
             ),
         )
 
-        matching_properties = data_manager.filter_properties(filters)
+        matching_properties = snapshot.filter_properties(filters)
 
-        return json.dumps(
+        return dumps(
             {
                 "client_id": client_id,
                 "client_name": client.get("name"),
                 "preferences": preferences,
                 "matching_properties_count": len(matching_properties),
-                "matching_properties": matching_properties,
+                "matching_properties": project_all(matching_properties, keep),
             },
-            indent=2,
+            pretty,
         )
@@ -2,10 +2,12 @@
 Market analysis MCP tools
 """
 
-import json
+from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
 
+from pagination import Pager
+from serializer import dumps
 from utils import data_manager
 
 
@@ -13,51 +15,67 @@ def register_market_tools(mcp: FastMCP):
     """Register all market analysis tools with the MCP server"""
 
     @mcp.tool()
-    def get_market_overview() -> str:
+    def get_market_overview(pretty: Optional[bool] = None) -> str:
         """Get overall market overview and trends"""
         overview = data_manager.get_market_overview()
-        return json.dumps(overview, indent=2)
+        return dumps(overview, pretty)
 
     @mcp.tool()
-    def get_price_analytics() -> str:
+    def get_price_analytics(pretty: Optional[bool] = None) -> str:
         """Get comprehensive price analytics and market data"""
         analytics = data_manager.get_price_analytics()
-        return json.dumps(analytics, indent=2)
+        return dumps(analytics, pretty)
 
     @mcp.tool()
-    def get_area_market_data(area: str) -> str:
+    def get_area_market_data(area: str, pretty: Optional[bool] = None) -> str:
         """Get market performance data for a specific area"""
         market_data = data_manager.get_area_market_data(area)
         if market_data:
-            return json.dumps({"area": area, "market_data": market_data}, indent=2)
+            return dumps({"area": area, "market_data": market_data}, pretty)
         return f"Market data for area '{area}' not found"
 
     @mcp.tool()
-    def compare_areas(areas: str) -> str:
+    def compare_areas(areas: str, pretty: Optional[bool] = None) -> str:
         """Compare market data across multiple areas (comma-separated list)"""
         area_list = [area.strip() for area in areas.split(",")]
         comparison = data_manager.compare_areas(area_list)
 
-        return json.dumps(
-            {"areas_compared": area_list, "comparison": comparison}, indent=2
-        )
+        return dumps({"areas_compared": area_list, "comparison": comparison}, pretty)
 
     @mcp.tool()
-    def get_investment_opportunities() -> str:
+    def get_investment_opportunities(pretty: Optional[bool] = None) -> str:
         """Get investment opportunities and rental market data"""
         opportunities = data_manager.get_investment_opportunities()
-        return json.dumps(opportunities, indent=2)
+        return dumps(opportunities, pretty)
 
     @mcp.tool()
-    def get_recent_sales() -> str:
-        """Get all recent sales transactions"""
-        sales = data_manager.get_recent_sales()
-        return json.dumps(sales, indent=2)
+    def get_recent_sales(
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        pretty: Optional[bool] = None,
+    ) -> str:
+        """Get recent sales transactions, a page at a time (50 by default, up to 500).
+        Pass the next_cursor of a response as cursor to get the following page."""
+        snapshot = data_manager.snapshot()
+        pager = Pager(snapshot.dataset_versions["transactions"], ("get_recent_sales",))
+        try:
+            page = pager.page(
+                snapshot.get_sales_page, snapshot.count_sales, limit, cursor
+            )
+        except ValueError as error:
+            return str(error)
+        return dumps(
+            {
+                "total_count": page.total_count,
+                "results_count": len(page.items),
+                "sales": page.items,
+                "next_cursor": page.next_cursor,
+            },
+            pretty,
+        )
 
     @mcp.tool()
-    def get_sales_by_area(area: str) -> str:
+    def get_sales_by_area(area: str, pretty: Optional[bool] = None) -> str:
         """Get recent sales in a specific area"""
         sales = data_manager.get_sales_by_area(area)
-        return json.dumps(
-            {"area": area, "sales_count": len(sales), "sales": sales}, indent=2
-        )
+        return dumps({"area": area, "sales_count": len(sales), "sales": sales}, pretty)
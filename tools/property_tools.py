@@ -2,39 +2,120 @@
 Property-related MCP tools
 """
 
-import json
+from dataclasses import replace
 from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
 
-from utils import PropertyFilter, data_manager
+from pagination import Pager
+from projection import parse_fields, project, project_all
+from serializer import dumps
+from utils import PropertyFilter, data_manager, property_insights_response
 
 
 def register_property_tools(mcp: FastMCP):
     """Register all property-related tools with the MCP server"""
 
     @mcp.tool()
-    def get_all_properties() -> str:
-        """Get all active property listings"""
-        properties = data_manager.get_all_properties()
-        return json.dumps(properties, indent=2)
+    def get_all_properties(
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        pretty: Optional[bool] = None,
+    ) -> str:
+        """Get active property listings, a page at a time (50 by default, up to 500).
+        Pass the next_cursor of a response as cursor to get the following page.
+        Set fields to summary, card or full, or to comma-separated field names, to return only those fields.
+        """
+        snapshot = data_manager.snapshot()
+        pager = Pager(snapshot.dataset_versions["properties"], ("get_all_properties",))
+        try:
+            keep = parse_fields("property", fields, snapshot)
+            page = pager.page(
+                snapshot.get_properties_page, snapshot.count_properties, limit, cursor
+            )
+        except ValueError as error:
+            return str(error)
+        return dumps(
+            {
+                "total_count": page.total_count,
+                "results_count": len(page.items),
+                "properties": project_all(page.items, keep),
+                "next_cursor": page.next_cursor,
+            },
+            pretty,
+        )
 
     @mcp.tool()
-    def get_property_details(property_id: str) -> str:
-        """Get detailed information about a specific property by ID"""
+    def get_property_details(
+        property_id: str, fields: Optional[str] = None, pretty: Optional[bool] = None
+    ) -> str:
+        """Get detailed information about a specific property by ID.
+        Set fields to summary, card or full, or to comma-separated field names, to return only those fields.
+        """
+        try:
+            keep = parse_fields("property", fields, data_manager)
+        except ValueError as error:
+            return str(error)
         property_data = data_manager.get_property_by_id(property_id)
         if property_data:
-            return json.dumps(property_data, indent=2)
+            return dumps(project(property_data, keep), pretty)
         return f"Property with ID {property_id} not found"
 
     @mcp.tool()
-    def search_properties(query: str) -> str:
-        """Search properties by text query (address, description, features, etc.)"""
-        results = data_manager.search_properties(query)
-        return json.dumps(
-            {"query": query, "results_count": len(results), "properties": results},
-            indent=2,
+    def search_properties(
+        query: str,
+        limit: Optional[int] = None,
+        min_score: Optional[float] = None,
+        ranked: bool = False,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        pretty: Optional[bool] = None,
+    ) -> str:
+        """Search properties by text query (address, description, features, etc.).
+        Set ranked to get matches ordered by relevance, best first, with their scores;
+        min_score keeps only matches scoring at least that much and implies ranked.
+        Results come 50 per page by default (limit up to 500); pass next_cursor as cursor for the next page.
+        Set fields to summary, card or full, or to comma-separated field names, to return only those fields.
+        """
+        snapshot = data_manager.snapshot()
+        ranked = ranked or min_score is not None
+        pager = Pager(
+            snapshot.dataset_versions["properties"],
+            ("search_properties", query.lower(), ranked, min_score),
         )
+        try:
+            keep = parse_fields("property", fields, snapshot)
+            if not ranked:
+                page = pager.slice(snapshot.search_properties(query), limit, cursor)
+            else:
+                page = pager.page(
+                    lambda offset, size: snapshot.rank_properties(
+                        query, offset + size, min_score
+                    )[offset:],
+                    lambda: snapshot.count_ranked_properties(query, min_score),
+                    limit,
+                    cursor,
+                )
+        except ValueError as error:
+            return str(error)
+
+        response = {"query": query}
+        if ranked:
+            response["ranked"] = True
+            properties = [
+                dict(project(prop, keep), relevance_score=round(score, 4))
+                for prop, score in page.items
+            ]
+        else:
+            properties = project_all(page.items, keep)
+        response.update(
+            total_count=page.total_count,
+            results_count=len(properties),
+            properties=properties,
+            next_cursor=page.next_cursor,
+        )
+        return dumps(response, pretty)
 
     @mcp.tool()
     def filter_properties(
@@ -44,75 +125,142 @@ def register_property_tools(mcp: FastMCP):
         max_bedrooms: Optional[int] = None,
         areas: Optional[str] = None,
         property_types: Optional[str] = None,
+        min_bathrooms: Optional[float] = None,
+        max_bathrooms: Optional[float] = None,
+        min_sqft: Optional[int] = None,
+        max_sqft: Optional[int] = None,
+        features: Optional[str] = None,
+        min_list_date: Optional[str] = None,
+        max_list_date: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        explain: bool = False,
+        fields: Optional[str] = None,
+        pretty: Optional[bool] = None,
     ) -> str:
-        """Filter properties by criteria. Areas and property_types should be comma-separated strings."""
-        filters = PropertyFilter(
-            min_price=min_price,
-            max_price=max_price,
-            min_bedrooms=min_bedrooms,
-            max_bedrooms=max_bedrooms,
-            areas=areas.split(",") if areas else None,
-            property_types=property_types.split(",") if property_types else None,
+        """Filter properties by criteria. Areas, property_types and features should be comma-separated strings.
+        Features match case-insensitively as substrings (e.g. "pool" matches "Swimming pool").
+        List dates are YYYY-MM-DD. Set sort_by to price, square_feet, bedrooms or list_date
+        (descending for highest or newest first). Results come 50 per page by default (limit up to 500);
+        pass next_cursor as cursor for the following page, or an offset to jump ahead.
+        Set explain to include the query plan with estimated and actual row counts.
+        Set fields to summary, card or full, or to comma-separated field names, to return only those fields.
+        """
+        try:
+            keep = parse_fields("property", fields, data_manager)
+            filters = PropertyFilter(
+                min_price=min_price,
+                max_price=max_price,
+                min_bedrooms=min_bedrooms,
+                max_bedrooms=max_bedrooms,
+                min_bathrooms=min_bathrooms,
+                max_bathrooms=max_bathrooms,
+                areas=areas.split(",") if areas else None,
+                property_types=property_types.split(",") if property_types else None,
+                min_sqft=min_sqft,
+                max_sqft=max_sqft,
+                features=(
+                    [feature.strip() for feature in features.split(",")]
+                    if features
+                    else None
+                ),
+                min_list_date=min_list_date,
+                max_list_date=max_list_date,
+                sort_by=sort_by,
+                descending=descending,
+            )
+        except ValueError as error:
+            return str(error)
+
+        snapshot = data_manager.snapshot()
+        pager = Pager(
+            snapshot.dataset_versions["properties"],
+            ("filter_properties", filters.cache_key()),
         )
+        plan = None
 
-        results = data_manager.filter_properties(filters)
-        return json.dumps(
-            {
-                "filters_applied": {
-                    "min_price": min_price,
-                    "max_price": max_price,
-                    "min_bedrooms": min_bedrooms,
-                    "max_bedrooms": max_bedrooms,
-                    "areas": areas.split(",") if areas else None,
-                    "property_types": (
-                        property_types.split(",") if property_types else None
-                    ),
-                },
-                "results_count": len(results),
-                "properties": results,
+        def fetch(start: int, size: int):
+            nonlocal plan
+            page_filters = replace(filters, offset=start, limit=size)
+            if not explain:
+                return snapshot.filter_properties(page_filters)
+            results, plan = snapshot.explain_filter(page_filters)
+            return results
+
+        try:
+            page = pager.page(
+                fetch,
+                # The total does not depend on the order, so skip sorting
+                lambda: len(
+                    snapshot.filter_properties(
+                        replace(filters, sort_by=None, descending=False)
+                    )
+                ),
+                limit,
+                cursor,
+                offset,
+            )
+        except ValueError as error:
+            return str(error)
+        response = {
+            "filters_applied": {
+                "min_price": min_price,
+                "max_price": max_price,
+                "min_bedrooms": min_bedrooms,
+                "max_bedrooms": max_bedrooms,
+                "min_bathrooms": min_bathrooms,
+                "max_bathrooms": max_bathrooms,
+                "areas": filters.areas,
+                "property_types": filters.property_types,
+                "min_sqft": min_sqft,
+                "max_sqft": max_sqft,
+                "features": filters.features,
+                "min_list_date": min_list_date,
+                "max_list_date": max_list_date,
             },
-            indent=2,
-        )
+            "total_count": page.total_count,
+            "results_count": len(page.items),
+            "properties": project_all(page.items, keep),
+            "page": {
+                "sort_by": sort_by,
+                "descending": descending,
+                "offset": page.offset,
+                "limit": pager.page_size(limit),
+            },
+            "next_cursor": page.next_cursor,
+        }
+        if plan is not None:
+            response["plan"] = plan
+        return dumps(response, pretty)
 
     @mcp.tool()
-    def get_properties_by_area(area: str) -> str:
-        """Get all properties in a specific area"""
+    def get_properties_by_area(
+        area: str, fields: Optional[str] = None, pretty: Optional[bool] = None
+    ) -> str:
+        """Get all properties in a specific area.
+        Set fields to summary, card or full, or to comma-separated field names, to return only those fields.
+        """
+        try:
+            keep = parse_fields("property", fields, data_manager)
+        except ValueError as error:
+            return str(error)
         properties = data_manager.get_properties_by_area(area)
-        return json.dumps(
+        return dumps(
             {
                 "area": area,
                 "properties_count": len(properties),
-                "properties": properties,
+                "properties": project_all(properties, keep),
             },
-            indent=2,
+            pretty,
         )
 
     @mcp.tool()
-    def get_property_insights(property_id: str) -> str:
+    def get_property_insights(property_id: str, pretty: Optional[bool] = None) -> str:
         """Get comprehensive insights for a property including market context and comparables"""
-        prop = data_manager.get_property_by_id(property_id)
-        if not prop:
+        insights = data_manager.get_property_insights(property_id)
+        if not insights:
             return f"Property with ID {property_id} not found"
-
-        area = prop.get("area")
-        agent = data_manager.get_agent_by_id(prop.get("agent_id"))
-        area_info = data_manager.get_area_info(area)
-        area_market = data_manager.get_area_market_data(area)
-        comparable_sales = data_manager.get_sales_by_area(area)
-        amenities = data_manager.get_area_amenities(area)
-
-        insights = {
-            "property": prop,
-            "listing_agent": agent,
-            "area_context": {
-                "area_info": area_info,
-                "market_data": area_market,
-                "amenities": amenities,
-            },
-            "comparable_sales": {
-                "count": len(comparable_sales),
-                "sales": comparable_sales,
-            },
-        }
-
-        return json.dumps(insights, indent=2)
+        return dumps(property_insights_response(insights), pretty)
@@ -2,10 +2,12 @@
 System and data management MCP tools
 """
 
-import json
+from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
 
+import watcher
+from serializer import dumps
 from utils import data_manager
 
 
@@ -13,43 +15,70 @@ def register_system_tools(mcp: FastMCP):
     """Register all system and data management tools with the MCP server"""
 
     @mcp.tool()
-    def refresh_data() -> str:
-        """Refresh all cached data from files"""
-        data_manager.refresh_data()
-        return "Data cache refreshed successfully"
+    def refresh_data(pretty: Optional[bool] = None) -> str:
+        """Reload data files that changed on disk and report which datasets were reloaded"""
+        report = data_manager.refresh_data()
+        return dumps({"status": "Data cache refreshed successfully", **report}, pretty)
 
     @mcp.tool()
-    def get_data_summary() -> str:
+    def get_reload_metrics(pretty: Optional[bool] = None) -> str:
+        """Get background data watcher status and reload duration metrics"""
+        active = watcher.active_watcher
+        if active is None:
+            return dumps(
+                {
+                    "watching": False,
+                    "message": "Set REAL_ESTATE_WATCH_DATA=1 to reload data automatically",
+                },
+                pretty,
+            )
+        return dumps({"watching": True, **active.metrics}, pretty)
+
+    @mcp.tool()
+    def get_cache_stats(pretty: Optional[bool] = None) -> str:
+        """Get result and response cache hits, misses and evictions, and the data versions"""
+        snapshot = data_manager.snapshot()
+        return dumps(
+            {
+                "data_version": snapshot.version,
+                "dataset_versions": snapshot.dataset_versions,
+                "result_cache": data_manager.result_cache.stats(),
+                "response_cache": data_manager.response_cache.stats(),
+            },
+            pretty,
+        )
+
+    @mcp.tool()
+    def get_data_summary(pretty: Optional[bool] = None) -> str:
         """Get summary statistics of all data in the system"""
+        snapshot = data_manager.snapshot()
+        city = snapshot.get_city_overview()
+        market_overview = snapshot.get_market_overview()
         summary = {
             "properties": {
-                "total_active_listings": len(data_manager.get_all_properties()),
-                "price_range": data_manager.properties.get("price_range", {}),
+                "total_active_listings": snapshot.count_properties(),
+                "price_range": snapshot.get_price_range(),
             },
-            "agents": {"total_agents": len(data_manager.get_all_agents())},
+            "agents": {"total_agents": snapshot.count_agents()},
             "clients": {
-                "total_clients": len(data_manager.get_all_clients()),
-                "lead_sources": data_manager.clients.get("lead_sources", {}),
+                "total_clients": snapshot.count_clients(),
+                "lead_sources": snapshot.get_lead_sources(),
             },
             "sales": {
-                "total_recent_sales": len(data_manager.get_recent_sales()),
-                "sales_summary": data_manager.transactions.get("sales_summary", {}),
+                "total_recent_sales": snapshot.count_sales(),
+                "sales_summary": snapshot.get_sales_summary(),
             },
             "areas": {
-                "total_areas": len(data_manager.get_all_areas()),
+                "total_areas": len(snapshot.get_all_areas()),
                 "city_info": {
-                    "name": data_manager.areas.get("city_name"),
-                    "population": data_manager.areas.get("population"),
+                    "name": city["city_name"],
+                    "population": city["population"],
                 },
             },
             "market": {
-                "current_market_type": data_manager.market.get(
-                    "market_overview", {}
-                ).get("market_type"),
-                "avg_days_on_market": data_manager.market.get(
-                    "market_overview", {}
-                ).get("avg_days_on_market"),
+                "current_market_type": market_overview.get("market_type"),
+                "avg_days_on_market": market_overview.get("avg_days_on_market"),
             },
         }
 
-        return json.dumps(summary, indent=2)
+        return dumps(summary, pretty)
@@ -3,10 +3,27 @@ Real Estate Data Utilities
 Comprehensive utilities for managing and querying real estate data
 """
 
+import gc
+import hashlib
 import json
 import os
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import pickle
+import struct
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import json_stream
+from columnar import ListingColumns
+from planner import RANGE_INDEX_FIELDS, FilterPlan, FilterPlanner
+from records import Agent, Client, Listing, RecordBuilder, Sale
+from response_cache import ResponseCache
+from result_cache import DEFAULT_MAX_ENTRIES, ResultCache
+from storage import DataAccess, DataBackend
+from text_index import TextIndex, TrigramIndex
 
 
 @dataclass
@@ -24,80 +41,483 @@ class PropertyFilter:
     min_sqft: Optional[int] = None
     max_sqft: Optional[int] = None
     features: Optional[List[str]] = None
+    # ISO dates (YYYY-MM-DD); listings without a list_date never match
+    min_list_date: Optional[str] = None
+    max_list_date: Optional[str] = None
+    # Result order and page; without sort_by, results are in listing order
+    sort_by: Optional[str] = None
+    descending: bool = False
+    offset: int = 0
+    limit: Optional[int] = None
+
+    def __post_init__(self):
+        if self.sort_by is not None and self.sort_by not in RANGE_INDEX_FIELDS:
+            raise ValueError(
+                f"Cannot sort by {self.sort_by!r}; "
+                f"expected one of {', '.join(RANGE_INDEX_FIELDS)}"
+            )
+        if self.offset < 0 or (self.limit is not None and self.limit < 0):
+            raise ValueError("offset and limit must not be negative")
+
+    def cache_key(self) -> Tuple:
+        """Hashable form of the filter for result caching
+
+        Filters that select the same listings in the same order share a key:
+        unset and falsy bounds are equivalent, area, type and feature lists
+        are unordered, and features ignore case.
+        """
+        return (
+            self.min_price or None,
+            self.max_price or None,
+            self.min_bedrooms or None,
+            self.max_bedrooms or None,
+            self.min_bathrooms or None,
+            self.max_bathrooms or None,
+            _frozen(self.areas),
+            _frozen(self.property_types),
+            self.min_sqft or None,
+            self.max_sqft or None,
+            _frozen([feature.lower() for feature in self.features or []]),
+            self.min_list_date or None,
+            self.max_list_date or None,
+            self.sort_by,
+            bool(self.sort_by and self.descending),
+            self.offset,
+            self.limit,
+        )
 
 
-class RealEstateDataManager:
-    """Centralized manager for all real estate data"""
+def _frozen(values: Optional[List[Any]]) -> Any:
+    """Order-insensitive hashable form of a filter's value list"""
+    if not values:
+        return None
+    try:
+        return frozenset(values)
+    except TypeError:
+        return tuple(repr(value) for value in values)
+
+
+# Data files relative to the data directory, keyed by dataset name
+DATASET_FILES = {
+    "properties": os.path.join("properties", "active_listings.json"),
+    "agents": os.path.join("agents", "agent_profiles.json"),
+    "market": os.path.join("market", "market_analytics.json"),
+    "clients": os.path.join("clients", "client_database.json"),
+    "amenities": os.path.join("amenities", "local_amenities.json"),
+    "transactions": os.path.join("transactions", "recent_sales.json"),
+    "areas": os.path.join("areas", "city_overview.json"),
+}
+
+# Datasets whose bulk is one array of records, converted to compact record
+# types at load and parsed element by element when the file is big enough
+# (dataset name -> top-level key of the array, record type)
+RECORD_ARRAYS = {
+    "properties": ("active_listings", Listing),
+    "transactions": ("recent_sales", Sale),
+    "agents": ("agents", Agent),
+    "clients": ("clients", Client),
+}
+
+# Files at least this large are parsed with the streaming loader
+STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+# Snapshot cache files: magic, header length, JSON header, pickled payload.
+# Bump the version whenever records or index classes change shape.
+SNAPSHOT_CACHE_MAGIC = b"REMCPSNP"
+SNAPSHOT_CACHE_VERSION = 5
+
+
+class _LazyDataset:
+    """Snapshot attribute that loads its dataset on first access"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, snapshot, owner=None):
+        if snapshot is None:
+            return self
+        return snapshot._load_dataset(self.name)
+
+
+class _LazyIndex:
+    """Snapshot attribute that builds its dataset's indexes on first access"""
+
+    def __init__(self, dataset: str):
+        self.dataset = dataset
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, snapshot, owner=None):
+        if snapshot is None:
+            return self
+        return snapshot._build_indexes(self.dataset)[self.name]
+
+
+def cached_view(*datasets: str):
+    """Cache a snapshot method's results under the versions of ``datasets``
+
+    ``datasets`` declares everything the view reads: its cached results are
+    kept while those datasets are unchanged and recomputed once a refresh
+    reloads any of them. The call arguments form the cache key.
+    """
+
+    def decorate(method: Callable) -> Callable:
+        @wraps(method)
+        def view(self, *args, **kwargs):
+            return self._cached(
+                (method.__name__, args, tuple(sorted(kwargs.items()))),
+                lambda: method(self, *args, **kwargs),
+                datasets,
+            )
+
+        view.depends_on = datasets
+        return view
+
+    return decorate
+
+
+class DataSnapshot(DataAccess):
+    """Immutable view of all datasets together with their indexes
+
+    Once published, a snapshot's contents are never modified, so any number
+    of readers can query it concurrently. Each query runs against a single
+    snapshot, which keeps composite results (dashboards, insights, area
+    reports) internally consistent.
+
+    Datasets may be given already parsed or as loader callables returning
+    ``(data, FileState, indexes)``. Loaders run on first access to the
+    dataset, and each dataset's indexes are built on first access to any of
+    them. After that, both are plain instance attributes. A snapshot built
+    from a ``previous`` one reuses the indexes of every dataset named in
+    ``reuse`` instead of rebuilding them.
+
+    A loader returns prebuilt ``indexes`` when it restored the dataset from
+    the snapshot cache, and None when it parsed the source file. Datasets
+    parsed from source, by a loader or listed in ``parsed``, are handed to
+    ``persist`` once their indexes exist, so the manager can cache them for
+    the next process.
+
+    With a ``columns_path``, the columnar listing fields are mapped
+    read-only from that file, exporting it first if it is missing or was
+    built from other listings.
+
+    With a ``result_cache``, filter and search results and the composite
+    views are cached under the ``dataset_versions`` of the datasets they
+    read. The manager bumps a dataset's version whenever a refresh reloads
+    it, and the overall data ``version`` whenever a refresh changes anything.
+    """
+
+    properties = _LazyDataset()
+    agents = _LazyDataset()
+    market = _LazyDataset()
+    clients = _LazyDataset()
+    amenities = _LazyDataset()
+    transactions = _LazyDataset()
+    areas = _LazyDataset()
+
+    _property_index = _LazyIndex("properties")
+    _properties_by_area = _LazyIndex("properties")
+    _properties_by_agent = _LazyIndex("properties")
+    _listing_columns = _LazyIndex("properties")
+    _feature_index = _LazyIndex("properties")
+    _property_text_index = _LazyIndex("properties")
+    _filter_planner = _LazyIndex("properties")
+    _property_fields = _LazyIndex("properties")
+    _agent_index = _LazyIndex("agents")
+    _agent_text_index = _LazyIndex("agents")
+    _agent_fields = _LazyIndex("agents")
+    _client_index = _LazyIndex("clients")
+    _clients_by_agent = _LazyIndex("clients")
+    _client_fields = _LazyIndex("clients")
+    _sales_by_area = _LazyIndex("transactions")
+    _sales_by_agent = _LazyIndex("transactions")
+    _sale_fields = _LazyIndex("transactions")
+
+    def __init__(
+        self,
+        datasets: Dict[str, Any],
+        file_states: Optional[Dict[str, Optional["FileState"]]] = None,
+        previous: Optional["DataSnapshot"] = None,
+        reuse: Iterable[str] = (),
+        persist: Optional[Callable[..., None]] = None,
+        columns_path: Optional[str] = None,
+        version: int = 0,
+        result_cache: Optional[ResultCache] = None,
+        dataset_versions: Optional[Dict[str, int]] = None,
+        parsed: Iterable[str] = (),
+    ):
+        self.version = version
+        self.dataset_versions = {name: 0 for name in DATASET_FILES}
+        self.dataset_versions.update(dataset_versions or {})
+        self.result_cache = result_cache
+        self.file_states: Dict[str, Optional[FileState]] = dict(file_states or {})
+        # Seconds spent parsing and indexing each dataset in this snapshot
+        self.load_times: Dict[str, float] = {}
+        self.index_times: Dict[str, float] = {}
+        self._loaders: Dict[str, Callable[[], Tuple[Dict[str, Any], Any, Any]]] = {}
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+        self._persist = persist
+        self._columns_path = columns_path
+        # Datasets parsed from source and not yet handed to ``persist``
+        self._unsaved: Set[str] = set(parsed) if persist is not None else set()
+        self._lock = threading.RLock()
+
+        for name in DATASET_FILES:
+            source = datasets.get(name, {})
+            if callable(source):
+                self._loaders[name] = source
+            else:
+                self.__dict__[name] = source
+
+        for name in reuse:
+            if previous is not None and name in previous._indexes:
+                self._publish_indexes(name, previous._indexes[name])
+
+    def _cached(
+        self, key: Hashable, compute: Callable[[], Any], datasets: Iterable[str]
+    ) -> Any:
+        """Result of a query reading ``datasets``, through the result cache if
+        the snapshot has one"""
+        if self.result_cache is None:
+            return compute()
+        versions = tuple(self.dataset_versions[name] for name in datasets)
+        return self.result_cache.get_or_compute(key, versions, compute)
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a dataset has been read into this snapshot"""
+        return name in self.__dict__
+
+    def has_indexes(self, name: str) -> bool:
+        """Check whether a dataset's indexes have been built in this snapshot"""
+        return name in self._indexes
+
+    def warm(self, names: Iterable[str]):
+        """Load the datasets and build their indexes ahead of first use"""
+        for name in names:
+            getattr(self, name)
+            if name in self._INDEX_BUILDERS:
+                self._build_indexes(name)
+
+    def _load_dataset(self, name: str) -> Dict[str, Any]:
+        """Run a dataset's loader once and publish the result"""
+        with self._lock:
+            if name in self.__dict__:
+                return self.__dict__[name]
+
+            start = time.perf_counter()
+            data, state, indexes = self._loaders.pop(name)()
+            self.load_times[name] = time.perf_counter() - start
+            self.file_states[name] = state
+            self.__dict__[name] = data
+            if indexes is not None:
+                if indexes:
+                    self._publish_indexes(name, indexes)
+            elif self._persist is not None:
+                self._unsaved.add(name)
+
+        if name not in self._INDEX_BUILDERS:
+            self._save(name)
+        return data
+
+    def _build_indexes(self, name: str) -> Dict[str, Any]:
+        """Build a dataset's indexes once and publish them as attributes"""
+        # Loading may restore prebuilt indexes from the snapshot cache
+        getattr(self, name)
+        with self._lock:
+            if name in self._indexes:
+                return self._indexes[name]
+
+            start = time.perf_counter()
+            indexes = self._INDEX_BUILDERS[name](self)
+            self.index_times[name] = time.perf_counter() - start
+            self._publish_indexes(name, indexes)
+
+        self._save(name)
+        return indexes
+
+    def save_parsed(self):
+        """Hand every dataset parsed from source to ``persist`` now, except
+        those whose indexes are not built yet (saved once they are)"""
+        for name in list(self._unsaved):
+            if name not in self._INDEX_BUILDERS or name in self._indexes:
+                self._save(name)
+
+    def _save(self, name: str):
+        """Hand a dataset parsed from source, with its indexes, to ``persist``"""
+        with self._lock:
+            if name not in self._unsaved:
+                return
+            self._unsaved.discard(name)
+        self._persist(
+            name,
+            self.__dict__[name],
+            self.file_states.get(name),
+            self._indexes.get(name, {}),
+        )
 
-    def __init__(self, data_dir: str = "data"):
-        self.data_dir = data_dir
-        self._cache = {}
-        self._load_all_data()
+    def _publish_indexes(self, name: str, indexes: Dict[str, Any]):
+        """Expose built indexes as instance attributes"""
+        self.__dict__.update(indexes)
+        self._indexes[name] = indexes
 
-    def _load_json_file(self, filepath: str) -> Dict[str, Any]:
-        """Load JSON file with caching"""
-        if filepath in self._cache:
-            return self._cache[filepath]
+    def _build_property_indexes(self) -> Dict[str, Any]:
+        """Indexes derived from the active listings"""
+        properties = self.get_all_properties()
+        return {
+            "_property_index": self._index_by_id(properties),
+            "_properties_by_area": self._group_by(properties, self._area_key),
+            "_properties_by_agent": self._group_by(properties, self._agent_key),
+            # Columnar listing fields for vectorized filtering (None without NumPy)
+            "_listing_columns": self._build_listing_columns(properties),
+            # Trigram index over listing features for feature predicates
+            "_feature_index": TrigramIndex(
+                properties, lambda prop: prop.get("features") or []
+            ),
+            # Inverted token index for text search
+            "_property_text_index": TextIndex(properties, self._property_search_text),
+            # Column statistics and access path indexes for filter planning
+            "_filter_planner": FilterPlanner.build(properties),
+            "_property_fields": self._field_names(properties),
+        }
 
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self._cache[filepath] = data
-                return data
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+    def _build_listing_columns(self, properties: List[Dict[str, Any]]):
+        """Listing columns, shared through the mapped columns file if configured"""
+        state = self.file_states.get("properties")
+        if self._columns_path is None or state is None:
+            return ListingColumns.build(properties)
+
+        columns = ListingColumns.map_file(self._columns_path, state.sha256)
+        if columns is not None and columns.size == len(properties):
+            return columns
+        columns = ListingColumns.build(properties)
+        if columns is not None and columns.export(self._columns_path, state.sha256):
+            return ListingColumns.map_file(self._columns_path, state.sha256) or columns
+        return columns
+
+    def _build_agent_indexes(self) -> Dict[str, Any]:
+        """Indexes derived from the agent profiles"""
+        agents = self.get_all_agents()
+        return {
+            "_agent_index": self._index_by_id(agents),
+            "_agent_text_index": TextIndex(agents, self._agent_search_text),
+            "_agent_fields": self._field_names(agents),
+        }
 
-    def _load_all_data(self):
-        """Load all data files"""
-        self.properties = self._load_json_file(
-            os.path.join(self.data_dir, "properties", "active_listings.json")
-        )
-        self.agents = self._load_json_file(
-            os.path.join(self.data_dir, "agents", "agent_profiles.json")
-        )
-        self.market = self._load_json_file(
-            os.path.join(self.data_dir, "market", "market_analytics.json")
-        )
-        self.clients = self._load_json_file(
-            os.path.join(self.data_dir, "clients", "client_database.json")
-        )
-        self.amenities = self._load_json_file(
-            os.path.join(self.data_dir, "amenities", "local_amenities.json")
-        )
-        self.transactions = self._load_json_file(
-            os.path.join(self.data_dir, "transactions", "recent_sales.json")
-        )
-        self.areas = self._load_json_file(
-            os.path.join(self.data_dir, "areas", "city_overview.json")
-        )
+    def _build_client_indexes(self) -> Dict[str, Any]:
+        """Indexes derived from the client database"""
+        clients = self.get_all_clients()
+        return {
+            "_client_index": self._index_by_id(clients),
+            "_clients_by_agent": self._group_by(clients, self._agent_key),
+            "_client_fields": self._field_names(clients),
+        }
+
+    def _build_sales_indexes(self) -> Dict[str, Any]:
+        """Indexes derived from the recent sales"""
+        sales = self.get_recent_sales()
+        return {
+            "_sales_by_area": self._group_by(sales, self._area_key),
+            "_sales_by_agent": self._group_by(sales, self._agent_key),
+            "_sale_fields": self._field_names(sales),
+        }
 
-    def refresh_data(self):
-        """Refresh all cached data"""
-        self._cache.clear()
-        self._load_all_data()
+    # Index builders keyed by the dataset they depend on
+    _INDEX_BUILDERS = {
+        "properties": _build_property_indexes,
+        "agents": _build_agent_indexes,
+        "clients": _build_client_indexes,
+        "transactions": _build_sales_indexes,
+    }
+
+    @staticmethod
+    def _index_by_id(records: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """Map each record's ID to the record, keeping the first on duplicates"""
+        index = {}
+        for record in records:
+            index.setdefault(record.get("id"), record)
+        return index
+
+    @staticmethod
+    def _group_by(records: List[Dict[str, Any]], key_func) -> Dict[Any, list]:
+        """Group records by key, preserving their original order"""
+        groups = {}
+        for record in records:
+            groups.setdefault(key_func(record), []).append(record)
+        return groups
+
+    @staticmethod
+    def _field_names(records: List[Dict[str, Any]]) -> Tuple[str, ...]:
+        """Names of the fields held by any of the records, in first-seen order"""
+        names = {}
+        for record in records:
+            names.update(dict.fromkeys(record))
+        return tuple(names)
+
+    @staticmethod
+    def _area_key(record: Dict[str, Any]) -> str:
+        """Case-insensitive area index key"""
+        area = record.get("area", "")
+        return area.lower() if isinstance(area, str) else area
+
+    @staticmethod
+    def _agent_key(record: Dict[str, Any]) -> Any:
+        """Agent index key"""
+        return record.get("agent_id")
+
+    # Record Fields
+    _FIELD_INDEXES = {
+        "properties": "_property_fields",
+        "agents": "_agent_fields",
+        "clients": "_client_fields",
+        "transactions": "_sale_fields",
+    }
+
+    def get_record_fields(self, dataset: str) -> Tuple[str, ...]:
+        """Get the names of the fields held by a dataset's records"""
+        return getattr(self, self._FIELD_INDEXES[dataset])
 
     # Property Operations
     def get_all_properties(self) -> List[Dict[str, Any]]:
         """Get all active property listings"""
         return self.properties.get("active_listings", [])
 
+    def get_properties_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` property listings from position ``offset``"""
+        return self.get_all_properties()[offset : offset + limit]
+
+    def count_properties(self) -> int:
+        """Get the number of active property listings"""
+        return len(self.get_all_properties())
+
     def get_property_by_id(self, property_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific property by ID"""
-        for prop in self.get_all_properties():
-            if prop.get("id") == property_id:
-                return prop
-        return None
+        return self._property_index.get(property_id)
 
     def filter_properties(self, filters: PropertyFilter) -> List[Dict[str, Any]]:
-        """Filter properties based on criteria"""
-        properties = self.get_all_properties()
-        filtered = []
-
-        for prop in properties:
-            if self._matches_filter(prop, filters):
-                filtered.append(prop)
+        """Filter properties based on criteria, in the filter's order and page"""
+        return self._cached(
+            ("filter_properties", filters.cache_key()),
+            lambda: self._run_filter(filters)[0],
+            ("properties",),
+        )
 
-        return filtered
+    def explain_filter(
+        self, filters: PropertyFilter
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Filter properties and describe the plan used, with row counts"""
+        results, plan, candidates = self._run_filter(filters)
+        return results, plan.explain(candidates, len(results))
+
+    def _run_filter(self, filters: PropertyFilter) -> Tuple[List, FilterPlan, int]:
+        """Plan and run a filter; returns results, plan and candidate count"""
+        planner = self._filter_planner
+        columns = self._listing_columns
+        plan = planner.plan(filters, columns)
+        results, candidates = planner.run(
+            plan, filters, self.get_all_properties(), columns, self._feature_index
+        )
+        return results, plan, candidates
 
     def _matches_filter(self, prop: Dict[str, Any], filters: PropertyFilter) -> bool:
         """Check if property matches filter criteria"""
@@ -146,86 +566,170 @@ class RealEstateDataManager:
             return False
 
         # Features
-        if filters.features:
-            prop_features = prop.get("features", [])
-            for required_feature in filters.features:
-                if not any(
-                    required_feature.lower() in feature.lower()
-                    for feature in prop_features
-                ):
-                    return False
+        if filters.features and not self._matches_features(prop, filters.features):
+            return False
+
+        # Listing date
+        if filters.min_list_date or filters.max_list_date:
+            list_date = prop.get("list_date")
+            if not isinstance(list_date, str):
+                return False
+            if filters.min_list_date and list_date < filters.min_list_date:
+                return False
+            if filters.max_list_date and list_date > filters.max_list_date:
+                return False
 
         return True
 
+    @staticmethod
+    def _matches_features(prop: Dict[str, Any], features: List[str]) -> bool:
+        """Check every required feature is a substring of one of the property's"""
+        prop_features = prop.get("features", [])
+        for required_feature in features:
+            if not any(
+                required_feature.lower() in feature.lower() for feature in prop_features
+            ):
+                return False
+        return True
+
     def search_properties(self, query: str) -> List[Dict[str, Any]]:
         """Search properties by text query"""
+        return self._cached(
+            ("search_properties", query.lower()),
+            lambda: self._search_properties(query),
+            ("properties",),
+        )
+
+    def _search_properties(self, query: str) -> List[Dict[str, Any]]:
         properties = self.get_all_properties()
-        results = []
-        query_lower = query.lower()
-
-        for prop in properties:
-            # Search in address, description, features, and area
-            searchable_text = " ".join(
-                [
-                    prop.get("address", ""),
-                    prop.get("description", ""),
-                    prop.get("area", ""),
-                    " ".join(prop.get("features", [])),
-                    prop.get("property_type", ""),
-                    prop.get("style", ""),
-                ]
-            ).lower()
+        return [properties[row] for row in self._property_text_index.search(query)]
+
+    def rank_properties(
+        self, query: str, limit: Optional[int] = None, min_score: Optional[float] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Search properties and return (property, BM25 score) pairs, best first"""
+        return self._cached(
+            ("rank_properties", query.lower(), limit, min_score),
+            lambda: self._rank_properties(query, limit, min_score),
+            ("properties",),
+        )
 
-            if query_lower in searchable_text:
-                results.append(prop)
+    def _rank_properties(
+        self, query: str, limit: Optional[int], min_score: Optional[float]
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        properties = self.get_all_properties()
+        return [
+            (properties[row], score)
+            for row, score in self._property_text_index.rank(query, limit, min_score)
+        ]
 
-        return results
+    def count_ranked_properties(
+        self, query: str, min_score: Optional[float] = None
+    ) -> int:
+        """Number of properties ``rank_properties`` returns without a limit"""
+        if min_score is None:
+            return len(self.search_properties(query))
+        return self._count_ranked_properties(query, min_score)
+
+    def _count_ranked_properties(self, query: str, min_score: float) -> int:
+        return self._property_text_index.count(query, min_score)
+
+    @staticmethod
+    def _property_search_text(prop: Dict[str, Any]) -> str:
+        """Lower-cased address, description, features, area, type and style"""
+        return " ".join(
+            [
+                prop.get("address") or "",
+                prop.get("description") or "",
+                prop.get("area") or "",
+                " ".join(prop.get("features") or []),
+                prop.get("property_type") or "",
+                prop.get("style") or "",
+            ]
+        ).lower()
+
+    def get_price_range(self) -> Dict[str, Any]:
+        """Get the price range summary of the listings"""
+        return self.properties.get("price_range", {})
 
     def get_properties_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
         """Get all properties handled by a specific agent"""
-        properties = self.get_all_properties()
-        return [prop for prop in properties if prop.get("agent_id") == agent_id]
+        return list(self._properties_by_agent.get(agent_id, []))
 
     def get_properties_by_area(self, area: str) -> List[Dict[str, Any]]:
         """Get all properties in a specific area"""
-        properties = self.get_all_properties()
-        return [
-            prop for prop in properties if prop.get("area", "").lower() == area.lower()
-        ]
+        return list(self._properties_by_area.get(area.lower(), []))
 
     # Agent Operations
     def get_all_agents(self) -> List[Dict[str, Any]]:
         """Get all agent profiles"""
         return self.agents.get("agents", [])
 
+    def get_agents_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` agent profiles from position ``offset``"""
+        return self.get_all_agents()[offset : offset + limit]
+
+    def count_agents(self) -> int:
+        """Get the number of agent profiles"""
+        return len(self.get_all_agents())
+
     def get_agent_by_id(self, agent_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific agent by ID"""
-        for agent in self.get_all_agents():
-            if agent.get("id") == agent_id:
-                return agent
-        return None
+        return self._agent_index.get(agent_id)
 
     def search_agents(self, query: str) -> List[Dict[str, Any]]:
         """Search agents by name, specialization, or area"""
-        agents = self.get_all_agents()
-        results = []
-        query_lower = query.lower()
-
-        for agent in agents:
-            searchable_text = " ".join(
-                [
-                    agent.get("name", ""),
-                    " ".join(agent.get("specializations", [])),
-                    " ".join(agent.get("expertise_areas", [])),
-                    agent.get("bio", ""),
-                ]
-            ).lower()
+        return self._cached(
+            ("search_agents", query.lower()),
+            lambda: self._search_agents(query),
+            ("agents",),
+        )
 
-            if query_lower in searchable_text:
-                results.append(agent)
+    def _search_agents(self, query: str) -> List[Dict[str, Any]]:
+        agents = self.get_all_agents()
+        return [agents[row] for row in self._agent_text_index.search(query)]
+
+    def rank_agents(
+        self, query: str, limit: Optional[int] = None, min_score: Optional[float] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Search agents and return (agent, BM25 score) pairs, best first"""
+        return self._cached(
+            ("rank_agents", query.lower(), limit, min_score),
+            lambda: self._rank_agents(query, limit, min_score),
+            ("agents",),
+        )
 
-        return results
+    def _rank_agents(
+        self, query: str, limit: Optional[int], min_score: Optional[float]
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        agents = self.get_all_agents()
+        return [
+            (agents[row], score)
+            for row, score in self._agent_text_index.rank(query, limit, min_score)
+        ]
 
+    def count_ranked_agents(self, query: str, min_score: Optional[float] = None) -> int:
+        """Number of agents ``rank_agents`` returns without a limit"""
+        if min_score is None:
+            return len(self.search_agents(query))
+        return self._count_ranked_agents(query, min_score)
+
+    def _count_ranked_agents(self, query: str, min_score: float) -> int:
+        return self._agent_text_index.count(query, min_score)
+
+    @staticmethod
+    def _agent_search_text(agent: Dict[str, Any]) -> str:
+        """Lower-cased name, specializations, expertise areas and bio"""
+        return " ".join(
+            [
+                agent.get("name") or "",
+                " ".join(agent.get("specializations") or []),
+                " ".join(agent.get("expertise_areas") or []),
+                agent.get("bio") or "",
+            ]
+        ).lower()
+
+    @cached_view("agents", "properties")
     def get_agent_performance(self, agent_id: str) -> Dict[str, Any]:
         """Get agent performance metrics"""
         agent = self.get_agent_by_id(agent_id)
@@ -298,18 +802,27 @@ class RealEstateDataManager:
         """Get all clients"""
         return self.clients.get("clients", [])
 
+    def get_clients_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` clients from position ``offset``"""
+        return self.get_all_clients()[offset : offset + limit]
+
+    def count_clients(self) -> int:
+        """Get the number of clients"""
+        return len(self.get_all_clients())
+
     def get_client_by_id(self, client_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific client by ID"""
-        for client in self.get_all_clients():
-            if client.get("id") == client_id:
-                return client
-        return None
+        return self._client_index.get(client_id)
 
     def get_clients_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
         """Get all clients for a specific agent"""
-        clients = self.get_all_clients()
-        return [client for client in clients if client.get("agent_id") == agent_id]
+        return list(self._clients_by_agent.get(agent_id, []))
 
+    def get_lead_sources(self) -> Dict[str, Any]:
+        """Get client counts by lead source"""
+        return self.clients.get("lead_sources", {})
+
+    @cached_view("clients", "properties")
     def match_clients_to_properties(self, client_id: str) -> List[Dict[str, Any]]:
         """Match properties to client preferences"""
         client = self.get_client_by_id(client_id)
@@ -350,7 +863,11 @@ class RealEstateDataManager:
 
         return all_schools  # In a real implementation, filter by proximity to area
 
-    def get_amenities_by_type(self, amenity_type: str) -> List[Dict[str, Any]]:
+    def get_all_amenities(self) -> Dict[str, Any]:
+        """Get all amenities data"""
+        return self.amenities
+
+    def get_amenities_by_type(self, amenity_type: str) -> Dict[str, Any]:
         """Get amenities by type (parks, shopping, healthcare, etc.)"""
         return self.amenities.get(amenity_type, {})
 
@@ -386,16 +903,27 @@ class RealEstateDataManager:
         """Get all recent sales"""
         return self.transactions.get("recent_sales", [])
 
+    def get_sales_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` recent sales from position ``offset``"""
+        return self.get_recent_sales()[offset : offset + limit]
+
+    def count_sales(self) -> int:
+        """Get the number of recent sales"""
+        return len(self.get_recent_sales())
+
     def get_sales_by_area(self, area: str) -> List[Dict[str, Any]]:
         """Get recent sales in a specific area"""
-        sales = self.get_recent_sales()
-        return [sale for sale in sales if sale.get("area", "").lower() == area.lower()]
+        return list(self._sales_by_area.get(area.lower(), []))
 
     def get_sales_by_agent(self, agent_id: str) -> List[Dict[str, Any]]:
         """Get recent sales by a specific agent"""
-        sales = self.get_recent_sales()
-        return [sale for sale in sales if sale.get("agent_id") == agent_id]
+        return list(self._sales_by_agent.get(agent_id, []))
+
+    def get_sales_summary(self) -> Dict[str, Any]:
+        """Get summary statistics of recent sales"""
+        return self.transactions.get("sales_summary", {})
 
+    @cached_view("transactions")
     def calculate_market_trends(self, area: str = None) -> Dict[str, Any]:
         """Calculate market trends based on recent sales"""
         sales = self.get_sales_by_area(area) if area else self.get_recent_sales()
@@ -445,6 +973,7 @@ class RealEstateDataManager:
         }
 
     # Cross-referencing and Analytics
+    @cached_view("areas", "market", "properties", "transactions", "amenities")
     def get_comprehensive_area_report(self, area: str) -> Dict[str, Any]:
         """Get comprehensive report for an area including properties, market data, amenities"""
         return {
@@ -456,6 +985,7 @@ class RealEstateDataManager:
             "market_trends": self.calculate_market_trends(area),
         }
 
+    @cached_view("agents", "properties", "clients", "transactions")
     def get_agent_dashboard(self, agent_id: str) -> Dict[str, Any]:
         """Get comprehensive dashboard for an agent"""
         agent = self.get_agent_by_id(agent_id)
@@ -470,6 +1000,7 @@ class RealEstateDataManager:
             "recent_sales": self.get_sales_by_agent(agent_id),
         }
 
+    @cached_view("properties", "agents", "areas", "market", "transactions", "amenities")
     def get_property_insights(self, property_id: str) -> Dict[str, Any]:
         """Get detailed insights for a property including comparable sales and area info"""
         prop = self.get_property_by_id(property_id)
@@ -489,5 +1020,463 @@ class RealEstateDataManager:
         }
 
 
-# Global instance
-data_manager = RealEstateDataManager()
+def area_report_response(area: str, report: Dict[str, Any]) -> Dict[str, Any]:
+    """Area report as served by the tools, from ``get_comprehensive_area_report``"""
+    properties = report["active_properties"]
+    sales = report["recent_sales"]
+    return {
+        "area": area,
+        "area_info": report["area_info"],
+        "market_data": report["market_data"],
+        "active_properties": {"count": len(properties), "properties": properties},
+        "recent_sales": {"count": len(sales), "sales": sales},
+        "amenities": report["amenities"],
+    }
+
+
+def agent_dashboard_response(dashboard: Dict[str, Any]) -> Dict[str, Any]:
+    """Agent dashboard as served by the tools and resources, from
+    ``get_agent_dashboard``"""
+    performance = dashboard["performance"]
+    return {
+        "agent_info": dashboard["agent_info"],
+        "performance_metrics": {
+            "active_listings": performance["active_listings"],
+            "total_clients": len(dashboard["clients"]),
+            "recent_sales_count": performance["recent_sales_count"],
+            "total_sales_volume": performance["total_sales_volume"],
+            "avg_days_on_market": performance["avg_days_on_market"],
+        },
+        "active_listings": dashboard["active_listings"],
+        "clients": dashboard["clients"],
+        "recent_sales": dashboard["recent_sales"],
+    }
+
+
+def property_insights_response(insights: Dict[str, Any]) -> Dict[str, Any]:
+    """Property insights as served by the tools and resources, from
+    ``get_property_insights``"""
+    comparable_sales = insights["comparable_sales"]
+    return {
+        "property": insights["property"],
+        "listing_agent": insights["agent"],
+        "area_context": {
+            "area_info": insights["area_info"],
+            "market_data": insights["area_market_data"],
+            "amenities": insights["area_amenities"],
+        },
+        "comparable_sales": {
+            "count": len(comparable_sales),
+            "sales": comparable_sales,
+        },
+    }
+
+
+@dataclass(frozen=True)
+class FileState:
+    """Identity of a data file's contents, used to detect changes"""
+
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+class RealEstateDataManager(DataBackend):
+    """Centralized manager for all real estate data
+
+    The manager loads the data files into a ``DataSnapshot`` and publishes it
+    with a single reference assignment, so a refresh never exposes partially
+    loaded data. Dataset attributes and query methods resolve against the
+    snapshot that is current when they are called. Callers making several
+    related queries should take ``snapshot()`` once and query it directly.
+
+    Each data file is read on first access to its dataset, so constructing
+    a manager costs no I/O. The modification time, size and content hash of
+    every loaded file are tracked, so a refresh only re-parses and
+    re-indexes the datasets that changed.
+
+    Listings, sales, agents and clients are held as compact ``records``
+    types. Their files are parsed element by element once they reach
+    ``streaming_threshold`` bytes, which keeps peak memory near the size of
+    the loaded data.
+
+    With a ``snapshot_dir``, each dataset is also cached there in binary
+    form together with its prebuilt indexes, keyed on the source file's
+    modification time, size and content hash. A valid cache entry is loaded
+    instead of parsing JSON and building indexes; a stale or corrupted one
+    (detected by a CRC-32 checksum) is ignored and rewritten, as are the
+    entries of datasets ``refresh_data`` reloads. Entries are unpickled, and
+    the checksum only catches corruption, so the directory must only be
+    writable by the server's own user.
+
+    With a ``columns_path``, the numeric and categorical listing columns are
+    exported to that file and memory-mapped read-only, so server processes
+    sharing the path share one copy of the filter columns through the page
+    cache. Only those arrays are shared: every process still holds its own
+    listing records, numeric and categorical values included.
+
+    Filter and search results and composite views are kept in
+    ``result_cache`` (a default-sized ``ResultCache`` unless one is given),
+    tagged with the versions of the datasets they read. ``refresh_data``
+    bumps the version of every dataset it reloads, so a change to one file
+    only invalidates the results that depend on it. Encoded responses in
+    ``response_cache`` whose datasets changed are rebuilt before it returns.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        streaming_threshold: int = STREAMING_THRESHOLD_BYTES,
+        snapshot_dir: Optional[str] = None,
+        columns_path: Optional[str] = None,
+        result_cache: Optional[ResultCache] = None,
+    ):
+        self.data_dir = data_dir
+        self.streaming_threshold = streaming_threshold
+        self.snapshot_dir = snapshot_dir
+        self.columns_path = columns_path
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+        self.response_cache = ResponseCache()
+        self._cache = {}
+        self._refresh_lock = threading.Lock()
+        self._snapshot = self._load_all_data()
+
+    def _load_json_file(
+        self,
+        filepath: str,
+        cache: Optional[Dict[str, Any]] = None,
+        records: Optional[Tuple[str, type]] = None,
+    ) -> Dict[str, Any]:
+        """Load JSON file with caching
+
+        With ``records`` (array key, record type), the objects in that array
+        are converted to compact records. Files over the streaming threshold
+        are parsed incrementally, converting each object as it arrives.
+        """
+        if cache is None:
+            cache = self._cache
+        if filepath in cache:
+            return cache[filepath]
+
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                if records is None:
+                    data = json.load(f)
+                else:
+                    key, record_type = records
+                    builder = RecordBuilder(record_type)
+                    if os.fstat(f.fileno()).st_size >= self.streaming_threshold:
+                        data = json_stream.load(f, (key,), transform=builder)
+                    else:
+                        data = json.load(f)
+                        if isinstance(data, dict) and isinstance(data.get(key), list):
+                            data[key] = [builder(item) for item in data[key]]
+                cache[filepath] = data
+                return data
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _dataset_path(self, name: str) -> str:
+        """Absolute path of a dataset's file"""
+        return os.path.join(self.data_dir, DATASET_FILES[name])
+
+    @staticmethod
+    def _read_file_state(
+        filepath: str, previous: Optional[FileState] = None
+    ) -> Optional[FileState]:
+        """Get the state of a file, or None if it does not exist
+
+        The content hash is only recomputed when the modification time or
+        size differ from ``previous``.
+        """
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        if (
+            previous is not None
+            and previous.mtime_ns == stat.st_mtime_ns
+            and previous.size == stat.st_size
+        ):
+            return previous
+
+        digest = hashlib.sha256()
+        try:
+            with open(filepath, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return FileState(stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+
+    @staticmethod
+    def _same_contents(state: Optional[FileState], known: Optional[FileState]) -> bool:
+        """Check two file states describe the same contents (or both are missing)"""
+        if state is None or known is None:
+            return state is known
+        return state.size == known.size and state.sha256 == known.sha256
+
+    def _dataset_loader(self, name: str, cache: Dict[str, Any]) -> Callable:
+        """Loader reading a dataset's file state and contents on first access
+
+        The snapshot cache is tried first; its prebuilt indexes are returned
+        with the data. Otherwise the JSON file is parsed and no indexes are
+        returned.
+        """
+
+        def load() -> Tuple[Dict[str, Any], Optional[FileState], Optional[Dict]]:
+            filepath = self._dataset_path(name)
+            cached = self._read_snapshot_cache(name, filepath)
+            if cached is not None:
+                return cached
+            state = self._read_file_state(filepath)
+            data = self._load_json_file(filepath, cache, RECORD_ARRAYS.get(name))
+            return data, state, None
+
+        return load
+
+    def _snapshot_cache_path(self, name: str) -> str:
+        """Path of a dataset's snapshot cache file"""
+        return os.path.join(self.snapshot_dir, f"{name}.snapshot")
+
+    def _read_snapshot_cache(
+        self, name: str, filepath: str
+    ) -> Optional[Tuple[Dict[str, Any], Optional[FileState], Dict[str, Any]]]:
+        """Load a dataset and its indexes from the snapshot cache
+
+        Returns None when caching is disabled, or when the cache file is
+        missing, from another cache version, out of date with the source
+        file, or fails its checksum. The source file is only hashed when its
+        modification time or size differ from the cached state.
+        """
+        if self.snapshot_dir is None:
+            return None
+        try:
+            with open(self._snapshot_cache_path(name), "rb") as f:
+                if f.read(len(SNAPSHOT_CACHE_MAGIC)) != SNAPSHOT_CACHE_MAGIC:
+                    return None
+                (header_length,) = struct.unpack(">I", f.read(4))
+                header = json.loads(f.read(header_length))
+                if header["version"] != SNAPSHOT_CACHE_VERSION:
+                    return None
+
+                source = header["source"]
+                known = FileState(**source) if source is not None else None
+                state = self._read_file_state(filepath, known)
+                if not self._same_contents(state, known):
+                    return None
+                payload = f.read()
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            return None
+
+        if len(payload) != header["length"] or zlib.crc32(payload) != header["crc32"]:
+            return None
+        # Unpickling allocates millions of acyclic objects; pausing the cyclic
+        # collector avoids repeated full traversals of the growing heap
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            data, indexes = pickle.loads(payload)
+        except Exception:  # unreadable payload: rebuild from source
+            return None
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return data, state, indexes
+
+    def _write_snapshot_cache(
+        self,
+        name: str,
+        data: Dict[str, Any],
+        state: Optional[FileState],
+        indexes: Dict[str, Any],
+    ):
+        """Cache a dataset and its indexes, replacing any previous entry
+
+        Written to a temporary file and renamed into place, so readers never
+        see a partial entry. Failures only mean the next start parses JSON.
+        """
+        try:
+            payload = pickle.dumps((data, indexes), protocol=5)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        header = json.dumps(
+            {
+                "version": SNAPSHOT_CACHE_VERSION,
+                "source": asdict(state) if state is not None else None,
+                "length": len(payload),
+                "crc32": zlib.crc32(payload),
+            }
+        ).encode()
+
+        path = self._snapshot_cache_path(name)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(SNAPSHOT_CACHE_MAGIC)
+                f.write(struct.pack(">I", len(header)))
+                f.write(header)
+                f.write(payload)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _load_all_data(self, cache: Optional[Dict[str, Any]] = None) -> DataSnapshot:
+        """Create a snapshot that loads each data file on first access"""
+        if cache is None:
+            cache = self._cache
+        return DataSnapshot(
+            {name: self._dataset_loader(name, cache) for name in DATASET_FILES},
+            persist=self._snapshot_persist(),
+            columns_path=self.columns_path,
+            result_cache=self.result_cache,
+        )
+
+    def _snapshot_persist(self) -> Optional[Callable[..., None]]:
+        """Callback caching datasets parsed from source, if caching is enabled"""
+        return self._write_snapshot_cache if self.snapshot_dir is not None else None
+
+    def refresh_data(self) -> Dict[str, Any]:
+        """Reload changed data files and publish them as a new snapshot
+
+        Only loaded datasets whose file state (mtime, size and content hash)
+        changed are re-parsed, and re-indexed if their indexes were in use.
+        Everything else is carried over from the current snapshot, and
+        datasets that were never loaded stay lazy. The new snapshot is built
+        off to the side, and readers keep using the snapshot they started
+        with until the swap.
+
+        Reloaded datasets are then written to the snapshot cache, if it is
+        enabled, and cached encoded responses are rebuilt from the new
+        snapshot.
+
+        Returns the reloaded datasets with the seconds each took to parse and
+        index, the unchanged datasets, and the datasets not loaded yet.
+        """
+        with self._refresh_lock:
+            previous = self._snapshot
+            cache, datasets, states = {}, {}, {}
+            load_times, unchanged, not_loaded = {}, [], []
+
+            for name in DATASET_FILES:
+                filepath = self._dataset_path(name)
+                if not previous.is_loaded(name):
+                    datasets[name] = self._dataset_loader(name, cache)
+                    not_loaded.append(name)
+                    continue
+
+                known = previous.file_states.get(name)
+                state = self._read_file_state(filepath, known)
+                states[name] = state
+
+                if self._same_contents(state, known):
+                    datasets[name] = getattr(previous, name)
+                    unchanged.append(name)
+                    if filepath in self._cache:
+                        cache[filepath] = self._cache[filepath]
+                    continue
+
+                start = time.perf_counter()
+                datasets[name] = self._load_json_file(
+                    filepath, cache, RECORD_ARRAYS.get(name)
+                )
+                load_times[name] = time.perf_counter() - start
+
+            snapshot = DataSnapshot(
+                datasets,
+                states,
+                previous,
+                reuse=unchanged,
+                persist=self._snapshot_persist(),
+                columns_path=self.columns_path,
+                version=previous.version + 1 if load_times else previous.version,
+                result_cache=self.result_cache,
+                parsed=load_times,
+                # Datasets not loaded yet are read on first query, so each
+                # snapshot may see different contents and gets its own version
+                dataset_versions={
+                    name: version + (name in load_times or name in not_loaded)
+                    for name, version in previous.dataset_versions.items()
+                },
+            )
+            snapshot.warm(name for name in load_times if previous.has_indexes(name))
+
+            self._cache = cache
+            self._snapshot = snapshot
+
+        # Replace the cache entries of reloaded datasets for the next start
+        snapshot.save_parsed()
+        self.response_cache.warm(snapshot)
+        return {
+            "reloaded": {
+                name: round(seconds + snapshot.index_times.get(name, 0.0), 6)
+                for name, seconds in load_times.items()
+            },
+            "unchanged": unchanged,
+            "not_loaded": not_loaded,
+        }
+
+
+# Environment variable overriding the default data directory
+DATA_DIR_ENV = "REAL_ESTATE_DATA_DIR"
+
+# Environment variable enabling the snapshot cache in that directory
+SNAPSHOT_DIR_ENV = "REAL_ESTATE_SNAPSHOT_DIR"
+
+# Environment variable naming a memory-mapped listing columns file to share
+COLUMNS_FILE_ENV = "REAL_ESTATE_COLUMNS_FILE"
+
+# Environment variable naming a SQLite database (see sqlite_backend.py) to serve
+DATABASE_ENV = "REAL_ESTATE_DATABASE"
+
+# Environment variable setting how many query results to cache (0 disables)
+RESULT_CACHE_ENV = "REAL_ESTATE_RESULT_CACHE_SIZE"
+
+
+_data_manager: Optional[DataBackend] = None
+_data_manager_lock = threading.Lock()
+
+
+def get_data_manager() -> DataBackend:
+    """Get the shared data manager, creating it on first use
+
+    The data directory comes from the ``REAL_ESTATE_DATA_DIR`` environment
+    variable and defaults to ``data``. Setting ``REAL_ESTATE_SNAPSHOT_DIR``
+    caches parsed datasets in binary form in that directory, which must only
+    be writable by the server's user; the cache is off by default. Setting
+    ``REAL_ESTATE_COLUMNS_FILE`` shares the listing columns between
+    processes through that memory-mapped file. Creating the manager reads no
+    files; each dataset is loaded when it is first queried.
+
+    When ``REAL_ESTATE_DATABASE`` is set, the manager serves the SQLite
+    database at that path instead of the JSON files.
+
+    ``REAL_ESTATE_RESULT_CACHE_SIZE`` sets how many filter and search results
+    the manager caches; 0 disables the result cache.
+    """
+    global _data_manager
+    if _data_manager is None:
+        with _data_manager_lock:
+            result_cache = ResultCache(
+                int(os.environ.get(RESULT_CACHE_ENV, DEFAULT_MAX_ENTRIES))
+            )
+            if _data_manager is None and os.environ.get(DATABASE_ENV):
+                from sqlite_backend import SQLiteDataManager
+
+                _data_manager = SQLiteDataManager(
+                    os.environ[DATABASE_ENV], result_cache=result_cache
+                )
+            elif _data_manager is None:
+                _data_manager = RealEstateDataManager(
+                    os.environ.get(DATA_DIR_ENV, "data"),
+                    snapshot_dir=os.environ.get(SNAPSHOT_DIR_ENV) or None,
+                    columns_path=os.environ.get(COLUMNS_FILE_ENV) or None,
+                    result_cache=result_cache,
+                )
+    return _data_manager
+
+
+# Global instance (no data is read until first use)
+data_manager = get_data_manager()
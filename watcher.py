@@ -0,0 +1,221 @@
+"""
+Data Directory Watcher
+Background task that reloads changed data files without manual refresh calls
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+try:
+    import inotify_simple
+except ImportError:  # pragma: no cover - depends on the platform
+    inotify_simple = None
+
+# The watcher started by the running server, if any
+active_watcher: Optional["DataWatcher"] = None
+
+
+class DataWatcher:
+    """Watches ``data_dir`` and reloads the data manager when files change
+
+    Changes are detected with inotify when the ``inotify_simple`` package is
+    available, and by polling file modification times and sizes otherwise.
+    Bursts of writes are debounced: a reload only starts once no further
+    change has been seen for ``debounce`` seconds. The reload itself runs in
+    a worker thread, so request handling on the event loop is never blocked,
+    and it uses the manager's incremental, atomic ``refresh_data``.
+
+    Changes to the manager's ``watch_ignored`` files are ignored, and its
+    ``watch_replaced`` files only count as changed when they are created,
+    deleted or replaced (renamed over), not when they are written in place.
+    """
+
+    def __init__(
+        self,
+        manager,
+        poll_interval: float = 1.0,
+        debounce: float = 2.0,
+        use_inotify: bool = True,
+    ):
+        self.manager = manager
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.mode = "inotify" if use_inotify and inotify_simple else "polling"
+        self.metrics: Dict[str, Any] = {
+            "mode": self.mode,
+            "reloads": 0,
+            "failed_reloads": 0,
+            "last_reload_at": None,
+            "last_reload_seconds": None,
+            "max_reload_seconds": 0.0,
+            "total_reload_seconds": 0.0,
+            "last_reloaded": {},
+            "last_error": None,
+        }
+        self._task: Optional[asyncio.Task] = None
+        self._ignored = self._paths(manager.watch_ignored)
+        self._replaced = self._paths(manager.watch_replaced)
+
+    @staticmethod
+    def _paths(paths) -> FrozenSet[str]:
+        """Absolute forms of the paths, for comparison with watched paths"""
+        return frozenset(os.path.abspath(path) for path in paths)
+
+    def start(self) -> asyncio.Task:
+        """Start watching on the running event loop"""
+        global active_watcher
+        self._task = asyncio.get_running_loop().create_task(self.run())
+        active_watcher = self
+        return self._task
+
+    async def stop(self):
+        """Stop watching and wait for the task to finish"""
+        global active_watcher
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if active_watcher is self:
+            active_watcher = None
+
+    async def run(self):
+        """Wait for changes, debounce them and reload"""
+        changed = asyncio.Event()
+        detach = await self._watch(changed)
+        try:
+            while True:
+                await changed.wait()
+                # Wait for a quiet period with no further changes
+                while True:
+                    changed.clear()
+                    try:
+                        await asyncio.wait_for(changed.wait(), self.debounce)
+                    except asyncio.TimeoutError:
+                        break
+                await self._reload()
+        finally:
+            detach()
+
+    async def _reload(self):
+        """Run an incremental reload in a worker thread and record metrics"""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            report = await loop.run_in_executor(None, self.manager.refresh_data)
+        except Exception as error:  # keep watching after a failed reload
+            self.metrics["failed_reloads"] += 1
+            self.metrics["last_error"] = repr(error)
+            return
+
+        seconds = time.perf_counter() - start
+        self.metrics["reloads"] += 1
+        self.metrics["last_reload_at"] = time.time()
+        self.metrics["last_reload_seconds"] = round(seconds, 6)
+        self.metrics["max_reload_seconds"] = max(
+            self.metrics["max_reload_seconds"], round(seconds, 6)
+        )
+        self.metrics["total_reload_seconds"] += seconds
+        self.metrics["last_reloaded"] = report.get("reloaded", {})
+        self.metrics["last_error"] = None
+
+    async def _watch(self, changed: asyncio.Event) -> Callable[[], None]:
+        """Begin signalling ``changed`` on file changes; returns a detach callback"""
+        if self.mode == "inotify":
+            return self._watch_inotify(changed)
+
+        task = asyncio.get_running_loop().create_task(self._poll(changed))
+        return task.cancel
+
+    def _watch_inotify(self, changed: asyncio.Event) -> Callable[[], None]:
+        """Register inotify watches on the data directory tree
+
+        Directories created (or moved in) later are watched as they appear.
+        """
+        loop = asyncio.get_running_loop()
+        inotify = inotify_simple.INotify()
+        flags = inotify_simple.flags
+        mask = (
+            flags.CLOSE_WRITE
+            | flags.MOVED_TO
+            | flags.MOVED_FROM
+            | flags.CREATE
+            | flags.DELETE
+        )
+        # Watched directory of each watch descriptor
+        directories: Dict[int, str] = {}
+
+        def watch_tree(root: str):
+            for directory, _, _ in os.walk(root):
+                try:
+                    directories[inotify.add_watch(directory, mask)] = directory
+                except OSError:  # removed again before it could be watched
+                    continue
+
+        watch_tree(os.path.abspath(self.manager.data_dir))
+
+        def on_events():
+            for event in inotify.read(timeout=0):
+                directory = directories.get(event.wd)
+                if directory is None:
+                    continue
+                path = os.path.join(directory, event.name)
+                if event.mask & flags.ISDIR and event.mask & (
+                    flags.CREATE | flags.MOVED_TO
+                ):
+                    # Files may land in the new tree before its watches exist
+                    watch_tree(path)
+                    changed.set()
+                elif self._counts(path, not event.mask & flags.CLOSE_WRITE):
+                    changed.set()
+
+        loop.add_reader(inotify.fileno(), on_events)
+
+        def detach():
+            loop.remove_reader(inotify.fileno())
+            inotify.close()
+
+        return detach
+
+    async def _poll(self, changed: asyncio.Event):
+        """Compare the data directory's file signature every poll interval"""
+        loop = asyncio.get_running_loop()
+        signature = await loop.run_in_executor(None, self._scan)
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = await loop.run_in_executor(None, self._scan)
+            if current != signature:
+                signature = current
+                changed.set()
+
+    def _counts(self, path: str, replaced: bool) -> bool:
+        """Whether a change to the file at ``path`` should trigger a reload"""
+        if path in self._ignored:
+            return False
+        return replaced or path not in self._replaced
+
+    def _scan(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Path, modification time and size of every file under data_dir
+
+        ``watch_replaced`` files are listed by inode and device instead, so
+        only replacing them changes the signature.
+        """
+        entries = []
+        for directory, _, filenames in os.walk(os.path.abspath(self.manager.data_dir)):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                if not self._counts(path, True):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if path in self._replaced:
+                    entries.append((path, stat.st_ino, stat.st_dev))
+                else:
+                    entries.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(entries))